@@ -0,0 +1,329 @@
+"""asyncio counterparts of the GraphQL calls in `github`.
+
+Every stage of `github.open_pull_req` blocks until its response arrives. The
+coroutines here send the same requests through `AsyncEndpoint`, overlap the
+ones that don't depend on each other (the PR listing and the branch sync), and
+let one process serve many submissions at once:
+
+    url = asyncio.run(async_github.open_pull_req(3, "foo.nvim", contents))
+
+Only the I/O is here: the requests, and what to make of their responses, are
+`github`'s helpers, shared by both.
+"""
+
+import asyncio
+import json
+import logging
+from itertools import chain
+from pathlib import PosixPath
+from typing import List, Optional, Tuple
+
+# local imports
+import cassette
+import documents
+import ratelimit
+import records
+import retry
+import weekly
+from config import Cfg
+from documents import Document
+from github import (
+    GITHUB_URL,
+    SYNC_REFS_VARIABLES,
+    PerProcess,
+    PullRequestEdge,
+    branch_created,
+    checked_context,
+    commit_created,
+    commit_details,
+    commit_requests,
+    endpoint_options,
+    page_prs,
+    pool_options,
+    pr_created,
+    pr_file_path,
+    pr_target,
+    pr_variables,
+    prs_connection,
+    rebuilt_context,
+    saved_context,
+    sync_plan,
+    synced,
+    week_repo,
+)
+from query_cost import CostLimit
+from querycache import QueryCache
+from retry import RetryPolicy
+from singleflight import acoalesced
+from transport import AsyncConnectionPool
+
+
+class AsyncEndpoint:
+    """asyncio GraphQL endpoint, returning responses like sgqlc's `HTTPEndpoint`.
+
+    Args:
+        url: the GraphQL endpoint url.
+        base_headers: HTTP headers to include in every request.
+        timeout: timeout (seconds) of each request.
+        pool: connection pool to send requests through.
+        budget: rate budget to pace requests by; defaults to the process' one.
+        cost_limit: limit to check the cost of each request against (see `query_cost`).
+        retry_policy: when to send a failed request again (see `retry`).
+        cache: cache to answer queries from, when it can (see `querycache`).
+    """
+
+    logger = logging.getLogger(__name__)
+
+    def __init__(
+        self,
+        url: str,
+        base_headers: Optional[dict] = None,
+        timeout: Optional[float] = None,
+        pool: Optional[AsyncConnectionPool] = None,
+        budget: Optional[ratelimit.RateBudget] = None,
+        cost_limit: Optional[CostLimit] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        cache: Optional[QueryCache] = None,
+    ):
+        self.url = url
+        self.base_headers = base_headers or {}
+        self.timeout = timeout
+        self.pool = pool or AsyncConnectionPool()
+        self.budget = budget or ratelimit.get_budget()
+        self.cost_limit = cost_limit
+        self.retry_policy = retry_policy or RetryPolicy(attempts=1)
+        self.cache = cache
+
+    async def __call__(self, query, variables: Optional[dict] = None, operation_name: Optional[str] = None) -> dict:
+        if self.cache is not None:
+            data = self.cache.lookup(query, variables)
+            if data is not None:
+                return data
+
+        data = await self._request(query, variables, operation_name)
+        if self.cache is not None:
+            self.cache.store(query, variables, data)
+        return data
+
+    async def _request(self, query, variables: Optional[dict], operation_name: Optional[str]) -> dict:
+        if self.cost_limit is not None:
+            self.cost_limit.check(query, variables)
+
+        if isinstance(query, Document):
+            body = query.body(variables)
+        else:
+            if not isinstance(query, (str, bytes)):
+                query = bytes(query)
+            if isinstance(query, bytes):
+                query = query.decode()
+            body = json.dumps({"query": query, "variables": variables, "operationName": operation_name}).encode()
+
+        headers = {
+            "Accept": "application/json; charset=utf-8",
+            "Content-Type": "application/json; charset=utf-8",
+            **self.base_headers,
+        }
+
+        # None: no retries left
+        for backoff in chain(self.retry_policy.backoff(), [None]):
+            wait = self.budget.pace()
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+            data = await self._send(body, headers)
+            self.budget.observe(data)
+            if backoff is None or not self.retry_policy.should_retry(query, retry.classify(data)):
+                return data
+            self.logger.warning("%s: request failed, retrying in %.1fs", self.url, backoff)
+            await asyncio.sleep(backoff)
+
+    async def _send(self, body: bytes, headers: dict) -> dict:
+        try:
+            status, reason, _, content = await self.pool.request("POST", self.url, body, headers, self.timeout)
+        except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError) as exc:
+            self.logger.error("%s: %s", self.url, exc)
+            return {"data": None, "errors": [{"message": str(exc), "exception": exc}]}
+
+        if status >= 400:
+            self.logger.error("%s: HTTP Error %s: %s", self.url, status, reason)
+            return {
+                "data": None,
+                "errors": [{"message": f"HTTP Error {status}: {reason}", "status": status, "body": content.decode()}],
+            }
+
+        try:
+            data = json.loads(content)
+        except json.JSONDecodeError as exc:
+            self.logger.error("could not decode JSON response: %s", exc)
+            return {"data": None, "errors": [{"message": str(exc), "exception": exc, "body": content.decode()}]}
+
+        if data and data.get("errors"):
+            self.logger.error("GraphQL query failed with %s errors", len(data["errors"]))
+        return data
+
+
+def make_endpoint() -> AsyncEndpoint:
+    cfg = Cfg().cfg["github"]
+
+    pool = AsyncConnectionPool(**pool_options(cfg))
+    fixture = cassette.get_cassette()
+    if fixture is not None:
+        pool = fixture.pool(pool)
+    return AsyncEndpoint(cfg.get("url", fallback=GITHUB_URL), pool=pool, **endpoint_options(cfg))
+
+
+# built on first use (per process), like `github.get_endpoint()`
+_endpoint: PerProcess[AsyncEndpoint] = PerProcess(make_endpoint)
+
+
+def get_endpoint() -> AsyncEndpoint:
+    """Get this process' async GraphQL endpoint, building it the first time it is needed."""
+    return _endpoint.get()
+
+
+def set_endpoint(endpoint: AsyncEndpoint):
+    """Use `endpoint` for all async requests of this process (e.g. a local stand-in)."""
+    _endpoint.set(endpoint)
+
+
+# ----
+# ---- GraphQL queries
+
+
+@acoalesced
+async def repo_query(page_size: Optional[int] = None) -> Tuple[str, List[PullRequestEdge]]:
+    """Async `github.repo_query`; the PRs are all fetched before it returns.
+
+    Concurrent tasks share one listing: the list must not be modified.
+    """
+    endpoint = get_endpoint()
+    if page_size is None:
+        page_size = Cfg().cfg["github"].getint("page_size", fallback=40)
+
+    repo = week_repo(await endpoint(documents.get("GetWeekPRs"), {"pageSize": page_size}))
+    branch_name = repo.parent.edges[0].node.head_ref.name
+    parent_id = repo.parent.edges[0].node.id
+
+    prs, cursor = page_prs(repo.pull_requests, parent_id)
+    while cursor is not None:
+        data = await endpoint(documents.get("GetPRsPage"), {"pageSize": page_size, "before": cursor})
+        page, cursor = page_prs(prs_connection(data), parent_id)
+        prs += page
+
+    return branch_name, prs
+
+
+@acoalesced
+async def sync_twin_branch() -> Tuple[str, str]:
+    """Async `github.sync_twin_branch`; concurrent tasks share one sync."""
+    endpoint = get_endpoint()
+
+    ids, mutation = sync_plan(await endpoint(documents.get("GetSyncRefs"), SYNC_REFS_VARIABLES))
+    if mutation is not None:
+        synced(await endpoint(*mutation))
+
+    return ids
+
+
+async def week_head():
+    """Async `github.week_head`."""
+    endpoint = get_endpoint()
+
+    data = await endpoint(documents.get("GetWeekHead"))
+    return records.decode("GetWeekHead", data).repository
+
+
+@acoalesced
+async def weekly_context() -> weekly.WeeklyContext:
+    """Async `github.weekly_context`; a rebuild lists PRs and syncs the branch concurrently.
+
+    Concurrent tasks share one context, like threads do: see `weekly.claim`.
+    """
+    context, fresh = saved_context()
+    if fresh:
+        return context
+
+    head = await week_head()
+    current = checked_context(context, head)
+    if current is not None:
+        return current
+
+    (_, prs), (id_upstream, id_fork) = await asyncio.gather(
+        repo_query(),
+        sync_twin_branch(),
+    )
+    return rebuilt_context(head, prs, id_upstream, id_fork)
+
+
+async def create_commit_mutation(
+    repo_id: str,
+    base_oid: str,
+    commit_msg: str,
+    file_path: PosixPath,
+    contents: str,
+) -> str:
+    """Async `github.create_commit_mutation`."""
+    endpoint = get_endpoint()
+
+    branch_name, create_branch, create_commit = commit_requests(repo_id, base_oid, commit_msg, file_path, contents)
+    ref_id = branch_created(await endpoint(documents.get("CreateBranch"), create_branch))
+    try:
+        commit_created(await endpoint(documents.get("CreateCommit"), create_commit))
+    except Exception:
+        await endpoint(documents.get("DeleteBranch"), {"refId": ref_id})
+        raise
+    return branch_name
+
+
+async def create_pr_mutation(
+    title: str,
+    repo_id: str,
+    head_ref: str,
+    base_ref: str,
+) -> str:
+    """Async `github.create_pr_mutation`."""
+    endpoint = get_endpoint()
+
+    data = await endpoint(documents.get("CreatePR"), pr_variables(title, repo_id, head_ref, base_ref))
+    return pr_created(data)
+
+
+# ----
+
+
+async def open_pull_req(
+    section: int,
+    plugin_name: str,
+    contents: str,
+) -> str:
+    """Async `github.open_pull_req`: the PR listing and branch sync (when the weekly context is rebuilt) run concurrently.
+
+    Raises:
+        Exception: if an invalid 'section' is passed, or no PRs were found for this week.
+        RateLimited: if the rate limit won't allow a whole PR for a while.
+    """
+    commit_msg, dir_path = commit_details(section, plugin_name)
+
+    async with ratelimit.get_budget().areserve(ratelimit.PR_COST):
+        context = await weekly_context()
+
+        # our own number: the context may be shared with concurrent submissions
+        # (and it is handed back if the submission fails)
+        with weekly.claim(context, section) as number:
+            file_path = pr_file_path(context, dir_path, number, plugin_name)
+
+            patch_branch = await create_commit_mutation(
+                repo_id=context.id_fork,
+                base_oid=context.weekly_oid,
+                commit_msg=commit_msg,
+                file_path=file_path,
+                contents=contents,
+            )
+
+            args = pr_target(context.branch_name, patch_branch, context.id_upstream, context.id_fork)
+
+            # use commit msg as title
+            url = await create_pr_mutation(commit_msg, *args)
+
+        weekly.record_pr(args[0])
+        return url
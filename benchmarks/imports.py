@@ -0,0 +1,157 @@
+#! /usr/bin/env python3
+"""Import-time and memory benchmark for the bot's modules.
+
+Every measurement imports one module in a fresh interpreter:
+    - cold: with an empty bytecode cache (`PYTHONPYCACHEPREFIX` in a new dir)
+    - warm: with the bytecode cache populated by the cold run
+
+Per-module timings come from `-X importtime`, and peak RSS from `getrusage`.
+Results are written as JSON, and can be compared against a previous run:
+
+    python3 benchmarks/imports.py -o after.json --compare before.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+MODULES = ("config", "schema", "lazy_schema", "operations", "github", "mutate")
+
+# run in a child interpreter, prints its measurements as JSON
+CHILD = """
+import json, resource, sys, time
+start = time.perf_counter()
+__import__(sys.argv[1])
+seconds = time.perf_counter() - start
+print(json.dumps({
+    "seconds": seconds,
+    "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+}))
+"""
+
+
+def parse_importtime(stderr: str) -> Dict[str, int]:
+    """Get cumulative import time (us) of every module in `-X importtime` output."""
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def run_import(module: str, workdir: Path, pycache: Path) -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = str(ROOT)
+    env["PYTHONPYCACHEPREFIX"] = str(pycache)
+    # warm runs need the bytecode written by the cold one
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD, module],
+        cwd=workdir,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode:
+        raise RuntimeError(f"importing {module} failed:\n{proc.stderr}")
+
+    result = json.loads(proc.stdout)
+    importtime = parse_importtime(proc.stderr)
+    result["importtime_us"] = {
+        name: importtime[name]
+        for name in importtime
+        if (ROOT / f"{name}.py").exists()
+    }
+    return result
+
+
+def summarize(runs: List[dict]) -> dict:
+    seconds = [r["seconds"] for r in runs]
+    return {
+        "runs": len(runs),
+        "median_s": statistics.median(seconds),
+        "min_s": min(seconds),
+        "max_rss_kb": max(r["max_rss_kb"] for r in runs),
+        "importtime_us": runs[-1]["importtime_us"],
+    }
+
+
+def bench(modules: List[str], repeat: int) -> dict:
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+
+        baseline = run_import("sys", workdir, workdir / "pycache-baseline")
+        for module in modules:
+            pycache = workdir / f"pycache-{module}"
+            cold = run_import(module, workdir, pycache)
+            warm = [run_import(module, workdir, pycache) for _ in range(repeat)]
+            results[module] = {"cold": summarize([cold]), "warm": summarize(warm)}
+
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "baseline_rss_kb": baseline["max_rss_kb"],
+        "modules": results,
+    }
+
+
+def compare(current: dict, previous: dict):
+    print(f"{'module':<14} {'warm before':>12} {'warm after':>12} {'change':>8} {'rss kb change':>14}")
+    for module, result in current["modules"].items():
+        if module not in previous["modules"]:
+            continue
+        before = previous["modules"][module]["warm"]
+        after = result["warm"]
+        change = (after["median_s"] - before["median_s"]) / before["median_s"]
+        rss = after["max_rss_kb"] - before["max_rss_kb"]
+        print(
+            f"{module:<14} {before['median_s'] * 1000:>10.1f}ms {after['median_s'] * 1000:>10.1f}ms"
+            f" {change:>+8.1%} {rss:>+14}"
+        )
+
+
+def print_results(results: dict):
+    print(f"{'module':<14} {'cold':>10} {'warm':>10} {'max rss':>12}")
+    for module, result in results["modules"].items():
+        print(
+            f"{module:<14} {result['cold']['median_s'] * 1000:>8.1f}ms"
+            f" {result['warm']['median_s'] * 1000:>8.1f}ms {result['warm']['max_rss_kb']:>10}kb"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    parser.add_argument("-n", "--repeat", type=int, default=5, help="warm runs per module")
+    parser.add_argument("-o", "--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="previous results (JSON) to compare against")
+    args = parser.parse_args()
+
+    results = bench(args.modules, args.repeat)
+    print_results(results)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+        print()
+        compare(results, previous)
@@ -0,0 +1,336 @@
+#! /usr/bin/env python3
+"""End-to-end benchmark of submissions: `mutate.mutate`, then `github.open_pull_req`.
+
+Every scenario (1, 10 and 100 submissions by default) runs in a fresh
+interpreter, against a fresh `fake_github.FakeGitHub` served from this one,
+with on-disk caches of its own (`state_dir`, in a temp directory), so
+scenarios don't warm each other up - or the live bot's caches. Results are written as JSON, and can be
+compared against a previous run:
+
+    python3 benchmarks/pipeline.py -o after.json --compare before.json
+
+For each scenario, and for each stage of a submission, it reports wall time,
+round trips, bytes sent and received (request and response bodies) and the
+client's CPU time. The stages are:
+
+    - listing: this week's PRs (and the weekly context's head)
+    - sections: counting the sections taken (pages listed meanwhile excluded)
+    - sync: syncing the fork's refs
+    - branch, commit, pr: the three mutations
+    - templates, mutate: fetching and filling in the template
+    - other: everything else, e.g. (de)serializing, caches on disk, and
+      waiting for a request another thread is making (with `--concurrency`)
+
+Stage times exclude the stages nested in them, so they add up to the total
+(summed over threads, with `--concurrency`). The client's total CPU comes
+from `getrusage`; the fake server runs in this process, so it isn't counted.
+Bot options can be set in the generated config.ini, e.g. to measure a
+feature by turning it off:
+
+    python3 benchmarks/pipeline.py --set query_cache=no --set context_ttl=0
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List
+
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+SUBMISSIONS = (1, 10, 100)
+
+# operation -> stage it belongs to
+STAGES = {
+    "GetWeekHead": "listing",
+    "GetWeekPRs": "listing",
+    "GetPRsPage": "listing",
+    "GetSyncRefs": "sync",
+    "SyncRefs": "sync",
+    "CreateBranch": "branch",
+    "CreateCommit": "commit",
+    "CreatePR": "pr",
+    "GetTemplates": "templates",
+}
+
+
+# ----
+# ---- child: runs the submissions of one scenario
+
+
+class Profiler:
+    """Exclusive wall / CPU time, round trips and bytes of each stage, over all threads."""
+
+    def __init__(self):
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _stack(self) -> list:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def _add(self, stage: str, **counts: float):
+        with self._lock:
+            totals = self.stages.setdefault(
+                stage, {"calls": 0, "wall_s": 0.0, "cpu_s": 0.0, "round_trips": 0, "bytes_sent": 0, "bytes_received": 0}
+            )
+            for key, value in counts.items():
+                totals[key] += value
+
+    @contextmanager
+    def stage(self, name: str):
+        stack = self._stack()
+        # [name, wall and CPU spent in nested stages]
+        frame = [name, 0.0, 0.0]
+        stack.append(frame)
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - wall, time.thread_time() - cpu
+            stack.pop()
+            if stack:
+                stack[-1][1] += wall
+                stack[-1][2] += cpu
+            self._add(name, calls=1, wall_s=wall - frame[1], cpu_s=cpu - frame[2])
+
+    def current(self) -> str:
+        stack = self._stack()
+        return stack[-1][0] if stack else "other"
+
+    def wrap(self, name: str, fn):
+        def wrapper(*args, **kwargs):
+            with self.stage(name):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    def count(self, sent: int, received: int):
+        self._add(self.current(), round_trips=1, bytes_sent=sent, bytes_received=received)
+
+
+class _CountedResponse:
+    def __init__(self, resp, on_read):
+        self._resp = resp
+        self._on_read = on_read
+
+    def read(self, *args) -> bytes:
+        content = self._resp.read(*args)
+        self._on_read(len(content))
+        return content
+
+    def __getattr__(self, name):
+        return getattr(self._resp, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._resp.close()
+
+
+def instrument(profiler: Profiler):
+    """Attribute the bot's time and traffic to stages."""
+    import github
+    import mutate
+
+    endpoint = github.get_endpoint()
+    urlopen = endpoint.urlopen
+
+    def counted_urlopen(req, timeout=None):
+        sent = len(req.data or b"")
+        try:
+            resp = urlopen(req, timeout=timeout)
+        except Exception:
+            profiler.count(sent, 0)
+            raise
+        return _CountedResponse(resp, lambda received: profiler.count(sent, received))
+
+    def staged_endpoint(query, variables=None, *args, **kwargs):
+        with profiler.stage(STAGES.get(getattr(query, "name", None), "other")):
+            return endpoint(query, variables, *args, **kwargs)
+
+    endpoint.urlopen = counted_urlopen
+    github.set_endpoint(staged_endpoint)
+
+    # (decoding the responses, too)
+    for name in ("week_head", "week_page", "prs_page"):
+        setattr(github, name, profiler.wrap("listing", getattr(github, name)))
+    github.sync_twin_branch = profiler.wrap("sync", github.sync_twin_branch)
+    github.template_query = profiler.wrap("templates", github.template_query)
+    github.count_sections = profiler.wrap("sections", github.count_sections)
+    mutate.mutate = profiler.wrap("mutate", mutate.mutate)
+
+
+def run_child(submissions: int, concurrency: int) -> dict:
+    import github
+    import mutate
+
+    profiler = Profiler()
+    instrument(profiler)
+
+    def submit(i: int) -> str:
+        with profiler.stage("other"):
+            section = 3 if i % 2 == 0 else 4
+            plugin = f"plugin-{i}.nvim"
+            content = mutate.mutate(f"https://www.reddit.com/r/neovim/comments/{i}", f"https://github.com/author/{plugin}", section)
+            return github.open_pull_req(section, plugin, content)
+
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    start = time.perf_counter()
+    if concurrency > 1:
+        with ThreadPoolExecutor(concurrency) as pool:
+            urls = list(pool.map(submit, range(submissions)))
+    else:
+        urls = [submit(i) for i in range(submissions)]
+    wall = time.perf_counter() - start
+    after = resource.getrusage(resource.RUSAGE_SELF)
+
+    stages = profiler.stages
+    return {
+        "submissions": submissions,
+        "prs_opened": len(set(urls)),
+        "wall_s": wall,
+        "per_submission_s": wall / submissions,
+        "cpu_s": (after.ru_utime - usage.ru_utime) + (after.ru_stime - usage.ru_stime),
+        "max_rss_kb": after.ru_maxrss,
+        "round_trips": sum(stage["round_trips"] for stage in stages.values()),
+        "bytes_sent": sum(stage["bytes_sent"] for stage in stages.values()),
+        "bytes_received": sum(stage["bytes_received"] for stage in stages.values()),
+        "stages": stages,
+    }
+
+
+# ----
+# ---- parent: serves the fake API, runs the scenarios
+
+
+def write_config(workdir: Path, url: str, settings: List[str]):
+    lines = ["[github]", "secret = benchmark", f"url = {url}", f"state_dir = {workdir}"]
+    lines += [setting.replace("=", " = ", 1) for setting in settings]
+    (workdir / "config.ini").write_text("\n".join(lines) + "\n")
+
+
+def run_scenario(submissions: int, args) -> dict:
+    import fake_github
+
+    server = fake_github.FakeGitHub(
+        fake_github.seed_world(week_prs=args.week_prs),
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    with server, tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        write_config(workdir, server.url, args.set)
+
+        env = dict(os.environ)
+        env["PYTHONPATH"] = str(ROOT)
+        proc = subprocess.run(
+            [sys.executable, __file__, "--child", str(submissions), "--concurrency", str(args.concurrency)],
+            cwd=workdir,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if proc.returncode:
+            raise RuntimeError(f"{submissions} submissions failed:\n{proc.stderr}")
+
+        result = json.loads(proc.stdout)
+        result["server"] = {
+            "requests": dict(server.stats),
+            "points": server.rate_limit - server.remaining,
+        }
+    return result
+
+
+def bench(args) -> dict:
+    scenarios = {str(n): run_scenario(n, args) for n in args.submissions}
+
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "options": {
+            "latency": args.latency,
+            "jitter": args.jitter,
+            "error_rate": args.error_rate,
+            "concurrency": args.concurrency,
+            "week_prs": args.week_prs,
+            "seed": args.seed,
+            "set": args.set,
+        },
+        "scenarios": scenarios,
+    }
+
+
+def print_results(results: dict):
+    for n, result in results["scenarios"].items():
+        print(
+            f"{n} submissions: {result['wall_s']:.3f}s ({result['per_submission_s'] * 1000:.1f}ms each),"
+            f" {result['round_trips']} round trips, {result['bytes_sent']} B sent, {result['bytes_received']} B received,"
+            f" {result['cpu_s']:.3f}s CPU"
+        )
+        print(f"    {'stage':<10} {'calls':>6} {'wall':>9} {'cpu':>9} {'trips':>6} {'sent':>9} {'received':>9}")
+        for stage, totals in sorted(result["stages"].items(), key=lambda item: -item[1]["wall_s"]):
+            print(
+                f"    {stage:<10} {totals['calls']:>6} {totals['wall_s'] * 1000:>7.1f}ms {totals['cpu_s'] * 1000:>7.1f}ms"
+                f" {totals['round_trips']:>6} {totals['bytes_sent']:>9} {totals['bytes_received']:>9}"
+            )
+
+
+def compare(current: dict, previous: dict):
+    print(f"{'submissions':<12} {'metric':<15} {'before':>12} {'after':>12} {'change':>8}")
+    for n, result in current["scenarios"].items():
+        if n not in previous["scenarios"]:
+            continue
+        before = previous["scenarios"][n]
+        for metric in ("wall_s", "cpu_s", "round_trips", "bytes_sent", "bytes_received"):
+            change = (result[metric] - before[metric]) / before[metric] if before[metric] else 0.0
+            print(f"{n:<12} {metric:<15} {before[metric]:>12.4g} {result[metric]:>12.4g} {change:>+8.1%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("submissions", nargs="*", type=int, default=SUBMISSIONS)
+    parser.add_argument("--concurrency", type=int, default=1, help="submissions in flight at once (threads)")
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds the fake server takes per request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="most seconds added to the latency, at random")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="probability of a 502")
+    parser.add_argument("--week-prs", type=int, default=20, help="PRs already opened this week")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE", help="[github] option of the bot")
+    parser.add_argument("-o", "--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="previous results (JSON) to compare against")
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        print(json.dumps(run_child(args.child, args.concurrency)))
+        sys.exit(0)
+
+    results = bench(args)
+    print_results(results)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+        print()
+        compare(results, previous)
@@ -0,0 +1,350 @@
+#! /usr/bin/env python3
+"""Record real HTTP exchanges to a fixture file, and replay them offline.
+
+To profile `repo_query`, `count_sections` or `mutate` on a real week's
+payloads, without network access or a token, record them once:
+
+    # config.ini, [github]:
+    cassette = fixtures/week.json.gz
+    cassette_mode = record
+
+then switch `cassette_mode` to `replay`. Every transport goes through the
+cassette: the GraphQL endpoints (`Cassette.urlopen` in front of the sync
+`ConnectionPool`, `Cassette.pool` in front of the async one) and the template
+downloads (`Cassette.session`, a `requests` session).
+
+The fixture is gzipped JSON. It never holds request headers (so no token),
+and holds only a hash of each request body. On replay, a request gets the
+next recorded response to the same request. If there isn't one (its
+variables changed, e.g. a timestamped branch name), it gets the next
+recorded response to the same operation instead. Responses are replayed
+instantly, or at their recorded timings (`cassette_speed`: 1 is real time,
+2 twice as fast).
+
+    python3 cassette.py fixtures/week.json.gz   # what's in a fixture
+"""
+
+import argparse
+import asyncio
+import atexit
+import gzip
+import hashlib
+import http.client
+import io
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from config import Cfg
+
+# (requests is only imported once a session is asked for: github imports this module)
+if TYPE_CHECKING:
+    import requests
+
+
+# response headers worth keeping: the ones the bot (or a profile) looks at
+HEADERS = ("content-type", "etag", "last-modified", "x-ratelimit-limit", "x-ratelimit-remaining", "x-ratelimit-reset")
+
+RECORD, REPLAY = "record", "replay"
+
+
+class CassetteMiss(Exception):
+    """Raised when replaying a request that was never recorded."""
+
+
+class Exchange(NamedTuple):
+    method: str
+    url: str
+    operation: Optional[str]    # GraphQL operation name, if any
+    match: str                  # hash of the canonical request body
+    status: int
+    reason: str
+    headers: Dict[str, str]
+    body: str
+    elapsed: float              # seconds the response took
+
+
+def _request_key(body: Union[bytes, str, None]) -> Tuple[Optional[str], str]:
+    """Get (operation name, hash of the canonical body) of a request body."""
+    if not body:
+        return None, ""
+    if isinstance(body, str):
+        body = body.encode()
+
+    try:
+        request = json.loads(body)
+    except ValueError:
+        return None, hashlib.sha1(body).hexdigest()
+
+    operation = request.get("operationName") if isinstance(request, dict) else None
+    canonical = json.dumps(request, sort_keys=True, separators=(",", ":")).encode()
+    return operation, hashlib.sha1(canonical).hexdigest()
+
+
+def _message(headers: Dict[str, str]) -> http.client.HTTPMessage:
+    block = "".join(f"{name}: {value}\r\n" for name, value in headers.items()) + "\r\n"
+    return http.client.parse_headers(io.BytesIO(block.encode("latin-1")))
+
+
+class Cassette:
+    """Recorded exchanges, in the order they happened.
+
+    Args:
+        path: the fixture file.
+        mode: `record` (send requests, and save them on exit) or `replay`.
+        speed: replay at the recorded timings, this many times faster;
+            None replays instantly.
+    """
+
+    def __init__(self, path: Union[str, Path], mode: str = REPLAY, speed: Optional[float] = None):
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"unknown cassette mode: {mode}")
+        self.path = Path(path)
+        self.mode = mode
+        self.speed = speed
+
+        self.exchanges: List[Exchange] = self.load(self.path) if mode == REPLAY else []
+        self._lock = threading.Lock()
+
+        # replay: indices of the exchanges of each request, and of each operation
+        self._by_match: Dict[tuple, List[int]] = {}
+        self._by_operation: Dict[tuple, List[int]] = {}
+        for i, exchange in enumerate(self.exchanges):
+            self._by_match.setdefault((exchange.method, exchange.url, exchange.match), []).append(i)
+            self._by_operation.setdefault((exchange.method, exchange.url, exchange.operation), []).append(i)
+        self._played = set()
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == RECORD
+
+    @staticmethod
+    def load(path: Path) -> List[Exchange]:
+        with gzip.open(path, "rt") as f:
+            return [Exchange(**exchange) for exchange in json.load(f)["exchanges"]]
+
+    def save(self):
+        """Write the recorded exchanges to `path`."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            fixture = {"version": 1, "exchanges": [exchange._asdict() for exchange in self.exchanges]}
+        with gzip.open(self.path, "wt") as f:
+            json.dump(fixture, f, separators=(",", ":"))
+
+    def record(self, method: str, url: str, body, status: int, reason: str, headers, content: bytes, elapsed: float):
+        operation, match = _request_key(body)
+        kept = {name: value for name, value in headers.items() if name.lower() in HEADERS}
+        exchange = Exchange(method, url, operation, match, status, reason, kept, content.decode(), round(elapsed, 4))
+        with self._lock:
+            self.exchanges.append(exchange)
+
+    def _next(self, indices: Optional[List[int]]) -> Optional[int]:
+        """First of `indices` not played yet; the last one again once all were."""
+        if not indices:
+            return None
+        for i in indices:
+            if i not in self._played:
+                return i
+        return indices[-1]
+
+    def play(self, method: str, url: str, body) -> Exchange:
+        """Get the recorded response to a request.
+
+        Raises:
+            CassetteMiss: if neither this request nor its operation was recorded.
+        """
+        operation, match = _request_key(body)
+        with self._lock:
+            i = self._next(self._by_match.get((method, url, match)))
+            if i is None:
+                i = self._next(self._by_operation.get((method, url, operation)))
+            if i is None:
+                raise CassetteMiss(f"{method} {url} ({operation or 'no operation'}) was not recorded in {self.path}")
+            self._played.add(i)
+            return self.exchanges[i]
+
+    def delay(self, exchange: Exchange) -> float:
+        return exchange.elapsed / self.speed if self.speed else 0.0
+
+    # ---- transports
+
+    def urlopen(self, inner=None) -> "CassetteUrlopen":
+        """`urlopen` for `HTTPEndpoint`, in front of `inner` (e.g. a `ConnectionPool`)."""
+        return CassetteUrlopen(self, inner or urllib.request.urlopen)
+
+    def pool(self, inner) -> "CassettePool":
+        """Stand-in for an `AsyncConnectionPool`, in front of `inner`."""
+        return CassettePool(self, inner)
+
+    def session(self, session: Optional["requests.Session"] = None) -> "requests.Session":
+        """`requests` session whose requests go through the cassette."""
+        import requests
+
+        session = session or requests.Session()
+        adapter = CassetteAdapter(self)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+
+class _Response(io.BytesIO):
+    """Buffered response, like the one `urlopen` returns."""
+
+    def __init__(self, status: int, reason: str, headers: http.client.HTTPMessage, content: bytes):
+        super().__init__(content)
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+
+
+class CassetteUrlopen:
+    """`urlopen` that records (or replays) every request."""
+
+    def __init__(self, cassette: Cassette, inner):
+        self.cassette = cassette
+        self.inner = inner
+
+    def __call__(self, req: urllib.request.Request, timeout: Optional[float] = None) -> _Response:
+        method, url = req.get_method(), req.full_url
+        if self.cassette.recording:
+            return self._record(req, method, url, timeout)
+
+        exchange = self.cassette.play(method, url, req.data)
+        delay = self.cassette.delay(exchange)
+        if delay > 0:
+            time.sleep(delay)
+
+        headers = _message(exchange.headers)
+        content = exchange.body.encode()
+        if exchange.status >= 400:
+            raise urllib.error.HTTPError(url, exchange.status, exchange.reason, headers, io.BytesIO(content))
+        return _Response(exchange.status, exchange.reason, headers, content)
+
+    def _record(self, req: urllib.request.Request, method: str, url: str, timeout: Optional[float]) -> _Response:
+        start = time.perf_counter()
+        try:
+            with self.inner(req, timeout=timeout) as resp:
+                content = resp.read()
+                status, reason, headers = resp.status, resp.reason, resp.headers
+        except urllib.error.HTTPError as exc:
+            content = exc.read()
+            self.cassette.record(method, url, req.data, exc.code, exc.reason, exc.headers, content, time.perf_counter() - start)
+            raise urllib.error.HTTPError(url, exc.code, exc.reason, exc.headers, io.BytesIO(content))
+
+        self.cassette.record(method, url, req.data, status, reason, headers, content, time.perf_counter() - start)
+        return _Response(status, reason, headers, content)
+
+
+class CassettePool:
+    """Async counterpart of `CassetteUrlopen`, with `AsyncConnectionPool`'s interface."""
+
+    def __init__(self, cassette: Cassette, inner):
+        self.cassette = cassette
+        self.inner = inner
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        body: bytes = b"",
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> Tuple[int, str, http.client.HTTPMessage, bytes]:
+        if self.cassette.recording:
+            start = time.perf_counter()
+            status, reason, response_headers, content = await self.inner.request(method, url, body, headers, timeout)
+            self.cassette.record(method, url, body, status, reason, response_headers, content, time.perf_counter() - start)
+            return status, reason, response_headers, content
+
+        exchange = self.cassette.play(method, url, body)
+        delay = self.cassette.delay(exchange)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return exchange.status, exchange.reason, _message(exchange.headers), exchange.body.encode()
+
+    def close(self):
+        self.inner.close()
+
+
+class CassetteAdapter:
+    """`requests` transport adapter (as far as `Session` uses one) that records (or replays) every request."""
+
+    def __init__(self, cassette: Cassette, inner=None):
+        from requests.adapters import HTTPAdapter
+
+        self.cassette = cassette
+        self.inner = inner or HTTPAdapter()
+
+    def send(self, request: "requests.PreparedRequest", **kwargs) -> "requests.Response":
+        import requests
+        from requests.structures import CaseInsensitiveDict
+
+        if self.cassette.recording:
+            start = time.perf_counter()
+            resp = self.inner.send(request, **kwargs)
+            self.cassette.record(
+                request.method, request.url, request.body,
+                resp.status_code, resp.reason, resp.headers, resp.content, time.perf_counter() - start,
+            )
+            return resp
+
+        exchange = self.cassette.play(request.method, request.url, request.body)
+        delay = self.cassette.delay(exchange)
+        if delay > 0:
+            time.sleep(delay)
+
+        resp = requests.Response()
+        resp.status_code = exchange.status
+        resp.reason = exchange.reason
+        resp.headers = CaseInsensitiveDict(exchange.headers)
+        resp._content = exchange.body.encode()
+        resp.encoding = "utf-8"
+        resp.url = request.url
+        resp.request = request
+        return resp
+
+    def close(self):
+        self.inner.close()
+
+
+_cassette: Optional[Cassette] = None
+_configured = False
+
+
+def get_cassette() -> Optional[Cassette]:
+    """Get this process' cassette, if config.ini sets one (`cassette`, `cassette_mode`)."""
+    global _cassette, _configured
+    if not _configured:
+        _configured = True
+        cfg = Cfg().cfg
+        path = cfg.get("github", "cassette", fallback=None)
+        if path:
+            speed = cfg.getfloat("github", "cassette_speed", fallback=None)
+            _cassette = Cassette(path, cfg.get("github", "cassette_mode", fallback=REPLAY), speed)
+            if _cassette.recording:
+                atexit.register(_cassette.save)
+    return _cassette
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("fixture")
+    args = parser.parse_args()
+
+    exchanges = Cassette.load(Path(args.fixture))
+    counts = Counter(exchange.operation or f"{exchange.method} {exchange.url}" for exchange in exchanges)
+    sizes = Counter()
+    elapsed = Counter()
+    for exchange in exchanges:
+        name = exchange.operation or f"{exchange.method} {exchange.url}"
+        sizes[name] += len(exchange.body)
+        elapsed[name] += exchange.elapsed
+
+    print(f"{'exchange':<48} {'count':>5} {'bytes':>9} {'seconds':>8}")
+    for name, count in counts.most_common():
+        print(f"{name:<48} {count:>5} {sizes[name]:>9} {elapsed[name]:>8.3f}")
@@ -1,7 +1,13 @@
+import json
 from configparser import ConfigParser
+from hashlib import sha256
+from pathlib import Path
 from typing import Optional
 
 
+ROOT = Path(__file__).parent
+
+
 class Cfg:
     """Singleton class for configuration, in case it needs to be used in multiple locations.
 
@@ -17,3 +23,25 @@ class Cfg:
             cls._instance.cfg.read("config.ini")
 
         return cls._instance
+
+
+def state_path(name: str) -> Path:
+    """Where to keep the on-disk state `name` (e.g. `.query-cache.json`) of the bot.
+
+    Each source of GitHub data gets its own file: a stand-in's - another
+    `url` (e.g. fake_github.py) or a replayed `cassette` - is kept apart from
+    the live API's, so that its data is never served to the live bot.
+    """
+    cfg = Cfg().cfg["github"]
+    state_dir = Path(cfg.get("state_dir", fallback=str(ROOT)))
+
+    source = [cfg.get("url", fallback=None)]
+    # (a recording talks to `url`, see cassette.py)
+    if cfg.get("cassette_mode", fallback="replay") == "replay":
+        source.append(cfg.get("cassette", fallback=None))
+    if not any(source):
+        return state_dir / name
+
+    digest = sha256(json.dumps(source).encode()).hexdigest()[:12]
+    path = Path(name)
+    return state_dir / f"{path.stem}.{digest}{path.suffix}"
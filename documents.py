@@ -0,0 +1,176 @@
+"""Precompiled GraphQL documents for `Operations`.
+
+Serializing an sgqlc `Operation` walks its whole object graph, and
+`HTTPEndpoint` does that on every call. This module serializes every
+operation once into `operations.json` (keyed by a hash of `operations.gql`
+and the generated `operations.py`), which is generated and committed along
+with them; afterwards only that file is loaded: no sgqlc operation is built
+to send a request.
+
+    ENDPOINT(documents.get("GetSyncRefs"), {"upstream": "phaazon", "fork": "amar1729"})
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import re
+import urllib.request
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from sgqlc.endpoint.http import HTTPEndpoint
+
+
+ROOT = Path(__file__).parent
+SOURCES = (ROOT / "operations.gql", ROOT / "operations.py")
+CACHE_PATH = ROOT / "operations.json"
+
+_NAME_RE = re.compile(r"(?:query|mutation) (\w+)")
+
+logger = logging.getLogger(__name__)
+
+
+class Document(str):
+    """Frozen query string of one operation.
+
+    Being a `str`, it can be passed anywhere sgqlc expects a query.
+
+    Attributes:
+        name: GraphQL name of the operation, e.g. `GetSyncRefs`.
+        variables: variable name -> GraphQL type, e.g. `{"owner": "String!"}`.
+        connections: `first`/`last` path of each connection, see `query_cost`.
+    """
+
+    name: str
+    variables: Dict[str, str]
+    connections: List[list]
+    _prefix: bytes
+
+    def __new__(cls, query: str, name: str, variables: Dict[str, str], connections: Optional[List[list]] = None):
+        self = super().__new__(cls, query)
+        self.name = name
+        self.variables = variables
+        self.connections = connections or []
+        # everything in the request body but the variables themselves
+        self._prefix = f'{{"query": {json.dumps(query)}, "operationName": {json.dumps(name)}, "variables": '.encode()
+        return self
+
+    def body(self, variables: Optional[dict] = None) -> bytes:
+        """JSON body of a POST request for this operation."""
+        return self._prefix + json.dumps(variables).encode() + b"}"
+
+
+class CompiledEndpoint(HTTPEndpoint):
+    """`HTTPEndpoint` that sends a `Document`'s pre-serialized body as is."""
+
+    def get_http_post_request(self, query, variables, operation_name, headers):
+        if not isinstance(query, Document):
+            return super().get_http_post_request(query, variables, operation_name, headers)
+
+        post_data = query.body(variables)
+        headers.update({
+            "Content-Type": "application/json; charset=utf-8",
+            "Content-Length": len(post_data),
+        })
+        return urllib.request.Request(url=self.url, data=post_data, headers=headers, method="POST")
+
+
+def source_hash() -> str:
+    digest = hashlib.sha256()
+    for path in SOURCES:
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def build() -> Dict[str, dict]:
+    """Serialize every operation of `Operations`.
+
+    Returns:
+        operation name -> {"query": ..., "variables": {name: type}, "connections": [...]}
+    """
+    from graphql import OperationDefinitionNode, parse, print_ast
+
+    import query_cost
+    from operations import Operations
+
+    with open(SOURCES[0]) as f:
+        source = f.read()
+    document = parse(source)
+    connections = query_cost.connections(source)
+
+    variables = {
+        definition.name.value: {
+            var.variable.name.value: print_ast(var.type)
+            for var in definition.variable_definitions
+        }
+        for definition in document.definitions
+        if isinstance(definition, OperationDefinitionNode)
+    }
+
+    compiled = {}
+    for kind in (Operations.query, Operations.mutation):
+        for attr, op in vars(kind).items():
+            if attr.startswith("_"):
+                continue
+            query = bytes(op).decode()
+            name = _NAME_RE.match(query).group(1)
+            compiled[name] = {
+                "query": query,
+                "variables": variables.get(name, {}),
+                "connections": connections.get(name, []),
+            }
+
+    return compiled
+
+
+def save(cache: dict, path: Path = CACHE_PATH):
+    """Write the cache through a temp file, so concurrent readers never see half of it."""
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp, "w") as f:
+            json.dump(cache, f, indent=2)
+        os.replace(tmp, path)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def load(path: Path = CACHE_PATH) -> Dict[str, Document]:
+    """Load compiled documents, rebuilding the cache if it is missing or stale."""
+    key = source_hash()
+    try:
+        with open(path) as f:
+            cache = json.load(f)
+        if cache["hash"] != key:
+            raise ValueError("stale cache")
+    except (OSError, ValueError, KeyError):
+        cache = {"hash": key, "operations": build()}
+        try:
+            save(cache, path)
+        except OSError as exc:
+            # e.g. a read-only install: use this build for this process only
+            logger.warning("could not save %s, run `python3 documents.py`: %s", path.name, exc)
+
+    return {
+        name: Document(op["query"], name, op["variables"], op.get("connections"))
+        for name, op in cache["operations"].items()
+    }
+
+
+_documents: Optional[Dict[str, Document]] = None
+
+
+def get(name: str) -> Document:
+    """Get the compiled document of an operation, by its GraphQL name."""
+    global _documents
+    if _documents is None:
+        _documents = load()
+    return _documents[name]
+
+
+if __name__ == "__main__":
+    # build step: (re)write the cache
+    CACHE_PATH.unlink(missing_ok=True)
+    print(f"compiled {len(load())} operations into {CACHE_PATH.name}")
@@ -0,0 +1,662 @@
+#! /usr/bin/env python3
+"""Local stand-in for GitHub's GraphQL API, for benchmarks and tests.
+
+`FakeGitHub` serves the operations in `operations.gql` (and the batched
+`SyncRefs` mutation) over HTTP, against `schema.json`, from an in-memory
+`World` of repos, refs, commits and PRs - by default the upstream contents
+repo in the middle of a week, and a fork of it that is a week behind (see
+`seed_world`). Requests are validated and executed by graphql-core, so a
+malformed or mistyped request fails like it would on GitHub.
+
+So that every performance feature can be measured offline, and the same
+way every time (`seed`), it can also:
+
+    - delay each response by `latency` seconds (plus up to `jitter`)
+    - fail requests with a 502: at random (`error_rate`), or the next `n`
+      requests of an operation (`fail`)
+    - charge each request its points (see `query_cost`) from a budget of
+      `rate_limit` points per `window` seconds, report it in `rateLimit`,
+      and answer `RATE_LIMITED` once it is spent
+
+    with FakeGitHub(latency=0.05) as server:
+        # config.ini: [github] url = server.url
+        ...
+        print(server.stats)
+
+or as a server of its own:
+
+    python3 fake_github.py --port 8765 --latency 0.05 --error-rate 0.05
+"""
+
+import argparse
+import base64
+import hashlib
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from graphql import GraphQLError, build_client_schema, execute, parse, validate
+from graphql.language import OperationDefinitionNode
+
+import query_cost
+
+
+ROOT = Path(__file__).parent
+SCHEMA_PATH = ROOT / "schema.json"
+
+REPO_NAME = "this-week-in-neovim-contents"
+
+# GitHub's largest page
+MAX_PAGE = 100
+
+
+class FakeError(Exception):
+    """Error of a field, reported like GitHub does (with a `type`)."""
+
+    def __init__(self, message: str, type: str = "UNPROCESSABLE"):
+        super().__init__(message)
+        self.type = type
+
+
+# ----
+# ---- the world: repos, refs, commits and PRs
+
+
+class Blob:
+    def __init__(self, text: str):
+        self.text = text
+        self.oid = hashlib.sha1(f"blob {text}".encode()).hexdigest()
+
+
+class Commit:
+    def __init__(self, tree: Dict[str, str], message: str, parent: Optional["Commit"] = None):
+        self.tree = tree
+        self.message = message
+        self.parent = parent
+        self.oid = hashlib.sha1(
+            json.dumps([sorted(tree.items()), message, parent and parent.oid]).encode()
+        ).hexdigest()
+
+
+class Ref:
+    def __init__(self, id: str, repo: "Repository", name: str, target: Commit):
+        self.id = id
+        self.repo = repo
+        self.name = name
+        self.target = target
+
+
+class PullRequest:
+    def __init__(self, id: str, repo: "Repository", number: int, title: str, head_ref: Optional[Ref], files: List[str], state: str = "OPEN"):
+        self.id = id
+        self.repo = repo
+        self.number = number
+        self.title = title
+        self.head_ref = head_ref
+        self.state = state
+        self._files = files
+        self.url = f"https://github.com/{repo.owner}/{repo.name}/pull/{number}"
+
+    def files(self, info, first=None, last=None, after=None, before=None):
+        return connection(info, [{"path": path} for path in self._files], first, last, after, before)
+
+
+class Repository:
+    def __init__(self, id: str, owner: str, name: str):
+        self.id = id
+        self.owner = owner
+        self.name = name
+        self.name_with_owner = f"{owner}/{name}"
+        self._refs: Dict[str, Ref] = {}
+        self._pull_requests: List[PullRequest] = []
+
+    def refs(self, info, ref_prefix, first=None, last=None, after=None, before=None, **_):
+        refs = [ref for name, ref in sorted(self._refs.items()) if f"refs/heads/{name}".startswith(ref_prefix)]
+        return connection(info, refs, first, last, after, before)
+
+    def pull_requests(self, info, states=None, first=None, last=None, after=None, before=None, **_):
+        prs = [pr for pr in self._pull_requests if states is None or pr.state in states]
+        return connection(info, prs, first, last, after, before)
+
+    def object(self, info, expression=None, oid=None):
+        """`rev:path` (a blob), or `rev` / an oid (a commit)."""
+        world = info.context.world
+        if oid is not None:
+            return world.commits.get(oid)
+
+        rev, _, path = expression.partition(":")
+        commit = self._refs[rev].target if rev in self._refs else world.commits.get(rev)
+        if commit is None or not path:
+            return commit
+        text = commit.tree.get(path)
+        return None if text is None else Blob(text)
+
+
+def _cursor(i: int) -> str:
+    return base64.b64encode(f"cursor:v2:{i}".encode()).decode()
+
+
+def _index(cursor: str) -> int:
+    return int(base64.b64decode(cursor).decode().rsplit(":", 1)[1])
+
+
+def connection(info, items: list, first=None, last=None, after=None, before=None) -> dict:
+    """Page `items` like a GitHub connection."""
+    name = info.field_name
+    for arg, n in (("first", first), ("last", last)):
+        if n is not None and not 1 <= n <= MAX_PAGE:
+            raise FakeError(f"Requesting {n} records on the `{name}` connection exceeds the `{arg}` limit of {MAX_PAGE} records.", "EXCESSIVE_PAGE_SIZE")
+    if first is None and last is None:
+        fields = {s.name.value for node in info.field_nodes for s in node.selection_set.selections}
+        if fields - {"totalCount", "__typename"}:
+            raise FakeError(f"You must provide a `first` or `last` value to properly paginate the `{name}` connection.", "MISSING_PAGINATION_BOUNDARIES")
+
+    start, end = 0, len(items)
+    if after is not None:
+        start = max(start, _index(after) + 1)
+    if before is not None:
+        end = min(end, _index(before))
+    if first is not None:
+        end = min(end, start + first)
+    if last is not None:
+        start = max(start, end - last)
+
+    edges = [{"cursor": _cursor(i), "node": items[i]} for i in range(start, end)]
+    return {
+        "totalCount": len(items),
+        "edges": edges,
+        "nodes": [edge["node"] for edge in edges],
+        "pageInfo": {
+            "hasPreviousPage": start > 0,
+            "hasNextPage": end < len(items),
+            "startCursor": edges[0]["cursor"] if edges else None,
+            "endCursor": edges[-1]["cursor"] if edges else None,
+        },
+    }
+
+
+class World:
+    """Everything the fake server knows: repos (by owner), and every node and commit."""
+
+    def __init__(self):
+        self.repos: Dict[str, Repository] = {}
+        self.nodes: Dict[str, object] = {}
+        self.commits: Dict[str, Commit] = {}
+        self._ids = itertools.count(1)
+
+    def _id(self, prefix: str) -> str:
+        return f"{prefix}_kw{next(self._ids):08d}"
+
+    def add_repo(self, owner: str, name: str = REPO_NAME) -> Repository:
+        repo = Repository(self._id("R"), owner, name)
+        self.repos[owner.lower()] = repo
+        self.nodes[repo.id] = repo
+        return repo
+
+    def repo(self, owner: str, name: str = REPO_NAME) -> Optional[Repository]:
+        repo = self.repos.get(owner.lower())
+        return repo if repo is not None and repo.name == name else None
+
+    def commit(self, parent: Optional[Commit], message: str, files: Dict[str, str], deletions: Iterable[str] = ()) -> Commit:
+        tree = dict(parent.tree) if parent is not None else {}
+        tree.update(files)
+        for path in deletions:
+            tree.pop(path, None)
+        commit = Commit(tree, message, parent)
+        self.commits[commit.oid] = commit
+        return commit
+
+    def set_ref(self, repo: Repository, name: str, target: Commit) -> Ref:
+        ref = repo._refs.get(name)
+        if ref is None:
+            ref = repo._refs[name] = Ref(self._id("REF"), repo, name, target)
+            self.nodes[ref.id] = ref
+        ref.target = target
+        return ref
+
+    def open_pr(self, repo: Repository, title: str, head_ref: Optional[Ref], files: List[str], state: str = "OPEN") -> PullRequest:
+        pr = PullRequest(self._id("PR"), repo, len(repo._pull_requests) + 1, title, head_ref, files, state)
+        repo._pull_requests.append(pr)
+        self.nodes[pr.id] = pr
+        return pr
+
+
+def seed_world(past_prs: int = 40, week_prs: int = 20, date: str = "2023/01/13", fork: str = "amar1729") -> World:
+    """Build the usual world: the upstream contents repo and a fork of it.
+
+    Upstream (phaazon) has `past_prs` merged PRs of the week before, this
+    week's parent PR (open, from this week's branch) and `week_prs` PRs
+    after it, split between new plugins and updates. The fork's master is a
+    commit behind upstream's, and it doesn't have this week's branch yet.
+    """
+    world = World()
+    upstream = world.add_repo("phaazon")
+    repo_fork = world.add_repo(fork)
+
+    base = f"contents/{date}"
+    week_before = world.commit(None, "templates", {
+        "template/3-new-plugins/1-example.md": "# [plugin](https://github.com/owner/plugin)\n\ndescription\n",
+        "template/4-updates/1-example.md": "# [plugin](https://github.com/owner/plugin)\n\nwhat changed\n",
+    })
+    world.set_ref(repo_fork, "master", week_before)
+
+    for i in range(1, past_prs + 1):
+        world.open_pr(upstream, f"[new plugin]: old-{i}", None, [f"contents/2023/01/06/3-new-plugins/{i}-old-{i}.md"], "MERGED")
+    master = world.commit(week_before, "last week", {"contents/2023/01/06/0-intro.md": "last week\n"})
+    world.set_ref(upstream, "master", master)
+
+    weekly = world.commit(master, "this week", {f"{base}/0-intro.md": "this week\n"})
+    weekly_ref = world.set_ref(upstream, date.replace("/", "-"), weekly)
+    world.open_pr(upstream, f"TWiN {date}", weekly_ref, [f"{base}/0-intro.md"])
+
+    sections = {3: 0, 4: 0}
+    for i in range(week_prs):
+        section = 3 if i % 3 else 4
+        sections[section] += 1
+        directory = "3-new-plugins" if section == 3 else "4-updates"
+        world.open_pr(upstream, f"plugin {i}", None, [f"{base}/{directory}/{sections[section]}-plugin-{i}.md"])
+
+    return world
+
+
+# ----
+# ---- GraphQL: root fields and mutations
+
+
+class Request:
+    """What resolvers may need to know about the request they run for."""
+
+    def __init__(self, world: World, cost: int, remaining: int, reset_at: float):
+        self.world = world
+        self.cost = cost
+        self.remaining = remaining
+        self.reset_at = reset_at
+
+
+class Root:
+    """Root value of every request: the fields of `Query` and `Mutation` we serve."""
+
+    def repository(self, info, owner, name, **_):
+        return info.context.world.repo(owner, name)
+
+    def node(self, info, id):
+        return info.context.world.nodes.get(id)
+
+    def rate_limit(self, info, **_):
+        request = info.context
+        return {
+            "cost": request.cost,
+            "remaining": request.remaining,
+            "resetAt": datetime.fromtimestamp(request.reset_at, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        }
+
+    def _node(self, info, id: str, kind: type):
+        node = info.context.world.nodes.get(id)
+        if not isinstance(node, kind):
+            raise FakeError(f"Could not resolve to a node with the global id of '{id}'", "NOT_FOUND")
+        return node
+
+    def update_ref(self, info, input):
+        ref = self._node(info, input["refId"], Ref)
+        target = info.context.world.commits.get(input["oid"])
+        if target is None:
+            raise FakeError(f"Could not resolve to a Commit with the oid of '{input['oid']}'", "NOT_FOUND")
+        ref.target = target
+        return {"clientMutationId": input.get("clientMutationId"), "ref": ref}
+
+    def create_ref(self, info, input):
+        world = info.context.world
+        repo = self._node(info, input["repositoryId"], Repository)
+        name = input["name"]
+        if not name.startswith("refs/heads/"):
+            raise FakeError(f"Name '{name}' must be a fully qualified ref name")
+        if name[len("refs/heads/"):] in repo._refs:
+            raise FakeError(f"A ref named \"{name}\" already exists in the repository.")
+        # forks share their objects with upstream
+        target = world.commits.get(input["oid"])
+        if target is None:
+            raise FakeError(f"Object does not exist: {input['oid']}", "NOT_FOUND")
+        ref = world.set_ref(repo, name[len("refs/heads/"):], target)
+        return {"clientMutationId": input.get("clientMutationId"), "ref": ref}
+
+    def delete_ref(self, info, input):
+        ref = self._node(info, input["refId"], Ref)
+        del ref.repo._refs[ref.name]
+        del info.context.world.nodes[ref.id]
+        return {"clientMutationId": input.get("clientMutationId")}
+
+    def create_commit_on_branch(self, info, input):
+        world = info.context.world
+        branch = input["branch"]
+        if branch.get("id") is not None:
+            ref = self._node(info, branch["id"], Ref)
+        else:
+            owner, _, name = branch["repositoryNameWithOwner"].partition("/")
+            repo = world.repo(owner, name)
+            ref = repo and repo._refs.get(branch["branchName"])
+            if ref is None:
+                raise FakeError(f"Could not resolve to a branch '{branch['branchName']}'", "NOT_FOUND")
+
+        if ref.target.oid != input["expectedHeadOid"]:
+            raise FakeError(f"Expected branch to point to \"{input['expectedHeadOid']}\" but it did not. Pull and try again!", "STALE_DATA")
+
+        files = {
+            addition["path"]: base64.b64decode(addition["contents"]).decode()
+            for addition in (input["fileChanges"].get("additions") or [])
+        }
+        deletions = [deletion["path"] for deletion in input["fileChanges"].get("deletions") or []]
+        commit = world.commit(ref.target, input["message"]["headline"], files, deletions)
+        ref.target = commit
+        return {"clientMutationId": input.get("clientMutationId"), "commit": commit, "ref": ref}
+
+    def create_pull_request(self, info, input):
+        world = info.context.world
+        repo = self._node(info, input["repositoryId"], Repository)
+
+        # "owner:branch" for a branch of another repo (a fork)
+        owner, _, head_name = input["headRefName"].rpartition(":")
+        head_repo = world.repo(owner) if owner else repo
+        head = head_repo and head_repo._refs.get(head_name)
+        base = repo._refs.get(input["baseRefName"].rpartition(":")[2])
+        if head is None or base is None:
+            raise FakeError("Head sha can't be blank, Base sha can't be blank, No commits between, Head ref must be a branch", "UNPROCESSABLE")
+        for pr in repo._pull_requests:
+            if pr.state == "OPEN" and pr.head_ref is head:
+                raise FakeError(f"A pull request already exists for {head_repo.owner}:{head_name}.")
+
+        files = sorted(path for path, text in head.target.tree.items() if base.target.tree.get(path) != text)
+        if not files:
+            raise FakeError(f"No commits between {input['baseRefName']} and {input['headRefName']}")
+
+        pr = world.open_pr(repo, input["title"], head, files)
+        return {"clientMutationId": input.get("clientMutationId"), "pullRequest": pr}
+
+
+_SNAKE_RE = re.compile(r"(?<!^)(?=[A-Z])")
+
+
+def _snake(name: str) -> str:
+    return _SNAKE_RE.sub("_", name).lower()
+
+
+def resolve(source, info, **args):
+    """Resolve a field from a dict key, or an attribute / method of the same (snake_case) name."""
+    if isinstance(source, dict):
+        return source.get(info.field_name)
+    value = getattr(source, _snake(info.field_name), None)
+    if callable(value):
+        return value(info, **{_snake(arg): v for arg, v in args.items()})
+    return value
+
+
+def resolve_type(value, info, abstract_type) -> str:
+    return type(value).__name__
+
+
+# ----
+# ---- the server
+
+
+def _operation(document) -> Tuple[str, bool]:
+    """Get (name, is a mutation) of the operation of a document."""
+    for definition in document.definitions:
+        if isinstance(definition, OperationDefinitionNode):
+            name = definition.name.value if definition.name else "anonymous"
+            return name, definition.operation.value == "mutation"
+    return "anonymous", False
+
+
+class FakeGitHub:
+    """Fake GraphQL API, served on `url` from a background thread.
+
+    Args:
+        world: the repos to serve; `seed_world()` by default.
+        latency: seconds each response is delayed by.
+        jitter: most seconds added to `latency`, at random.
+        error_rate: probability of a request failing with a 502.
+        rate_limit: points each `window` (GitHub: 5000 an hour).
+        window: seconds after which the points are reset.
+        seed: seed of the random latency and errors (None: unseeded).
+        host, port: where to listen; port 0 picks a free one.
+
+    Attributes:
+        stats: requests (and errors) by operation name.
+        fail: operation name -> how many of its next requests fail with a 502.
+    """
+
+    def __init__(
+        self,
+        world: Optional[World] = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit: int = 5000,
+        window: float = 3600.0,
+        seed: Optional[int] = 0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.world = world or seed_world()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.window = window
+        self.random = random.Random(seed)
+
+        self.stats: Counter = Counter()
+        self.fail: Dict[str, int] = {}
+
+        self.remaining = rate_limit
+        self.reset_at = time.time() + window
+
+        with open(SCHEMA_PATH) as f:
+            introspection = json.load(f)
+        # (schema.json leaves out deprecated fields, which leaves a few types empty)
+        self.schema = build_client_schema(introspection.get("data", introspection), assume_valid=True)
+
+        # query -> (document, name, is a mutation, connection paths)
+        self._documents: Dict[str, tuple] = {}
+
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.fake = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/graphql"
+
+    def start(self) -> "FakeGitHub":
+        # poll for `stop` often: tests start and stop a server each
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """Serve from this thread, until interrupted."""
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._server.server_close()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeGitHub":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _parse(self, query: str):
+        """Parse and validate a query, once per distinct query."""
+        parsed = self._documents.get(query)
+        if parsed is None:
+            parsed = self._documents[query] = self._compile(query)
+        return parsed
+
+    def _compile(self, query: str):
+        document = parse(query)
+        errors = validate(self.schema, document)
+        if errors:
+            raise GraphQLError("; ".join(error.message for error in errors))
+
+        name, mutation = _operation(document)
+        if mutation:
+            return document, name, mutation, None
+        return document, name, mutation, query_cost.connections(query).get(name, [])
+
+    def _charge(self, points: int) -> Optional[int]:
+        """Spend `points`; get the points left, or None if there aren't enough."""
+        now = time.time()
+        if now >= self.reset_at:
+            self.remaining = self.rate_limit
+            self.reset_at = now + self.window
+        if self.remaining < points:
+            return None
+        self.remaining -= points
+        return self.remaining
+
+    def handle(self, body: dict) -> Tuple[int, dict]:
+        """Answer a request body: (HTTP status, response)."""
+        try:
+            document, name, mutation, paths = self._parse(body.get("query") or "")
+        except GraphQLError as exc:
+            return 200, {"errors": [{"message": exc.message}]}
+
+        variables = body.get("variables") or {}
+        with self._lock:
+            self.stats[name] += 1
+
+            # 502 before anything was applied, like a failing proxy would
+            if self.fail.get(name):
+                self.fail[name] -= 1
+                return 502, {}
+            if self.random.random() < self.error_rate:
+                return 502, {}
+
+            cost = 1 if mutation else query_cost.estimate(paths, variables).points
+            remaining = self._charge(cost)
+            if remaining is None:
+                self.stats["RATE_LIMITED"] += 1
+                return 200, {"errors": [{"type": "RATE_LIMITED", "message": "API rate limit exceeded for user ID 1."}]}
+
+            result = execute(
+                self.schema,
+                document,
+                root_value=Root(),
+                context_value=Request(self.world, cost, remaining, self.reset_at),
+                variable_values=variables,
+                operation_name=body.get("operationName"),
+                field_resolver=resolve,
+                type_resolver=resolve_type,
+            )
+
+        response = {"data": result.data}
+        if result.errors:
+            self.stats["errors"] += 1
+            response["errors"] = [_format(error) for error in result.errors]
+        return 200, response
+
+    def delay(self) -> float:
+        return self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0.0)
+
+
+def _format(error: GraphQLError) -> dict:
+    formatted = error.formatted
+    original = error.original_error
+    if isinstance(original, FakeError):
+        formatted["type"] = original.type
+    return formatted
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # keep-alive, like api.github.com
+    protocol_version = "HTTP/1.1"
+    # headers and body are written separately: don't wait for the client's (delayed) ACK in between
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        fake: FakeGitHub = self.server.fake
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+        if not self.headers.get("Authorization"):
+            self._send(401, {"message": "This endpoint requires you to be authenticated."})
+            return
+
+        try:
+            request = json.loads(body)
+        except ValueError as exc:
+            self._send(400, {"message": f"Problems parsing JSON: {exc}"})
+            return
+
+        status, response = fake.handle(request)
+        delay = fake.delay()
+        if delay > 0:
+            time.sleep(delay)
+
+        if status == 502:
+            self._send(502, b"<html><body><h1>502 Bad Gateway</h1></body></html>", "text/html")
+        else:
+            self._send(status, response, headers={
+                "X-RateLimit-Limit": fake.rate_limit,
+                "X-RateLimit-Remaining": fake.remaining,
+                "X-RateLimit-Reset": int(fake.reset_at),
+            })
+
+    def _send(self, status: int, content, content_type: str = "application/json; charset=utf-8", headers: Optional[dict] = None):
+        if not isinstance(content, bytes):
+            content = json.dumps(content).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(content)))
+        for header, value in (headers or {}).items():
+            self.send_header(header, str(value))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds each response is delayed by")
+    parser.add_argument("--jitter", type=float, default=0.0, help="most seconds added to the latency, at random")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="probability of a 502")
+    parser.add_argument("--rate-limit", type=int, default=5000, help="points per window")
+    parser.add_argument("--window", type=float, default=3600.0, help="seconds before the points reset")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--past-prs", type=int, default=40, help="PRs of the week before")
+    parser.add_argument("--week-prs", type=int, default=20, help="PRs of this week")
+    args = parser.parse_args()
+
+    server = FakeGitHub(
+        seed_world(args.past_prs, args.week_prs),
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        window=args.window,
+        seed=args.seed,
+        host=args.host,
+        port=args.port,
+    )
+    print(f"serving on {server.url}")
+    server.serve_forever()
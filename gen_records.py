@@ -0,0 +1,217 @@
+#! /usr/bin/env python3
+"""Generate `records.py`: slotted result classes shaped like our operations.
+
+Decoding a response with sgqlc (`op + data`) builds a full object tree of
+schema types. Instead, for every operation in `documents` (i.e. exactly what
+is sent, including fields sgqlc selects automatically) this generates one
+small `__slots__` class per selection set, and a straight-line decoder from
+the response JSON into them:
+
+    repo = records.decode("GetWeekPRs", data).repository
+
+Attribute names follow sgqlc (`headRef` -> `head_ref`), so code written
+against sgqlc objects keeps working. Leaf values are kept as returned in the
+JSON (e.g. `DateTime` stays a string).
+"""
+
+import argparse
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from graphql import parse
+from graphql.language import ast
+from sgqlc.types import BaseItem
+
+import documents
+from prune_schema import unwrap
+from schema_index import SchemaIndex
+
+
+HEADER = '''"""Result records of our GraphQL operations.
+
+Generated by `gen_records.py` from the compiled `documents` - do not edit.
+"""
+
+from typing import Any, Callable, Dict, Optional
+
+
+class Record:
+    """Base of the generated records: slotted, with a readable repr."""
+
+    __slots__ = ()
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{self.__class__.__name__}({fields})"
+
+    def __eq__(self, other):
+        if type(self) is not type(other):
+            return NotImplemented
+        return all(getattr(self, n) == getattr(other, n) for n in self.__slots__)
+
+
+def _list(decode: Callable, value: Optional[list]) -> Optional[list]:
+    if value is None:
+        return None
+    return [decode(item) for item in value]
+'''
+
+FOOTER = '''
+
+def decode(operation: str, response: dict) -> Any:
+    """Decode the `data` of a response to `operation` into records."""
+    return DECODERS[operation](response["data"])
+'''
+
+
+class Field(NamedTuple):
+    key: str            # key in the response JSON (alias or field name)
+    attr: str           # python attribute name
+    list_depth: int     # how many lists wrap the value
+    record: Optional[str]  # record class of the value, None for leaves
+    optional: bool      # only present for some types (from a fragment)
+
+
+def list_depth(type_ref: dict) -> int:
+    depth = 0
+    while type_ref["name"] is None:
+        if type_ref["kind"] == "LIST":
+            depth += 1
+        type_ref = type_ref["ofType"]
+    return depth
+
+
+class Generator:
+    """Build record classes for the operations of a schema.
+
+    Args:
+        types: type name -> introspection type.
+        root: the rest of the introspection `__schema`: `queryType`, etc.
+    """
+
+    def __init__(self, types, root: dict):
+        self.types = types
+        self.root = root
+
+        # class name -> fields
+        self.records: Dict[str, Tuple[Field, ...]] = {}
+        # operation name -> root record class
+        self.operations: Dict[str, str] = {}
+        self.fragments: Dict[str, ast.FragmentDefinitionNode] = {}
+
+    def field(self, type_name: str, field_name: str) -> dict:
+        for f in self.types[type_name]["fields"] or []:
+            if f["name"] == field_name:
+                return f
+        raise KeyError(f"{type_name}.{field_name} is not in the schema")
+
+    def collect(self, type_name: str, selection_set: ast.SelectionSetNode, prefix: str, optional=False) -> List[Field]:
+        fields = []
+        for selection in selection_set.selections:
+            if isinstance(selection, ast.InlineFragmentNode):
+                target = selection.type_condition.name.value if selection.type_condition else type_name
+                fields += self.collect(target, selection.selection_set, prefix, optional=True)
+                continue
+            if isinstance(selection, ast.FragmentSpreadNode):
+                fragment = self.fragments[selection.name.value]
+                target = fragment.type_condition.name.value
+                fields += self.collect(target, fragment.selection_set, prefix, optional=optional or target != type_name)
+                continue
+
+            name = selection.name.value
+            key = selection.alias.value if selection.alias else name
+            attr = "typename" if key == "__typename" else BaseItem._to_python_name(key)
+
+            if name == "__typename":
+                fields.append(Field(key, attr, 0, None, optional))
+                continue
+
+            field = self.field(type_name, name)
+            record = None
+            if selection.selection_set:
+                child = unwrap(field["type"])
+                record = self.add(f"{prefix}{child}", child, selection.selection_set, prefix)
+            fields.append(Field(key, attr, list_depth(field["type"]), record, optional))
+
+        return fields
+
+    def add(self, class_name: str, type_name: str, selection_set: ast.SelectionSetNode, prefix: str) -> str:
+        """Add the record class of a selection set, reusing an identical one."""
+        fields = tuple(self.collect(type_name, selection_set, prefix))
+
+        name, n = class_name, 1
+        while name in self.records and self.records[name] != fields:
+            n += 1
+            name = f"{class_name}{n}"
+        self.records[name] = fields
+        return name
+
+    def add_operation(self, query: str):
+        document = parse(query)
+        for definition in document.definitions:
+            if isinstance(definition, ast.FragmentDefinitionNode):
+                self.fragments[definition.name.value] = definition
+
+        for definition in document.definitions:
+            if not isinstance(definition, ast.OperationDefinitionNode):
+                continue
+            name = definition.name.value
+            root = self.root[f"{definition.operation.value}Type"]["name"]
+            self.operations[name] = self.add(name, root, definition.selection_set, name)
+
+    def render(self) -> str:
+        lines = [HEADER.rstrip("\n")]
+
+        for name, fields in self.records.items():
+            slots = ", ".join(f'"{f.attr}"' for f in fields) + ("," if len(fields) == 1 else "")
+            lines += [
+                "",
+                "",
+                f"class {name}(Record):",
+                f"    __slots__ = ({slots})",
+                "",
+                f"    def __init__(self, {', '.join(f.attr for f in fields)}):" if fields else "    def __init__(self):",
+            ]
+            lines += [f"        self.{f.attr} = {f.attr}" for f in fields] or ["        pass"]
+
+        for name, fields in self.records.items():
+            lines += [
+                "",
+                "",
+                f"def _decode_{name}(d: Optional[dict]) -> Optional[{name}]:",
+                "    if d is None:",
+                "        return None",
+                f"    return {name}(",
+            ]
+            for f in fields:
+                value = f'd.get("{f.key}")' if f.optional else f'd["{f.key}"]'
+                if f.record:
+                    decode = f"_decode_{f.record}"
+                    for _ in range(f.list_depth - 1):
+                        decode = f"lambda v, decode={decode}: _list(decode, v)"
+                    value = f"_list({decode}, {value})" if f.list_depth else f"{decode}({value})"
+                lines.append(f"        {value},")
+            lines.append("    )")
+
+        lines += ["", "", "DECODERS: Dict[str, Callable[[dict], Any]] = {"]
+        lines += [f'    "{op}": _decode_{record},' for op, record in self.operations.items()]
+        lines.append("}")
+
+        return "\n".join(lines) + "\n" + FOOTER
+
+
+def generate(schema_path: str) -> str:
+    index = SchemaIndex(schema_path)
+    generator = Generator(index, index.root)
+    for document in documents.load().values():
+        generator.add_operation(document)
+    return generator.render()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("schema", nargs="?", default="schema_min.json", help="introspection dump")
+    parser.add_argument("output", nargs="?", default="records.py")
+    args = parser.parse_args()
+
+    with open(args.output, "w") as f:
+        f.write(generate(args.schema))
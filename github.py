@@ -1,28 +1,118 @@
 #! /usr/bin/env python3
 
 
+import os
 import re
+import threading
 from base64 import b64encode
 from datetime import timedelta as td
 from datetime import datetime as dt
+from functools import partial
+from itertools import chain
 from pathlib import PosixPath
-from typing import List, Tuple
-
-from sgqlc.endpoint.http import HTTPEndpoint
+from typing import Any, Callable, Dict, Generic, Iterable, Iterator, List, Optional, Tuple, TypeVar
 
 # local imports
+import cassette
+import documents
+import querycache
+import ratelimit
+import records
+import refsync
+import templates
+import weekly
 from config import Cfg
+from documents import CompiledEndpoint
+from query_cost import CostLimit
+from ratelimit import ScheduledEndpoint
+from retry import RetryPolicy
+from singleflight import coalesced
+from transport import ConnectionPool
 
-# generated from gql schema:
-from schema import PullRequestEdge
-from operations import Operations
+# generated from operations.gql:
+from records import GetWeekPRsPullRequestEdge as PullRequestEdge
 
 
 GITHUB_URL = "https://api.github.com/graphql"
 
-BASE_HEADERS = {"Authorization": f"Bearer {Cfg().cfg['github']['secret']}"}
+# what `sync_twin_branch` syncs: the fork's refs to upstream's
+SYNC_REFS_VARIABLES = {"upstream": "phaazon", "fork": "amar1729"}
+
+T = TypeVar("T")
+
+
+class PerProcess(Generic[T]):
+    """A value built on first use, once per process (a forked child builds its own).
+
+    Concurrent first calls build only one.
+    """
+
+    def __init__(self, make: Callable[[], T]):
+        self.make = make
+        self._value: Optional[T] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> T:
+        if self._value is None or self._pid != os.getpid():
+            with self._lock:
+                if self._value is None or self._pid != os.getpid():
+                    self._value = self.make()
+                    self._pid = os.getpid()
+
+        return self._value
+
+    def set(self, value: T):
+        with self._lock:
+            self._value = value
+            self._pid = os.getpid()
+
+
+def endpoint_options(cfg) -> dict:
+    """Options of both endpoints (sync and async), from the `[github]` section of config.ini."""
+    return {
+        # (no token needed to replay a cassette)
+        "base_headers": {"Authorization": f"Bearer {cfg.get('secret', fallback='')}"},
+        "cost_limit": CostLimit.from_config(cfg),
+        "retry_policy": RetryPolicy.from_config(cfg),
+        "cache": querycache.get_cache(),
+    }
+
+
+def pool_options(cfg) -> dict:
+    """Options of both connection pools, from the `[github]` section of config.ini."""
+    return {
+        "max_size": cfg.getint("pool_size", fallback=4),
+        "idle_timeout": cfg.getfloat("idle_timeout", fallback=60.0),
+    }
+
+
+def make_endpoint() -> CompiledEndpoint:
+    cfg = Cfg().cfg["github"]
+
+    # reuse connections across the several requests of each PR
+    pool = ConnectionPool(**pool_options(cfg))
+    # record or replay requests, see cassette.py
+    urlopen = pool
+    fixture = cassette.get_cassette()
+    if fixture is not None:
+        urlopen = fixture.urlopen(pool)
+    # paced by the rate limit, see ratelimit.py
+    return ScheduledEndpoint(cfg.get("url", fallback=GITHUB_URL), urlopen=urlopen, **endpoint_options(cfg))
+
 
-ENDPOINT = HTTPEndpoint(GITHUB_URL, base_headers=BASE_HEADERS)
+# built on first use, so importing this module reads no config
+_endpoint: PerProcess[CompiledEndpoint] = PerProcess(make_endpoint)
+
+
+def get_endpoint() -> CompiledEndpoint:
+    """Get this process' GraphQL endpoint, building it the first time it is needed."""
+    return _endpoint.get()
+
+
+def set_endpoint(endpoint: CompiledEndpoint):
+    """Use `endpoint` for all requests of this process (e.g. a local stand-in)."""
+    _endpoint.set(endpoint)
 
 
 def get_base_path(pr: PullRequestEdge) -> PosixPath:
@@ -42,130 +132,462 @@ def canonical(plugin_name: str) -> str:
     return re.sub(r"[ .]", "-", canonical)
 
 
-# ----
-# ---- GraphQL queries
+def upstream_refs(repo) -> Dict[str, str]:
+    """Map ref name -> target oid of a repository's refs, "master" first."""
+    # "sort" this so the "master" ref gets inserted into this dict first
+    refs = {
+        ref.node.name: ref.node.target.oid
+        for ref in repo.refs.edges
+        if ref.node.name == "master"
+    }
 
+    for ref in repo.refs.edges:
+        if ref.node.name != "master":
+            refs[ref.node.name] = ref.node.target.oid
 
-def repo_query() -> Tuple[str, List[PullRequestEdge]]:
-    # get the first open PR - this is the parent PR for each week's post
-    initial_query = Operations.query.get_first_pr
+    return refs
 
-    data = ENDPOINT(initial_query)
-    repo = (initial_query + data).repository
-    cursor = repo.pull_requests.edges[0].cursor
-    branch_name = repo.pull_requests.edges[0].node.head_ref.name
 
-    full_query = Operations.query.get_all_prs
-    data = ENDPOINT(full_query, {"cursor": cursor})
-    prs = (full_query + data).repository.pull_requests.edges
+def sync_refs_mutation(refs_upstream: Dict[str, str], refs_fork: Dict[str, str], repo_id: str) -> Tuple[documents.Document, dict]:
+    """Build one mutation that moves every fork ref to its upstream target.
 
-    # maybe return the parent PR baseRef here too so i know what to target later
-    return branch_name, prs
+    Refs missing from the fork are created (`createRef`), the others are
+    updated (`updateRef`), each under its own alias (`ref0`, `ref1`, ...).
+    A server runs the fields of a mutation one after the other, in order, so
+    "master" (first in `refs_upstream`) is still synced first.
 
+    Args:
+        refs_upstream: ref name -> upstream target oid, "master" first.
+        refs_fork: ref name -> ref ID of the refs already in the fork.
+        repo_id: ID of the fork.
 
-def sync_twin_branch() -> Tuple[str, str, str]:
-    """Sync branches from upstream.
+    Returns:
+        the mutation, and its variables.
+    """
+    variables = {}
+    types = {}
+    fields = []
+    for i, (ref_name, ref_target) in enumerate(refs_upstream.items()):
+        variables[f"oid{i}"] = ref_target
+        types[f"oid{i}"] = "GitObjectID!"
+
+        if ref_name in refs_fork:
+            variables[f"refId{i}"] = refs_fork[ref_name]
+            types[f"refId{i}"] = "ID!"
+            fields.append(f"ref{i}: updateRef(input: {{refId: $refId{i}, oid: $oid{i}}}) {{\nclientMutationId\n}}")
+        else:
+            # create ref (branch) if it doesn't exist in my fork, directly at its target
+            variables["repoId"] = repo_id
+            types["repoId"] = "ID!"
+            variables[f"name{i}"] = f"refs/heads/{ref_name}"
+            types[f"name{i}"] = "String!"
+            fields.append(f"ref{i}: createRef(input: {{repositoryId: $repoId, name: $name{i}, oid: $oid{i}}}) {{\nref {{\nid\n}}\n}}")
+
+    name = "SyncRefs"
+    declared = ", ".join(f"${var}: {t}" for var, t in types.items())
+    query = f"mutation {name}({declared}) {{\n" + "\n".join(fields) + "\n}"
+    return documents.Document(query, name, types), variables
+
+
+def check_response(data: dict, action: str):
+    """Raise if a request failed: the retries (see `retry`) gave up, or it can't succeed.
+
+    Raises:
+        Exception: naming `action` and the errors of the response.
+    """
+    if data.get("errors"):
+        messages = "; ".join(error.get("message", "") for error in data["errors"])
+        raise Exception(f"{action} failed: {messages}")
+
+
+def check_sync(data: dict):
+    """Raise if a `sync_refs_mutation` failed."""
+    check_response(data, "Syncing the fork")
+
+
+def page_prs(connection, parent_id: str) -> Tuple[List[PullRequestEdge], Optional[str]]:
+    """Get this week's PRs in one page of PRs, newest first.
+
+    Only the PRs after the parent PR (the first open one) belong to this week.
 
     Returns:
-        A 3-tuple of:
-            - the upstream repo ID
-            - forked repo ID
-            - ID of the non-master (i.e. this week's TWiN) branch
+        the PRs, and the cursor to fetch the page before - None once the
+        parent PR (or the first PR) was reached.
     """
-    get_refs = Operations.query.get_refs
+    prs = []
+    for pr in reversed(connection.edges):
+        if pr.node.id == parent_id:
+            return prs, None
+        prs.append(pr)
 
-    # get refs from upstream
-    data_upstream = ENDPOINT(get_refs, {"owner": "phaazon"})
-    repo_upstream = (get_refs + data_upstream).repository
+    if not connection.page_info.has_previous_page:
+        return prs, None
+    return prs, connection.page_info.start_cursor
 
-    # "sort" this so the "master" ref gets inserted into this dict first
-    refs_upstream = {
-        ref.node.name: ref.node.target.oid
-        for ref in repo_upstream.refs.edges
-        if ref.node.name == "master"
-    }
 
-    for ref in repo_upstream.refs.edges:
-        if ref.node.name != "master":
-            refs_upstream[ref.node.name] = ref.node.target.oid
+def week_prs(repo, next_page: Callable[[str], Any]) -> Iterator[PullRequestEdge]:
+    """Stream this week's PRs from a `GetWeekPRs` repository, newest first.
 
-    # get node IDs from my fork
-    data_fork = ENDPOINT(get_refs, {"owner": "amar1729"})
-    repo_fork = (get_refs + data_fork).repository
+    Pages are fetched - `next_page(cursor)` gets the PR connection before
+    `cursor` - only as they are consumed, and never past the parent PR.
+    """
+    parent_id = repo.parent.edges[0].node.id
+    prs, cursor = page_prs(repo.pull_requests, parent_id)
+    yield from prs
 
-    refs_fork = {
-        # note: .id not .target.oid
-        ref.node.name: ref.node.id
-        for ref in repo_fork.refs.edges
-    }
+    while cursor is not None:
+        prs, cursor = page_prs(next_page(cursor), parent_id)
+        yield from prs
+
+
+def week_repo(data: dict):
+    """Decode a `GetWeekPRs` response (caching the templates it carries)."""
+    repo = records.decode("GetWeekPRs", data).repository
+    templates.store(repo)
+    return repo
+
+
+def prs_connection(data: dict):
+    """Decode a `GetPRsPage` response: the PR connection of its page."""
+    return records.decode("GetPRsPage", data).repository.pull_requests
+
+
+def sync_plan(data: dict) -> Tuple[Tuple[str, str], Optional[Tuple[documents.Document, dict]]]:
+    """Decide, from a `GetSyncRefs` response, what syncing the fork takes.
+
+    Returns:
+        the upstream and fork repo IDs, and the mutation (with its variables)
+        moving the fork's stale refs - None if the fork is current.
+
+    Raises:
+        Exception: if upstream has no branch but "master".
+    """
+    repos = records.decode("GetSyncRefs", data)
+    repo_upstream, repo_fork = repos.upstream, repos.fork
+
+    refs_upstream = upstream_refs(repo_upstream)
+    if list(refs_upstream) == ["master"]:
+        raise Exception("non-master branch not found in upstream.")
+
+    fork = refsync.fork_refs(repo_fork)
+    # note: .id not .target.oid
+    refs_fork = {ref_name: ref.id for ref_name, ref in fork.items()}
 
     # assume that upstream only has 'master' and this week's branch
-    # so only update those refs
-    # NOTE: this should update the master ref first, and then other refs
-    # (since refs_upstream should have 'master' ref first due to insertion order)
-    push_branch = Operations.mutation.sync_upstream
-    create_branch = Operations.mutation.create_branch
-    for ref_name, ref_target in refs_upstream.items():
-        if ref_name not in refs_fork:
-            # create ref (branch) if it doesn't exist in my fork
-            data = ENDPOINT(
-                create_branch,
-                {
-                    "name": f"refs/heads/{ref_name}",
-                    "baseRef": refs_upstream["master"],
-                    "repoId": repo_fork.id,
-                }
-            )
+    # so only update those refs - all in one mutation, "master" first -
+    # and only those the fork differs on (usually none)
+    stale = refsync.diff(refs_upstream, fork)
+    mutation = sync_refs_mutation(stale, refs_fork, repo_fork.id) if stale else None
+    return (repo_upstream.id, repo_fork.id), mutation
 
-            ref = data["data"]["createRef"]["ref"]["id"]
-            refs_fork[ref_name] = ref
 
-        ENDPOINT(
-            push_branch,
-            {"refId": refs_fork[ref_name], "oid": ref_target},
-        )
+def synced(data: dict):
+    """Handle the response to a `sync_plan` mutation.
 
-    # return:
-    # repository ID
-    # ID of the only non-master branch in our fork (after we sync from upstream)
-    for ref_name in refs_upstream:
-        if ref_name != "master":
-            return (repo_upstream.id, repo_fork.id, refs_fork[ref_name])
+    Raises:
+        Exception: naming the errors of the response.
+    """
+    querycache.get_cache().invalidate(*querycache.REFS)
+    check_sync(data)
 
-    raise Exception("non-master branch not found in upstream.")
 
+def saved_context() -> Tuple[Optional[weekly.WeeklyContext], bool]:
+    """Get the saved weekly context, and whether it is fresh enough to use unchecked."""
+    ttl = Cfg().cfg["github"].getfloat("context_ttl", fallback=300)
 
-def create_commit_mutation(
+    context = weekly.load()
+    return context, context is not None and weekly.fresh(context, ttl)
+
+
+def checked_context(context: Optional[weekly.WeeklyContext], head) -> Optional[weekly.WeeklyContext]:
+    """Get `context` (saved as checked) if a `GetWeekHead` repository shows it is current.
+
+    Returns:
+        None if the context must be rebuilt.
+    """
+    if context is None:
+        return None
+    if weekly.matches(context, head):
+        return weekly.checked(context)
+
+    # something changed upstream: don't rebuild from cached listings
+    querycache.get_cache().invalidate(*querycache.PRS, *querycache.REFS)
+    return None
+
+
+def rebuilt_context(head, prs: Iterable[PullRequestEdge], id_upstream: str, id_fork: str) -> weekly.WeeklyContext:
+    """Build (and save) this week's context from its PRs.
+
+    Args:
+        head: the `GetWeekHead` repository, read before anything else.
+        prs: this week's PRs, newest first (they may be streamed in).
+        id_upstream: upstream repo ID.
+        id_fork: fork repo ID.
+
+    Raises:
+        Exception: if no PRs were found for this week.
+    """
+    prs = iter(prs)
+    first_pr = next(prs, None)
+    if first_pr is None:
+        raise Exception("No PRs found for this week.")
+
+    context = weekly.WeeklyContext(
+        **weekly.head(head),
+        base_path=str(get_base_path(first_pr)),
+        # sections are counted as pages of PRs stream in
+        sections=count_sections(chain([first_pr], prs)),
+        id_upstream=id_upstream,
+        id_fork=id_fork,
+        checked_at=dt.now().timestamp(),
+    )
+    return weekly.rebuilt(context)
+
+
+def commit_details(section: int, plugin_name: str) -> Tuple[str, str]:
+    """Get the commit message and directory of a PR for `section`.
+
+    Raises:
+        Exception: if an invalid 'section' is passed.
+    """
+    if section == 3:
+        return f"[new plugin]: {plugin_name}", "3-new-plugins"
+    elif section == 4:
+        return f"[plugin update]: {plugin_name}", "4-updates"
+    else:
+        raise Exception(f"Invalid section: {section}")
+
+
+def pr_file_path(context: weekly.WeeklyContext, dir_path: str, number: int, plugin_name: str) -> PosixPath:
+    """Path of the file a PR adds, as the `number`th of its section."""
+    return PosixPath(context.base_path) / dir_path / f"{number}-{canonical(plugin_name)}.md"
+
+
+def commit_requests(
     repo_id: str,
-    base_ref: str,
+    base_oid: str,
     commit_msg: str,
     file_path: PosixPath,
     contents: str,
-):
+) -> Tuple[str, dict, dict]:
+    """Build the requests that commit `contents` to a new branch of the fork, off `base_oid`.
+
+    Returns:
+        name of the new branch, and the variables of `CreateBranch` and `CreateCommit`.
+    """
     b64_contents = b64encode(contents.encode()).decode()
     repo_name_with_owner = "amar1729/this-week-in-neovim-contents"
 
     # create a branch for the new commit to live on
     d = dt.utcnow()
-    branch_name = d.strftime("patch-%d%H%M")
-    ENDPOINT(
-        Operations.mutation.create_branch,
-        {"name": f"refs/heads/{branch_name}", "base_ref": base_ref, "repo_id": repo_id},
-    )
+    # (to the microsecond: concurrent submissions each need their own)
+    branch_name = d.strftime("patch-%d%H%M%S%f")
+    create_branch = {"name": f"refs/heads/{branch_name}", "baseRef": base_oid, "repoId": repo_id}
 
-    # create the commit
-    create_commit = Operations.mutation.create_commit
-
-    variables = {
+    create_commit = {
         "repoName": repo_name_with_owner,
         "branchName": branch_name,
-        "head": base_ref,
+        "head": base_oid,
         "commitMsg": commit_msg,
         "filePath": str(file_path),
         "contents": b64_contents,
     }
 
-    ENDPOINT(create_commit, variables)
+    return branch_name, create_branch, create_commit
+
+
+def branch_created(data: dict) -> str:
+    """Handle the response to `CreateBranch`.
+
+    Returns:
+        ID of the new branch.
+    """
+    querycache.get_cache().invalidate(*querycache.REFS)
+    check_response(data, "Creating the patch branch")
+    return data["data"]["createRef"]["ref"]["id"]
+
+
+def commit_created(data: dict):
+    """Handle the response to `CreateCommit`."""
+    check_response(data, "Committing to the patch branch")
+
+
+def pr_variables(title: str, repo_id: str, head_ref: str, base_ref: str) -> dict:
+    """Variables of `CreatePR`, see `create_pr_mutation`."""
+    body = "Automated PR, created by twin-bot - @Amar1729"
+
+    return {
+        "title": title,
+        "repoId": repo_id,
+        "headRef": head_ref,
+        "baseRef": base_ref,
+        "body": body,
+    }
+
+
+def pr_created(data: dict) -> str:
+    """Handle the response to `CreatePR`.
+
+    Returns:
+        URL of the opened pull request.
+    """
+    querycache.get_cache().invalidate(*querycache.PRS)
+    check_response(data, "Opening the PR")
+    return data["data"]["createPullRequest"]["pullRequest"]["url"]
+
+
+def pr_target(branch_name: str, patch_branch: str, id_upstream: str, id_fork: str) -> List[str]:
+    """Get the repo ID, head and base refs to open a PR of `patch_branch` against."""
+    args = [
+        id_upstream,
+        f"Amar1729:{patch_branch}",
+        f"phaazon:{branch_name}",
+    ]
+
+    dbg = True
+    if dbg:
+        args = [
+            id_fork,
+            patch_branch,
+            "master",
+        ]
+
+    return args
+
+
+# ----
+# ---- GraphQL queries
+
+
+@coalesced
+def week_page(page_size: int):
+    """Get the first page of `GetWeekPRs` (shared by concurrent callers)."""
+    endpoint = get_endpoint()
+
+    data = endpoint(documents.get("GetWeekPRs"), {"pageSize": page_size})
+    return week_repo(data)
+
+
+@coalesced
+def prs_page(page_size: int, cursor: str):
+    """Get the page of PRs before `cursor` (shared by concurrent callers)."""
+    endpoint = get_endpoint()
+
+    data = endpoint(documents.get("GetPRsPage"), {"pageSize": page_size, "before": cursor})
+    return prs_connection(data)
+
+
+def repo_query(page_size: Optional[int] = None) -> Tuple[str, Iterator[PullRequestEdge]]:
+    if page_size is None:
+        page_size = Cfg().cfg["github"].getint("page_size", fallback=40)
+
+    # get the first open PR - this is the parent PR for each week's post -
+    # and the latest page of PRs; the PRs after the parent are this week's
+    repo = week_page(page_size)
+    branch_name = repo.parent.edges[0].node.head_ref.name
+
+    # maybe return the parent PR baseRef here too so i know what to target later
+    return branch_name, week_prs(repo, partial(prs_page, page_size))
+
+
+def week_head():
+    """Get what the weekly context depends on (see `weekly`): one point, one node."""
+    endpoint = get_endpoint()
+
+    data = endpoint(documents.get("GetWeekHead"))
+    return records.decode("GetWeekHead", data).repository
+
+
+@coalesced
+def template_query() -> Dict[str, str]:
+    """Fetch (and cache) the section templates, see `templates`.
+
+    Concurrent callers share one request (see `singleflight`).
+
+    Returns:
+        template name -> text.
+    """
+    endpoint = get_endpoint()
+
+    data = endpoint(documents.get("GetTemplates"))
+    result = records.decode("GetTemplates", data)
+    if result is None or result.repository is None:
+        return {}
+
+    return templates.store(result.repository)
+
+
+@coalesced
+def sync_twin_branch() -> Tuple[str, str]:
+    """Sync branches from upstream.
+
+    Concurrent callers share one sync (see `singleflight`).
+
+    Returns:
+        A 2-tuple of:
+            - the upstream repo ID
+            - forked repo ID
+    """
+    endpoint = get_endpoint()
+
+    # get refs from upstream, and node IDs from my fork
+    data = endpoint(documents.get("GetSyncRefs"), SYNC_REFS_VARIABLES)
+    ids, mutation = sync_plan(data)
+    if mutation is not None:
+        synced(endpoint(*mutation))
+
+    return ids
+
+
+@coalesced
+def weekly_context() -> weekly.WeeklyContext:
+    """Get this week's context: from disk while it is still current, otherwise rebuilt.
+
+    Concurrent callers share one check (or rebuild), see `singleflight`, and
+    so one context: each takes its own number in a section with `weekly.claim`.
+    """
+    context, fresh = saved_context()
+    if fresh:
+        return context
+
+    # the head is read before anything it vouches for, so a PR opened while
+    # rebuilding makes the next check fail rather than go unnoticed
+    head = week_head()
+    current = checked_context(context, head)
+    if current is not None:
+        return current
+
+    _, prs = repo_query()
+    id_upstream, id_fork = sync_twin_branch()
+    return rebuilt_context(head, prs, id_upstream, id_fork)
+
+
+def create_commit_mutation(
+    repo_id: str,
+    base_oid: str,
+    commit_msg: str,
+    file_path: PosixPath,
+    contents: str,
+) -> str:
+    """Commit `contents` to a new branch of the fork, off `base_oid`.
+
+    Returns:
+        name of the new branch.
+
+    Raises:
+        Exception: if either mutation failed (the branch is deleted again).
+    """
+    endpoint = get_endpoint()
+
+    branch_name, create_branch, create_commit = commit_requests(repo_id, base_oid, commit_msg, file_path, contents)
+    ref_id = branch_created(endpoint(documents.get("CreateBranch"), create_branch))
+    try:
+        commit_created(endpoint(documents.get("CreateCommit"), create_commit))
+    except Exception:
+        # don't leave an empty branch behind (if this fails too, it is only left behind)
+        endpoint(documents.get("DeleteBranch"), {"refId": ref_id})
+        raise
+    return branch_name
 
 
 def create_pr_mutation(
@@ -185,25 +607,16 @@ def create_pr_mutation(
     Returns:
         URL of the opened pull request.
     """
+    endpoint = get_endpoint()
 
-    body = "Automated PR, created by twin-bot - @Amar1729"
-
-    variables = {
-        "title": title,
-        "repoId": repo_id,
-        "headRef": head_ref,
-        "baseRef": base_ref,
-        "body": body,
-    }
-
-    data = ENDPOINT(Operations.mutation.create_pr, variables)
-    return data["data"]["createPullRequest"]["pullRequest"]["url"]
+    data = endpoint(documents.get("CreatePR"), pr_variables(title, repo_id, head_ref, base_ref))
+    return pr_created(data)
 
 
 # ----
 
 
-def count_sections(prs: List[PullRequestEdge]) -> List[int]:
+def count_sections(prs: Iterable[PullRequestEdge]) -> List[int]:
     """Find the next available number for each section.
 
     Args:
@@ -253,6 +666,7 @@ def open_pull_req(
     This function does several things:
         - query the origin repository to see what Nth change we're about to make
         - sync the current TWiN branch if necessary
+          (both cached between PRs, see `weekly`)
         - create a new branch based off of the current TWiN branch
         - create a new commit in that branch
         - open the actual PR, with the new branch targeting the base branch
@@ -268,56 +682,41 @@ def open_pull_req(
         URL of opened pull request.
 
     Raises:
-        Exception: if an invalid 'section' is passed.
+        Exception: if an invalid 'section' is passed, or no PRs were found for this week.
+        RateLimited: if the rate limit won't allow a whole PR for a while.
     """
-    branch_name, prs = repo_query()
-    sections = count_sections(prs)
-
-    base_path = get_base_path(prs[0])
-
-    id_upstream, id_fork, weekly_base_ref = sync_twin_branch()
-
-    # commit message
-    if section == 3:
-        commit_msg = f"[new plugin]: {plugin_name}"
-        dir_path = "3-new-plugins"
-    elif section == 4:
-        commit_msg = f"[plugin update]: {plugin_name}"
-        dir_path = "4-updates"
-    else:
-        raise Exception(f"Invalid section: {section}")
-
-    file_path = base_path / dir_path / f"{sections[section] + 1}-{canonical(plugin_name)}.md"
-
-    create_commit_mutation(
-        repo_id=id_fork,
-        base_ref=weekly_base_ref,
-        commit_msg=commit_msg,
-        file_path=file_path,
-        contents=contents,
-    )
+    # only start once the rate limit allows the whole PR, rather than
+    # running out halfway through (and leaving a branch behind)
+    with ratelimit.get_budget().reserve(ratelimit.PR_COST):
+        context = weekly_context()
+
+        commit_msg, dir_path = commit_details(section, plugin_name)
+
+        # our own number: the context may be shared with concurrent submissions
+        # (and it is handed back if the submission fails)
+        with weekly.claim(context, section) as number:
+            file_path = pr_file_path(context, dir_path, number, plugin_name)
+
+            patch_branch = create_commit_mutation(
+                repo_id=context.id_fork,
+                base_oid=context.weekly_oid,
+                commit_msg=commit_msg,
+                file_path=file_path,
+                contents=contents,
+            )
 
-    args = [
-        id_upstream,
-        f"Amar1729:{branch_name}",
-        f"phaazon:{branch_name}",
-    ]
+            args = pr_target(context.branch_name, patch_branch, context.id_upstream, context.id_fork)
 
-    dbg = True
-    if dbg:
-        args = [
-            id_fork,
-            branch_name,
-            "master",
-        ]
+            result = create_pr_mutation(
+                # use commit msg as title
+                commit_msg,
+                *args,
+            )
 
-    result = create_pr_mutation(
-        # use commit msg as title
-        commit_msg,
-        *args,
-    )
+        # our own PR doesn't make the context stale: patch it
+        weekly.record_pr(args[0])
 
-    return result
+        return result
 
 
 if __name__ == "__main__":
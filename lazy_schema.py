@@ -0,0 +1,204 @@
+"""Lazy, on-demand loader for the generated `schema` module.
+
+`schema.py` declares every type in github's GraphQL schema, but the bot only
+ever touches a few dozen of them. Instead of importing it, this module indexes
+its source by top-level declaration and only executes a declaration the first
+time its type is looked up (through this module, or through the schema itself
+when sgqlc resolves a field type).
+
+The pruned `schema_min.py` (see `prune_schema.py`) is loaded instead of
+`schema.py` when it exists.
+
+Use it as a drop-in replacement for `import schema`:
+
+    import lazy_schema as schema
+    from lazy_schema import PullRequestEdge
+"""
+
+import re
+from pathlib import Path
+from types import CodeType
+from typing import Dict, Optional, Set, Tuple
+
+import sgqlc.types
+
+
+SCHEMA_PATH = Path(__file__).parent / "schema_min.py"
+if not SCHEMA_PATH.exists():
+    SCHEMA_PATH = SCHEMA_PATH.with_name("schema.py")
+
+# top-level declarations emitted by sgqlc-codegen, e.g.:
+#   class Repository(sgqlc.types.Type, Node, ...):
+#   Boolean = sgqlc.types.Boolean
+_DECL_RE = re.compile(r"^(?:class (\w+)\(([^)]*)\):|([A-Z]\w*) = sgqlc\.)", re.MULTILINE)
+_ENTRY_RE = re.compile(r"^schema\.(\w+_type) = (\w+)$", re.MULTILINE)
+_NAME_RE = re.compile(r"(?<![.\w'])[A-Z]\w*")
+_SECTION = "#" * 72
+
+# arguments with a default value, whose type must be loaded to validate it
+_DEFAULT_ARG_RE = re.compile(r"Arg\((?:sgqlc\.types\.\w+\()*(\w+)[^\n]*, default=(?!None\))")
+
+
+class LazySchema(sgqlc.types.Schema):
+    """sgqlc schema that loads type declarations on first lookup."""
+
+    __slots__ = ("_loader", "_entry_points")
+
+    def __getitem__(self, key):
+        try:
+            return super().__getitem__(key)
+        except KeyError:
+            if self._loader is None or not self._loader.has(key):
+                raise
+            return self._loader.load(key)
+
+    def __getattr__(self, key):
+        try:
+            return super().__getattr__(key)
+        except AttributeError:
+            if key.startswith("_") or self._loader is None or not self._loader.has(key):
+                raise
+            return self._loader.load(key)
+
+    def __contains__(self, key):
+        if super().__contains__(key):
+            return True
+        return self._loader is not None and self._loader.has(key)
+
+    def _entry_point(self, name):
+        value = self._entry_points.get(name)
+        if isinstance(value, str):
+            if value in self._loader.loading:
+                # Schema.__iadd__ checks this while registering the type
+                return None
+            value = self[value]
+            self._entry_points[name] = value
+        return value
+
+    def _set_entry_point(self, name, value):
+        try:
+            self._entry_points[name] = value
+        except AttributeError:
+            # called from Schema.__init__, before slots are set
+            self._loader = None
+            self._entry_points = {name: value}
+
+    query_type = property(
+        lambda self: self._entry_point("query_type"),
+        lambda self, v: self._set_entry_point("query_type", v),
+    )
+    mutation_type = property(
+        lambda self: self._entry_point("mutation_type"),
+        lambda self, v: self._set_entry_point("mutation_type", v),
+    )
+    subscription_type = property(
+        lambda self: self._entry_point("subscription_type"),
+        lambda self, v: self._set_entry_point("subscription_type", v),
+    )
+
+
+def _relocate(code: CodeType, offset: int) -> CodeType:
+    """Shift line numbers of `code`, so tracebacks point into the schema module."""
+    consts = tuple(
+        _relocate(const, offset) if isinstance(const, CodeType) else const
+        for const in code.co_consts
+    )
+    return code.replace(co_firstlineno=code.co_firstlineno + offset, co_consts=consts)
+
+
+class SchemaLoader:
+    """Index of a generated schema module's declarations.
+
+    Args:
+        path: path to the module generated by `sgqlc-codegen schema`.
+    """
+
+    def __init__(self, path: Path = SCHEMA_PATH):
+        self.source = path.read_text()
+        self.path = path
+
+        # name -> (start, end, line, bases) of its declaration in source
+        self.index: Dict[str, Tuple[int, int, int, Tuple[str, ...]]] = {}
+
+        matches = list(_DECL_RE.finditer(self.source))
+        line, prev = 1, 0
+        for match, after in zip(matches, matches[1:] + [None]):
+            name = match.group(1) or match.group(3)
+            bases = tuple(b.strip() for b in (match.group(2) or "").split(","))
+            end = after.start() if after else self.source.find(_SECTION, match.end())
+            line += self.source.count("\n", prev, match.start())
+            prev = match.start()
+            self.index[name] = (match.start(), end, line, bases)
+
+        preamble = self.source[:matches[0].start()] if matches else self.source
+        self.preamble: dict = {}
+        exec(compile(preamble, str(path), "exec"), self.preamble)
+
+        self.schema = LazySchema(self.preamble["schema"])
+        self.schema._loader = self
+        self.preamble["schema"] = self.schema
+
+        # name -> loaded type (or alias)
+        self.types: dict = {}
+        self.loading: Set[str] = set()
+        for attr, name in _ENTRY_RE.findall(self.source):
+            setattr(self.schema, attr, name if name != "None" else None)
+
+    def has(self, name: str) -> bool:
+        return name in self.index
+
+    def load(self, name: str):
+        """Execute the declaration of `name` (and of its base classes).
+
+        Raises:
+            KeyError: if `name` is not declared in the schema module.
+        """
+        try:
+            return self.types[name]
+        except KeyError:
+            pass
+
+        start, end, line, bases = self.index[name]
+        chunk = self.source[start:end]
+        self.loading.add(name)
+        try:
+            # other output types are referenced by name, which sgqlc accepts
+            # everywhere a field, argument or union member type is expected
+            # and resolves through the schema on first use
+            namespace = dict(self.preamble)
+            eager = set(bases).union(_DEFAULT_ARG_RE.findall(chunk))
+            for ref in set(_NAME_RE.findall(chunk)):
+                if ref not in self.index or ref == name:
+                    continue
+                if ref in self.types:
+                    namespace[ref] = self.types[ref]
+                elif ref in eager and ref not in self.loading:
+                    namespace[ref] = self.load(ref)
+                else:
+                    namespace[ref] = ref
+
+            code = compile(chunk, str(self.path), "exec")
+            exec(_relocate(code, line - 1), namespace)
+        finally:
+            self.loading.discard(name)
+
+        self.types[name] = namespace[name]
+        return self.types[name]
+
+
+_loader: Optional[SchemaLoader] = None
+
+
+def _get_loader() -> SchemaLoader:
+    global _loader
+    if _loader is None:
+        _loader = SchemaLoader()
+    return _loader
+
+
+def __getattr__(name: str):
+    if name == "schema":
+        return _get_loader().schema
+    if name.startswith("__") or not _get_loader().has(name):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return _get_loader().load(name)
@@ -1,9 +1,10 @@
+import logging
 import re
 
-import requests
+import templates
 
 
-URL = "https://raw.githubusercontent.com/phaazon/this-week-in-neovim-contents/master/template"
+logger = logging.getLogger(__name__)
 
 
 def get(section: int) -> str:
@@ -24,10 +25,24 @@ def get(section: int) -> str:
     else:
         raise Exception("unimplemented")
 
-    url = f"{URL}/{section_name}/1-example.md"
+    name = f"{section_name}/1-example.md"
+    cache = templates.get_cache()
 
-    resp = requests.get(url)
-    return resp.content.decode()
+    text = cache.cached(name)
+    if text is None:
+        # (imported here: a current cached template needs none of github's endpoint stack)
+        import github
+
+        # through GraphQL, on the same connection as the rest of the PR -
+        # or, if that fails, the raw download (or the stale copy) below
+        try:
+            text = github.template_query().get(name)
+        except Exception as exc:
+            logger.warning("could not fetch templates through GraphQL: %s", exc)
+    if text is None:
+        text = cache.get(name)
+
+    return text
 
 
 def mutate(reddit: str, git_repo: str, section: int) -> str:
@@ -1,6 +1,6 @@
 import sgqlc.types
 import sgqlc.operation
-import schema
+import lazy_schema as schema
 
 _schema = schema
 _schema_root = _schema.schema
@@ -8,10 +8,19 @@ _schema_root = _schema.schema
 __all__ = ('Operations',)
 
 
-def mutation_sync_upstream():
-    _op = sgqlc.operation.Operation(_schema_root.mutation_type, name='SyncUpstream', variables=dict(refId=sgqlc.types.Arg(sgqlc.types.non_null(_schema.ID)), oid=sgqlc.types.Arg(sgqlc.types.non_null(_schema.GitObjectID))))
-    _op.update_ref(input={'refId': sgqlc.types.Variable('refId'), 'oid': sgqlc.types.Variable('oid')})
-    return _op
+def fragment_templates():
+    _frag = sgqlc.operation.Fragment(_schema.Repository, 'Templates')
+    _frag_template3 = _frag.object(expression='master:template/3-new-plugins/1-example.md', __alias__='template3')
+    _frag_template3__as__Blob = _frag_template3.__as__(_schema.Blob)
+    _frag_template3__as__Blob.text()
+    _frag_template4 = _frag.object(expression='master:template/4-updates/1-example.md', __alias__='template4')
+    _frag_template4__as__Blob = _frag_template4.__as__(_schema.Blob)
+    _frag_template4__as__Blob.text()
+    return _frag
+
+
+class Fragment:
+    templates = fragment_templates()
 
 
 def mutation_create_branch():
@@ -28,6 +37,13 @@ def mutation_create_commit():
     return _op
 
 
+def mutation_delete_branch():
+    _op = sgqlc.operation.Operation(_schema_root.mutation_type, name='DeleteBranch', variables=dict(refId=sgqlc.types.Arg(sgqlc.types.non_null(_schema.ID))))
+    _op_delete_ref = _op.delete_ref(input={'refId': sgqlc.types.Variable('refId')})
+    _op_delete_ref.client_mutation_id()
+    return _op
+
+
 def mutation_create_pr():
     _op = sgqlc.operation.Operation(_schema_root.mutation_type, name='CreatePR', variables=dict(title=sgqlc.types.Arg(sgqlc.types.non_null(_schema.String)), repoId=sgqlc.types.Arg(sgqlc.types.non_null(_schema.ID)), headRef=sgqlc.types.Arg(sgqlc.types.non_null(_schema.String)), baseRef=sgqlc.types.Arg(sgqlc.types.non_null(_schema.String)), body=sgqlc.types.Arg(sgqlc.types.non_null(_schema.String))))
     _op_create_pull_request = _op.create_pull_request(input={'title': sgqlc.types.Variable('title'), 'repositoryId': sgqlc.types.Variable('repoId'), 'headRefName': sgqlc.types.Variable('headRef'), 'baseRefName': sgqlc.types.Variable('baseRef'), 'body': sgqlc.types.Variable('body')})
@@ -41,58 +57,128 @@ class Mutation:
     create_branch = mutation_create_branch()
     create_commit = mutation_create_commit()
     create_pr = mutation_create_pr()
-    sync_upstream = mutation_sync_upstream()
-
-
-def query_get_refs():
-    _op = sgqlc.operation.Operation(_schema_root.query_type, name='GetRefs', variables=dict(owner=sgqlc.types.Arg(sgqlc.types.non_null(_schema.String))))
-    _op_repository = _op.repository(owner=sgqlc.types.Variable('owner'), name='this-week-in-neovim-contents')
-    _op_repository.id()
-    _op_repository_refs = _op_repository.refs(ref_prefix='refs/heads/', last=3)
-    _op_repository_refs_edges = _op_repository_refs.edges()
-    _op_repository_refs_edges_node = _op_repository_refs_edges.node()
-    _op_repository_refs_edges_node.id()
-    _op_repository_refs_edges_node.name()
-    _op_repository_refs_edges_node_target = _op_repository_refs_edges_node.target()
-    _op_repository_refs_edges_node_target.oid()
+    delete_branch = mutation_delete_branch()
+
+
+def query_get_sync_refs():
+    _op = sgqlc.operation.Operation(_schema_root.query_type, name='GetSyncRefs', variables=dict(upstream=sgqlc.types.Arg(sgqlc.types.non_null(_schema.String)), fork=sgqlc.types.Arg(sgqlc.types.non_null(_schema.String))))
+    _op_upstream = _op.repository(owner=sgqlc.types.Variable('upstream'), name='this-week-in-neovim-contents', __alias__='upstream')
+    _op_upstream.id()
+    _op_upstream_refs = _op_upstream.refs(ref_prefix='refs/heads/', last=3)
+    _op_upstream_refs_edges = _op_upstream_refs.edges()
+    _op_upstream_refs_edges_node = _op_upstream_refs_edges.node()
+    _op_upstream_refs_edges_node.id()
+    _op_upstream_refs_edges_node.name()
+    _op_upstream_refs_edges_node_target = _op_upstream_refs_edges_node.target()
+    _op_upstream_refs_edges_node_target.oid()
+    _op_fork = _op.repository(owner=sgqlc.types.Variable('fork'), name='this-week-in-neovim-contents', __alias__='fork')
+    _op_fork.id()
+    _op_fork_refs = _op_fork.refs(ref_prefix='refs/heads/', last=3)
+    _op_fork_refs_edges = _op_fork_refs.edges()
+    _op_fork_refs_edges_node = _op_fork_refs_edges.node()
+    _op_fork_refs_edges_node.id()
+    _op_fork_refs_edges_node.name()
+    _op_fork_refs_edges_node_target = _op_fork_refs_edges_node.target()
+    _op_fork_refs_edges_node_target.oid()
+    _op_rate_limit = _op.rate_limit()
+    _op_rate_limit.cost()
+    _op_rate_limit.remaining()
+    _op_rate_limit.reset_at()
     return _op
 
 
-def query_get_first_pr():
-    _op = sgqlc.operation.Operation(_schema_root.query_type, name='GetFirstPR')
+def query_get_week_prs():
+    _op = sgqlc.operation.Operation(_schema_root.query_type, name='GetWeekPRs', variables=dict(pageSize=sgqlc.types.Arg(sgqlc.types.non_null(_schema.Int))))
     _op_repository = _op.repository(owner='phaazon', name='this-week-in-neovim-contents')
-    _op_repository_pull_requests = _op_repository.pull_requests(first=1, states=('OPEN',))
+    _op_repository_pull_requests = _op_repository.pull_requests(last=sgqlc.types.Variable('pageSize'))
+    _op_repository_pull_requests_page_info = _op_repository_pull_requests.page_info()
+    _op_repository_pull_requests_page_info.has_previous_page()
+    _op_repository_pull_requests_page_info.start_cursor()
     _op_repository_pull_requests_edges = _op_repository_pull_requests.edges()
-    _op_repository_pull_requests_edges.cursor()
     _op_repository_pull_requests_edges_node = _op_repository_pull_requests_edges.node()
     _op_repository_pull_requests_edges_node.id()
-    _op_repository_pull_requests_edges_node.title()
-    _op_repository_pull_requests_edges_node_head_ref = _op_repository_pull_requests_edges_node.head_ref()
-    _op_repository_pull_requests_edges_node_head_ref.name()
-    _op_repository_pull_requests_edges_node_head_ref_target = _op_repository_pull_requests_edges_node_head_ref.target()
-    _op_repository_pull_requests_edges_node_head_ref_target.oid()
+    _op_repository_pull_requests_edges_node_files = _op_repository_pull_requests_edges_node.files(first=5)
+    _op_repository_pull_requests_edges_node_files_edges = _op_repository_pull_requests_edges_node_files.edges()
+    _op_repository_pull_requests_edges_node_files_edges_node = _op_repository_pull_requests_edges_node_files_edges.node()
+    _op_repository_pull_requests_edges_node_files_edges_node.path()
+    _op_repository_parent = _op_repository.pull_requests(first=1, states=('OPEN',), __alias__='parent')
+    _op_repository_parent_edges = _op_repository_parent.edges()
+    _op_repository_parent_edges_node = _op_repository_parent_edges.node()
+    _op_repository_parent_edges_node.id()
+    _op_repository_parent_edges_node.title()
+    _op_repository_parent_edges_node_head_ref = _op_repository_parent_edges_node.head_ref()
+    _op_repository_parent_edges_node_head_ref.name()
+    _op_repository_parent_edges_node_head_ref_target = _op_repository_parent_edges_node_head_ref.target()
+    _op_repository_parent_edges_node_head_ref_target.oid()
+    _op_repository.__fragment__(fragment_templates())
+    _op_rate_limit = _op.rate_limit()
+    _op_rate_limit.cost()
+    _op_rate_limit.remaining()
+    _op_rate_limit.reset_at()
     return _op
 
 
-def query_get_all_prs():
-    _op = sgqlc.operation.Operation(_schema_root.query_type, name='GetAllPRs', variables=dict(cursor=sgqlc.types.Arg(sgqlc.types.non_null(_schema.String))))
+def query_get_week_head():
+    _op = sgqlc.operation.Operation(_schema_root.query_type, name='GetWeekHead')
     _op_repository = _op.repository(owner='phaazon', name='this-week-in-neovim-contents')
-    _op_repository_pull_requests = _op_repository.pull_requests(after=sgqlc.types.Variable('cursor'), first=40)
+    _op_repository_pull_requests = _op_repository.pull_requests()
+    _op_repository_pull_requests.total_count()
+    _op_repository_parent = _op_repository.pull_requests(first=1, states=('OPEN',), __alias__='parent')
+    _op_repository_parent_edges = _op_repository_parent.edges()
+    _op_repository_parent_edges_node = _op_repository_parent_edges.node()
+    _op_repository_parent_edges_node.id()
+    _op_repository_parent_edges_node_head_ref = _op_repository_parent_edges_node.head_ref()
+    _op_repository_parent_edges_node_head_ref.name()
+    _op_repository_parent_edges_node_head_ref_target = _op_repository_parent_edges_node_head_ref.target()
+    _op_repository_parent_edges_node_head_ref_target.oid()
+    _op_rate_limit = _op.rate_limit()
+    _op_rate_limit.cost()
+    _op_rate_limit.remaining()
+    _op_rate_limit.reset_at()
+    return _op
+
+
+def query_get_templates():
+    _op = sgqlc.operation.Operation(_schema_root.query_type, name='GetTemplates')
+    _op_repository = _op.repository(owner='phaazon', name='this-week-in-neovim-contents')
+    _op_repository.__fragment__(fragment_templates())
+    _op_rate_limit = _op.rate_limit()
+    _op_rate_limit.cost()
+    _op_rate_limit.remaining()
+    _op_rate_limit.reset_at()
+    return _op
+
+
+def query_get_prs_page():
+    _op = sgqlc.operation.Operation(_schema_root.query_type, name='GetPRsPage', variables=dict(pageSize=sgqlc.types.Arg(sgqlc.types.non_null(_schema.Int)), before=sgqlc.types.Arg(sgqlc.types.non_null(_schema.String))))
+    _op_repository = _op.repository(owner='phaazon', name='this-week-in-neovim-contents')
+    _op_repository_pull_requests = _op_repository.pull_requests(last=sgqlc.types.Variable('pageSize'), before=sgqlc.types.Variable('before'))
+    _op_repository_pull_requests_page_info = _op_repository_pull_requests.page_info()
+    _op_repository_pull_requests_page_info.has_previous_page()
+    _op_repository_pull_requests_page_info.start_cursor()
     _op_repository_pull_requests_edges = _op_repository_pull_requests.edges()
     _op_repository_pull_requests_edges_node = _op_repository_pull_requests_edges.node()
+    _op_repository_pull_requests_edges_node.id()
     _op_repository_pull_requests_edges_node_files = _op_repository_pull_requests_edges_node.files(first=5)
     _op_repository_pull_requests_edges_node_files_edges = _op_repository_pull_requests_edges_node_files.edges()
     _op_repository_pull_requests_edges_node_files_edges_node = _op_repository_pull_requests_edges_node_files_edges.node()
     _op_repository_pull_requests_edges_node_files_edges_node.path()
+    _op_rate_limit = _op.rate_limit()
+    _op_rate_limit.cost()
+    _op_rate_limit.remaining()
+    _op_rate_limit.reset_at()
     return _op
 
 
 class Query:
-    get_all_prs = query_get_all_prs()
-    get_first_pr = query_get_first_pr()
-    get_refs = query_get_refs()
+    get_prs_page = query_get_prs_page()
+    get_sync_refs = query_get_sync_refs()
+    get_templates = query_get_templates()
+    get_week_head = query_get_week_head()
+    get_week_prs = query_get_week_prs()
 
 
 class Operations:
+    fragment = Fragment
     mutation = Mutation
     query = Query
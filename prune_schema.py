@@ -0,0 +1,188 @@
+#! /usr/bin/env python3
+"""Prune a GraphQL introspection dump down to what our operations use.
+
+Walks every operation in `operations.gql` against `schema.json` and keeps only
+the types (and, for object types, only the fields) that are referenced, plus
+everything their arguments need. The result is a much smaller introspection
+dump, from which `run.sh` generates `schema_min.py`.
+"""
+
+import argparse
+import json
+from typing import Dict, List, Mapping, Optional, Set
+
+from graphql import parse
+from graphql.language import ast
+
+from schema_index import SchemaIndex
+
+
+# always emitted by sgqlc-codegen, as aliases of the builtin sgqlc types
+BUILTIN_SCALARS = ("Boolean", "Float", "ID", "Int", "String")
+
+LEAF_KINDS = ("SCALAR", "ENUM")
+
+
+def unwrap(type_ref: dict) -> str:
+    """Get the named type of a (possibly NON_NULL/LIST wrapped) type reference."""
+    while type_ref["name"] is None:
+        type_ref = type_ref["ofType"]
+    return type_ref["name"]
+
+
+class Pruner:
+    """Collect the types and fields of a schema that a document selects.
+
+    Args:
+        types: type name -> introspection type, in the order of the dump.
+        root: the rest of the introspection `__schema`: `queryType`, etc.
+    """
+
+    def __init__(self, types: Mapping[str, dict], root: dict):
+        self.types = types
+        self.schema = root
+
+        # type name -> kept field names (None: keep the whole type)
+        self.keep: Dict[str, Optional[Set[str]]] = {}
+        self.fragments: Dict[str, ast.FragmentDefinitionNode] = {}
+
+    def field(self, type_name: str, field_name: str) -> dict:
+        for f in self.types[type_name]["fields"] or []:
+            if f["name"] == field_name:
+                return f
+        raise KeyError(f"{type_name}.{field_name} is not in the schema")
+
+    def keep_type(self, name: str):
+        """Keep a whole type, e.g. a scalar, enum or input object (and its closure)."""
+        if self.keep.get(name, ()) is None:
+            return
+        self.keep[name] = None
+
+        t = self.types[name]
+        for f in t["inputFields"] or []:
+            self.keep_type(unwrap(f["type"]))
+
+    def keep_field(self, type_name: str, field: dict):
+        self.keep.setdefault(type_name, set()).add(field["name"])
+        for arg in field["args"]:
+            self.keep_type(unwrap(arg["type"]))
+
+    def keep_leaves(self, type_name: str):
+        """Keep the scalar fields of a type selected without a selection set.
+
+        sgqlc selects these automatically, and a GraphQL object type may not be
+        selected without any fields.
+        """
+        self.keep.setdefault(type_name, set())
+        for f in self.types[type_name]["fields"] or []:
+            required_args = [a for a in f["args"] if a["type"]["kind"] == "NON_NULL"]
+            if not required_args and self.types[unwrap(f["type"])]["kind"] in LEAF_KINDS:
+                self.keep_field(type_name, f)
+                self.keep_type(unwrap(f["type"]))
+
+    def walk(self, type_name: str, selection_set: Optional[ast.SelectionSetNode]):
+        if selection_set is None:
+            if self.types[type_name]["kind"] in LEAF_KINDS:
+                self.keep_type(type_name)
+            else:
+                self.keep_leaves(type_name)
+            return
+
+        self.keep.setdefault(type_name, set())
+        for selection in selection_set.selections:
+            if isinstance(selection, ast.FieldNode):
+                if selection.name.value == "__typename":
+                    continue
+                field = self.field(type_name, selection.name.value)
+                self.keep_field(type_name, field)
+                self.walk(unwrap(field["type"]), selection.selection_set)
+            elif isinstance(selection, ast.InlineFragmentNode):
+                target = selection.type_condition.name.value if selection.type_condition else type_name
+                self.walk(target, selection.selection_set)
+            elif isinstance(selection, ast.FragmentSpreadNode):
+                fragment = self.fragments[selection.name.value]
+                self.walk(fragment.type_condition.name.value, fragment.selection_set)
+
+    def add_document(self, source: str):
+        document = parse(source)
+        for definition in document.definitions:
+            if isinstance(definition, ast.FragmentDefinitionNode):
+                self.fragments[definition.name.value] = definition
+
+        for definition in document.definitions:
+            if not isinstance(definition, ast.OperationDefinitionNode):
+                continue
+
+            root = self.schema[f"{definition.operation.value}Type"]["name"]
+            for var in definition.variable_definitions:
+                type_node = var.type
+                while not isinstance(type_node, ast.NamedTypeNode):
+                    type_node = type_node.type
+                self.keep_type(type_node.name.value)
+
+            self.walk(root, definition.selection_set)
+
+    def _close_abstract_types(self):
+        """Make kept interfaces and their kept implementations agree on fields."""
+        changed = True
+        while changed:
+            changed = False
+            for name, fields in list(self.keep.items()):
+                t = self.types[name]
+                if fields is None or t["kind"] != "OBJECT":
+                    continue
+                for iface in t["interfaces"] or []:
+                    iface_fields = self.keep.get(iface["name"])
+                    if iface_fields is not None and not iface_fields <= fields:
+                        for f in iface_fields - fields:
+                            self.keep_field(name, self.field(name, f))
+                        changed = True
+
+    def pruned_type(self, name: str) -> dict:
+        t = dict(self.types[name])
+        fields = self.keep[name]
+
+        if fields is not None and t["fields"] is not None:
+            t["fields"] = [f for f in t["fields"] if f["name"] in fields]
+        if t["interfaces"] is not None:
+            t["interfaces"] = [i for i in t["interfaces"] if i["name"] in self.keep]
+        if t["possibleTypes"] is not None:
+            t["possibleTypes"] = [p for p in t["possibleTypes"] if p["name"] in self.keep]
+
+        return t
+
+    def pruned(self) -> dict:
+        """Get the pruned introspection dump."""
+        for name in BUILTIN_SCALARS:
+            self.keep_type(name)
+        self._close_abstract_types()
+
+        schema = dict(self.schema)
+        schema["types"] = [self.pruned_type(name) for name in self.types if name in self.keep]
+        return {"data": {"__schema": schema}}
+
+
+def prune(schema_path: str, operation_paths: List[str]) -> dict:
+    index = SchemaIndex(schema_path)
+    pruner = Pruner(index, index.root)
+
+    for path in operation_paths:
+        with open(path) as f:
+            pruner.add_document(f.read())
+
+    return pruner.pruned()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("schema", help="full introspection dump (schema.json)")
+    parser.add_argument("output", help="where to write the pruned dump (schema_min.json)")
+    parser.add_argument("operations", nargs="+", help="GraphQL documents (operations.gql)")
+    args = parser.parse_args()
+
+    pruned = prune(args.schema, args.operations)
+    with open(args.output, "w") as f:
+        json.dump(pruned, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+    print(f"kept {len(pruned['data']['__schema']['types'])} types")
@@ -0,0 +1,178 @@
+#! /usr/bin/env python3
+"""Static cost estimate of our GraphQL operations, as GitHub computes it.
+
+GitHub limits a query by the nodes it may return, and charges it points by
+how many requests its connections take:
+
+    - nodes: for each connection, its `first`/`last` times those of every
+      connection it is nested in - `pullRequests(last: 40) { files(first: 5) }`
+      is 40 + 40 * 5 = 240 nodes
+    - points: the number of connection requests (each connection, times the
+      size of the connections it is nested in) divided by 100, at least 1
+
+`connections` reduces an operation to the `first`/`last` path of each of its
+connections, once, at build time (`documents` stores it with the query).
+`estimate` then only multiplies numbers, with the request's variables, so the
+endpoints check every request against the configured `CostLimit`.
+
+As a build step, this checks every operation in `operations.gql`, taking the
+largest page GitHub allows for variables:
+
+    python3 query_cost.py operations.gql --max-points 1 --max-nodes 1000
+"""
+
+import argparse
+import logging
+import math
+import sys
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Union
+
+
+# GitHub's largest `first`/`last`: assumed for variables without a value
+MAX_PAGE = 100
+
+# `first`/`last` of each connection, from the outermost one: an int, or the
+# name of the variable that gives it
+Limit = Union[int, str]
+Path = List[Limit]
+
+
+class Cost(NamedTuple):
+    nodes: int
+    points: int
+
+
+class QueryTooExpensive(Exception):
+    """Raised when a request would cost more than its `CostLimit`."""
+
+
+def connections(source: str) -> Dict[str, List[Path]]:
+    """Get the connection paths of every operation in a GraphQL document.
+
+    Returns:
+        operation name -> path of every connection.
+    """
+    from graphql import parse
+    from graphql.language import ast
+
+    document = parse(source)
+    fragments = {
+        definition.name.value: definition
+        for definition in document.definitions
+        if isinstance(definition, ast.FragmentDefinitionNode)
+    }
+
+    def limit(field: ast.FieldNode) -> Optional[Limit]:
+        for arg in field.arguments:
+            if arg.name.value in ("first", "last"):
+                if isinstance(arg.value, ast.VariableNode):
+                    return arg.value.name.value
+                return int(arg.value.value)
+        return None
+
+    def walk(selection_set: Optional[ast.SelectionSetNode], parents: Path) -> Iterable[Path]:
+        if selection_set is None:
+            return
+        for selection in selection_set.selections:
+            if isinstance(selection, ast.FragmentSpreadNode):
+                yield from walk(fragments[selection.name.value].selection_set, parents)
+            elif isinstance(selection, ast.InlineFragmentNode):
+                yield from walk(selection.selection_set, parents)
+            else:
+                n = limit(selection)
+                if n is None:
+                    yield from walk(selection.selection_set, parents)
+                else:
+                    yield parents + [n]
+                    yield from walk(selection.selection_set, parents + [n])
+
+    return {
+        definition.name.value: list(walk(definition.selection_set, []))
+        for definition in document.definitions
+        if isinstance(definition, ast.OperationDefinitionNode)
+    }
+
+
+def estimate(paths: Sequence[Path], variables: Optional[dict] = None) -> Cost:
+    """Get the worst-case cost of an operation from its connection paths."""
+    variables = variables or {}
+
+    nodes = requests = 0
+    for path in paths:
+        sizes = [n if isinstance(n, int) else (variables.get(n) or MAX_PAGE) for n in path]
+        nodes += math.prod(sizes)
+        requests += math.prod(sizes[:-1])
+
+    return Cost(nodes, max(1, round(requests / 100)) if paths else 1)
+
+
+class CostLimit:
+    """Budget every request is checked against, before it is sent.
+
+    Args:
+        max_points: most points a request may cost.
+        max_nodes: most nodes a request may return.
+        reject: raise `QueryTooExpensive` for a request over the limit,
+            instead of only logging a warning.
+    """
+
+    logger = logging.getLogger(__name__)
+
+    def __init__(self, max_points: int = 1, max_nodes: int = 1000, reject: bool = False):
+        self.max_points = max_points
+        self.max_nodes = max_nodes
+        self.reject = reject
+
+    @classmethod
+    def from_config(cls, cfg) -> "CostLimit":
+        """Build from the `[github]` section of config.ini."""
+        return cls(
+            max_points=cfg.getint("max_query_points", fallback=1),
+            max_nodes=cfg.getint("max_query_nodes", fallback=1000),
+            reject=cfg.getboolean("reject_costly_queries", fallback=False),
+        )
+
+    def exceeded(self, cost: Cost) -> bool:
+        return cost.points > self.max_points or cost.nodes > self.max_nodes
+
+    def check(self, query, variables: Optional[dict] = None) -> Optional[Cost]:
+        """Check a request; only compiled `Document`s are estimated.
+
+        Raises:
+            QueryTooExpensive: if the request is over the limit, and `reject` is set.
+        """
+        paths = getattr(query, "connections", None)
+        if paths is None:
+            return None
+
+        cost = estimate(paths, variables)
+        if self.exceeded(cost):
+            message = (
+                f"{query.name} may cost {cost.points} points / {cost.nodes} nodes "
+                f"(limit: {self.max_points} points / {self.max_nodes} nodes)"
+            )
+            if self.reject:
+                raise QueryTooExpensive(message)
+            self.logger.warning(message)
+        return cost
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("operations", nargs="?", default="operations.gql")
+    parser.add_argument("--max-points", type=int, default=1)
+    parser.add_argument("--max-nodes", type=int, default=1000)
+    args = parser.parse_args()
+
+    with open(args.operations) as f:
+        plans = connections(f.read())
+
+    limit = CostLimit(args.max_points, args.max_nodes)
+    failed = False
+    for name, paths in plans.items():
+        cost = estimate(paths)
+        over = limit.exceeded(cost)
+        failed |= over
+        print(f"{name:<16} {cost.points:>3} points {cost.nodes:>7} nodes{'  OVER BUDGET' if over else ''}")
+
+    sys.exit(1 if failed else 0)
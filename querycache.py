@@ -0,0 +1,200 @@
+"""Cache of read-only GraphQL responses, by operation and variables.
+
+Processing a burst of submissions reads the same things over and over: this
+week's PRs, the refs of both repos, the templates. The endpoints look each
+query up in a `QueryCache` before sending it, under its operation name and
+its variables (canonical JSON, so their order doesn't matter):
+
+    - only the operations in `TTLS` are cached, each for its own TTL.
+      `GetWeekHead` never is: it is what tells the weekly context is stale
+    - responses with errors are never cached
+    - a cache is a list of tiers, looked up in order: an in-memory LRU
+      (`MemoryTier`), then the disk (`DiskTier`, `.query-cache.json`, one
+      per source of GitHub data: see `config.state_path`) - a hit in a
+      later tier is copied into the earlier ones
+    - the mutation helpers drop what they make stale (`invalidate`), e.g.
+      `CreatePR` drops the PR listing
+
+    data = get_cache().lookup(query, variables)
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Sequence, Tuple, Union
+
+from config import Cfg, state_path
+
+
+CACHE_FILE = ".query-cache.json"
+
+# operation -> seconds its responses are reused
+TTLS: Dict[str, float] = {
+    "GetWeekPRs": 60,
+    "GetPRsPage": 60,
+    "GetSyncRefs": 60,
+    "GetTemplates": 3600,
+}
+
+# what the mutation helpers invalidate: the listing of PRs, the refs of the repos
+PRS = ("GetWeekPRs", "GetPRsPage")
+REFS = ("GetSyncRefs",)
+
+# (expires at, response)
+Entry = Tuple[float, dict]
+
+
+def key(name: str, variables: Optional[dict]) -> str:
+    """Cache key of a request: its operation name, then its canonical variables."""
+    return name + " " + json.dumps(variables or {}, sort_keys=True, separators=(",", ":"))
+
+
+class MemoryTier:
+    """In-memory tier, dropping the least recently used entry past `max_size`."""
+
+    def __init__(self, max_size: int = 128):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Entry]" = OrderedDict()
+
+    def get(self, k: str) -> Optional[Entry]:
+        entry = self._entries.get(k)
+        if entry is not None:
+            self._entries.move_to_end(k)
+        return entry
+
+    def put(self, k: str, entry: Entry):
+        self._entries[k] = entry
+        self._entries.move_to_end(k)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def drop(self, names: Iterable[str]):
+        prefixes = tuple(name + " " for name in names)
+        for k in [k for k in self._entries if k.startswith(prefixes)]:
+            del self._entries[k]
+
+
+class DiskTier:
+    """On-disk tier, shared by the runs (and processes) of the bot.
+
+    Args:
+        path: where to keep it; by default, this source's `CACHE_FILE`.
+    """
+
+    def __init__(self, path: Union[str, Path, None] = None):
+        self.path = Path(path) if path else state_path(CACHE_FILE)
+
+    def _load(self) -> Dict[str, Entry]:
+        try:
+            with open(self.path) as f:
+                return {k: tuple(entry) for k, entry in json.load(f).items()}
+        except (OSError, ValueError, TypeError):
+            return {}
+
+    def _save(self, entries: Dict[str, Entry]):
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp, "w") as f:
+            json.dump(entries, f)
+        os.replace(tmp, self.path)
+
+    def get(self, k: str) -> Optional[Entry]:
+        return self._load().get(k)
+
+    def put(self, k: str, entry: Entry):
+        now = time.time()
+        entries = {k: e for k, e in self._load().items() if e[0] > now}
+        entries[k] = entry
+        self._save(entries)
+
+    def drop(self, names: Iterable[str]):
+        prefixes = tuple(name + " " for name in names)
+        entries = self._load()
+        kept = {k: e for k, e in entries.items() if not k.startswith(prefixes)}
+        if len(kept) != len(entries):
+            self._save(kept)
+
+
+class QueryCache:
+    """Response cache in front of an endpoint.
+
+    Args:
+        tiers: where entries are kept, looked up in order (e.g. memory, then disk).
+        ttls: operation -> seconds its responses are reused; others aren't cached.
+    """
+
+    def __init__(self, tiers: Sequence = (), ttls: Optional[Dict[str, float]] = None):
+        self.tiers = list(tiers)
+        self.ttls = TTLS if ttls is None else ttls
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_config(cls, cfg) -> "QueryCache":
+        """Build from the `[github]` section of config.ini."""
+        if not cfg.getboolean("query_cache", fallback=True):
+            return cls()
+
+        tiers = [MemoryTier(cfg.getint("query_cache_size", fallback=128))]
+        if cfg.getboolean("query_cache_disk", fallback=True):
+            tiers.append(DiskTier())
+        return cls(tiers)
+
+    def _name(self, query) -> Optional[str]:
+        """Operation name of a request that may be cached; only `Document` queries can be."""
+        name = getattr(query, "name", None)
+        if name in self.ttls and str(query).startswith("query"):
+            return name
+        return None
+
+    def lookup(self, query, variables: Optional[dict] = None) -> Optional[dict]:
+        """Get the cached response to a request, if there is a current one."""
+        name = self._name(query)
+        if name is None:
+            return None
+
+        k = key(name, variables)
+        now = time.time()
+        with self._lock:
+            for i, tier in enumerate(self.tiers):
+                entry = tier.get(k)
+                if entry is not None and entry[0] > now:
+                    for earlier in self.tiers[:i]:
+                        earlier.put(k, entry)
+                    self.hits += 1
+                    return entry[1]
+            self.misses += 1
+        return None
+
+    def store(self, query, variables: Optional[dict], data: dict):
+        """Cache the response to a request, unless it failed (or isn't cacheable)."""
+        name = self._name(query)
+        if name is None or not data or data.get("errors") or not data.get("data"):
+            return
+
+        entry = (time.time() + self.ttls[name], data)
+        k = key(name, variables)
+        with self._lock:
+            for tier in self.tiers:
+                tier.put(k, entry)
+
+    def invalidate(self, *names: str):
+        """Drop every cached response to the operations `names`."""
+        with self._lock:
+            for tier in self.tiers:
+                tier.drop(names)
+
+
+_cache: Optional[QueryCache] = None
+
+
+def get_cache() -> QueryCache:
+    """Get this process' query cache, shared by the sync and async endpoints."""
+    global _cache
+    if _cache is None:
+        _cache = QueryCache.from_config(Cfg().cfg["github"])
+    return _cache
@@ -0,0 +1,226 @@
+"""Pace GraphQL requests by GitHub's rate limit (its point budget).
+
+Every query in `operations.gql` also selects `rateLimit { cost remaining
+resetAt }`; `RateBudget` keeps the latest answer, and counts a point for each
+mutation (which can't select it) in between. With it, requests are:
+
+    - paced: once fewer than `low_water` points are left, the rest of them
+      are spread evenly over the time left until the budget resets
+    - deferred: a whole PR (`reserve`) only starts once the budget can pay
+      for all of its requests, instead of failing halfway through and
+      leaving a branch behind. If that means waiting more than `max_wait`
+      seconds, `RateLimited` is raised instead - nothing was sent yet.
+
+    with ratelimit.get_budget().reserve(PR_COST):
+        ...
+"""
+
+import asyncio
+import http.client
+import logging
+import threading
+import time
+import urllib.error
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime
+from itertools import chain
+from typing import Optional
+
+import retry
+from documents import CompiledEndpoint
+from query_cost import CostLimit
+from querycache import QueryCache
+from retry import RetryPolicy
+
+
+# most points a single PR costs: listing (one page), templates, ref sync,
+# and the four mutations
+PR_COST = 8
+
+
+class RateLimited(Exception):
+    """Raised when the rate limit would not allow a PR to finish soon enough."""
+
+    def __init__(self, points: int, reset_at: float):
+        self.points = points
+        self.reset_at = reset_at
+        super().__init__(f"rate limit: {points} points not available until {datetime.fromtimestamp(reset_at)}")
+
+
+class RateBudget:
+    """In-process view of GitHub's GraphQL point budget.
+
+    Args:
+        low_water: points left below which requests are paced.
+        max_wait: most seconds `reserve` waits for the budget to reset.
+    """
+
+    logger = logging.getLogger(__name__)
+
+    def __init__(self, low_water: int = 100, max_wait: float = 60.0):
+        self.low_water = low_water
+        self.max_wait = max_wait
+
+        # unknown until the first query answers
+        self.remaining: Optional[int] = None
+        self.reset_at = 0.0
+        # points held by PRs in progress (see `reserve`)
+        self.reserved = 0
+        # (submissions run in threads: checking and reserving must be one step)
+        self._lock = threading.Lock()
+
+    def observe(self, data: Optional[dict]):
+        """Update the budget from a response (sgqlc-style dict)."""
+        rate_limit = ((data or {}).get("data") or {}).get("rateLimit")
+        if rate_limit is None:
+            # mutations can't ask for the rate limit: they cost one point
+            self.spend(1)
+            return
+
+        reset_at = datetime.fromisoformat(rate_limit["resetAt"].replace("Z", "+00:00")).timestamp()
+        with self._lock:
+            self.remaining = rate_limit["remaining"]
+            self.reset_at = reset_at
+
+    def spend(self, points: int):
+        with self._lock:
+            if self.remaining is not None:
+                self.remaining -= points
+
+    def _available(self, now: float) -> Optional[int]:
+        """Points left to spend, or None while unknown (or after a reset)."""
+        if self.remaining is None or now >= self.reset_at:
+            return None
+        return self.remaining
+
+    def pace(self) -> float:
+        """Get how long to wait before sending the next request."""
+        now = time.time()
+        with self._lock:
+            available = self._available(now)
+            reset_at = self.reset_at
+        if available is None or available >= self.low_water:
+            return 0.0
+        if available <= 0:
+            return reset_at - now
+        return (reset_at - now) / available
+
+    def _try_reserve(self, points: int) -> float:
+        """Reserve `points`, or get how long to wait before they can be.
+
+        Returns:
+            0 once they are reserved.
+
+        Raises:
+            RateLimited: if that is longer than `max_wait`.
+        """
+        now = time.time()
+        with self._lock:
+            available = self._available(now)
+            if available is None or available - self.reserved >= points:
+                self.reserved += points
+                return 0.0
+            wait = self.reset_at - now
+
+        if wait > self.max_wait:
+            raise RateLimited(points, self.reset_at)
+        self.logger.warning("rate limit: waiting %.1fs for %s points", wait, points)
+        return wait
+
+    @contextmanager
+    def reserve(self, points: int = PR_COST):
+        """Hold `points` of the budget for the requests of the block, waiting for them first."""
+        while (wait := self._try_reserve(points)) > 0:
+            time.sleep(wait)
+
+        try:
+            yield
+        finally:
+            self._release(points)
+
+    @asynccontextmanager
+    async def areserve(self, points: int = PR_COST):
+        """Async `reserve`."""
+        while (wait := self._try_reserve(points)) > 0:
+            await asyncio.sleep(wait)
+
+        try:
+            yield
+        finally:
+            self._release(points)
+
+    def _release(self, points: int):
+        with self._lock:
+            self.reserved -= points
+
+
+class ScheduledEndpoint(CompiledEndpoint):
+    """`CompiledEndpoint` that paces its requests by a `RateBudget`.
+
+    Requests are also checked against `cost_limit` (see `query_cost`), if
+    given, and sent again by `retry_policy` (see `retry`) when that is safe.
+    Queries are answered from `cache` (see `querycache`) when it can.
+    """
+
+    def __init__(
+        self,
+        *args,
+        budget: Optional[RateBudget] = None,
+        cost_limit: Optional[CostLimit] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        cache: Optional[QueryCache] = None,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.budget = budget or get_budget()
+        self.cost_limit = cost_limit
+        self.retry_policy = retry_policy or RetryPolicy(attempts=1)
+        self.cache = cache
+
+    def __call__(self, query, variables=None, operation_name=None, extra_headers=None, timeout=None):
+        # a cached response costs nothing (and says nothing about the budget)
+        if self.cache is not None:
+            data = self.cache.lookup(query, variables)
+            if data is not None:
+                return data
+
+        data = self._send(query, variables, operation_name, extra_headers, timeout)
+        if self.cache is not None:
+            self.cache.store(query, variables, data)
+        return data
+
+    def _send(self, query, variables, operation_name, extra_headers, timeout) -> dict:
+        if self.cost_limit is not None:
+            self.cost_limit.check(query, variables)
+
+        # None: no retries left
+        for backoff in chain(self.retry_policy.backoff(), [None]):
+            wait = self.budget.pace()
+            if wait > 0:
+                time.sleep(wait)
+
+            try:
+                data = super().__call__(query, variables, operation_name, extra_headers, timeout)
+            except (urllib.error.URLError, OSError, http.client.HTTPException) as exc:
+                if backoff is None or not self.retry_policy.should_retry(query, retry.classify_exception(exc)):
+                    raise
+                self.logger.warning("%s: %s, retrying in %.1fs", self.url, exc, backoff)
+                time.sleep(backoff)
+                continue
+
+            self.budget.observe(data)
+            if backoff is None or not self.retry_policy.should_retry(query, retry.classify(data)):
+                return data
+            self.logger.warning("%s: request failed, retrying in %.1fs", self.url, backoff)
+            time.sleep(backoff)
+
+
+_budget: Optional[RateBudget] = None
+
+
+def get_budget() -> RateBudget:
+    """Get this process' rate budget, shared by the sync and async endpoints."""
+    global _budget
+    if _budget is None:
+        _budget = RateBudget()
+    return _budget
@@ -0,0 +1,965 @@
+"""Result records of our GraphQL operations.
+
+Generated by `gen_records.py` from the compiled `documents` - do not edit.
+"""
+
+from typing import Any, Callable, Dict, Optional
+
+
+class Record:
+    """Base of the generated records: slotted, with a readable repr."""
+
+    __slots__ = ()
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{self.__class__.__name__}({fields})"
+
+    def __eq__(self, other):
+        if type(self) is not type(other):
+            return NotImplemented
+        return all(getattr(self, n) == getattr(other, n) for n in self.__slots__)
+
+
+def _list(decode: Callable, value: Optional[list]) -> Optional[list]:
+    if value is None:
+        return None
+    return [decode(item) for item in value]
+
+
+class GetPRsPagePageInfo(Record):
+    __slots__ = ("has_previous_page", "start_cursor")
+
+    def __init__(self, has_previous_page, start_cursor):
+        self.has_previous_page = has_previous_page
+        self.start_cursor = start_cursor
+
+
+class GetPRsPagePullRequestChangedFile(Record):
+    __slots__ = ("path",)
+
+    def __init__(self, path):
+        self.path = path
+
+
+class GetPRsPagePullRequestChangedFileEdge(Record):
+    __slots__ = ("node",)
+
+    def __init__(self, node):
+        self.node = node
+
+
+class GetPRsPagePullRequestChangedFileConnection(Record):
+    __slots__ = ("edges",)
+
+    def __init__(self, edges):
+        self.edges = edges
+
+
+class GetPRsPagePullRequest(Record):
+    __slots__ = ("id", "files")
+
+    def __init__(self, id, files):
+        self.id = id
+        self.files = files
+
+
+class GetPRsPagePullRequestEdge(Record):
+    __slots__ = ("node",)
+
+    def __init__(self, node):
+        self.node = node
+
+
+class GetPRsPagePullRequestConnection(Record):
+    __slots__ = ("page_info", "edges")
+
+    def __init__(self, page_info, edges):
+        self.page_info = page_info
+        self.edges = edges
+
+
+class GetPRsPageRepository(Record):
+    __slots__ = ("pull_requests",)
+
+    def __init__(self, pull_requests):
+        self.pull_requests = pull_requests
+
+
+class GetPRsPageRateLimit(Record):
+    __slots__ = ("cost", "remaining", "reset_at")
+
+    def __init__(self, cost, remaining, reset_at):
+        self.cost = cost
+        self.remaining = remaining
+        self.reset_at = reset_at
+
+
+class GetPRsPage(Record):
+    __slots__ = ("repository", "rate_limit")
+
+    def __init__(self, repository, rate_limit):
+        self.repository = repository
+        self.rate_limit = rate_limit
+
+
+class GetSyncRefsGitObject(Record):
+    __slots__ = ("oid",)
+
+    def __init__(self, oid):
+        self.oid = oid
+
+
+class GetSyncRefsRef(Record):
+    __slots__ = ("id", "name", "target")
+
+    def __init__(self, id, name, target):
+        self.id = id
+        self.name = name
+        self.target = target
+
+
+class GetSyncRefsRefEdge(Record):
+    __slots__ = ("node",)
+
+    def __init__(self, node):
+        self.node = node
+
+
+class GetSyncRefsRefConnection(Record):
+    __slots__ = ("edges",)
+
+    def __init__(self, edges):
+        self.edges = edges
+
+
+class GetSyncRefsRepository(Record):
+    __slots__ = ("id", "refs")
+
+    def __init__(self, id, refs):
+        self.id = id
+        self.refs = refs
+
+
+class GetSyncRefsRateLimit(Record):
+    __slots__ = ("cost", "remaining", "reset_at")
+
+    def __init__(self, cost, remaining, reset_at):
+        self.cost = cost
+        self.remaining = remaining
+        self.reset_at = reset_at
+
+
+class GetSyncRefs(Record):
+    __slots__ = ("upstream", "fork", "rate_limit")
+
+    def __init__(self, upstream, fork, rate_limit):
+        self.upstream = upstream
+        self.fork = fork
+        self.rate_limit = rate_limit
+
+
+class GetTemplatesGitObject(Record):
+    __slots__ = ("typename", "text")
+
+    def __init__(self, typename, text):
+        self.typename = typename
+        self.text = text
+
+
+class GetTemplatesRepository(Record):
+    __slots__ = ("typename", "template3", "template4")
+
+    def __init__(self, typename, template3, template4):
+        self.typename = typename
+        self.template3 = template3
+        self.template4 = template4
+
+
+class GetTemplatesRateLimit(Record):
+    __slots__ = ("cost", "remaining", "reset_at")
+
+    def __init__(self, cost, remaining, reset_at):
+        self.cost = cost
+        self.remaining = remaining
+        self.reset_at = reset_at
+
+
+class GetTemplates(Record):
+    __slots__ = ("repository", "rate_limit")
+
+    def __init__(self, repository, rate_limit):
+        self.repository = repository
+        self.rate_limit = rate_limit
+
+
+class GetWeekHeadPullRequestConnection(Record):
+    __slots__ = ("total_count",)
+
+    def __init__(self, total_count):
+        self.total_count = total_count
+
+
+class GetWeekHeadGitObject(Record):
+    __slots__ = ("oid",)
+
+    def __init__(self, oid):
+        self.oid = oid
+
+
+class GetWeekHeadRef(Record):
+    __slots__ = ("name", "target")
+
+    def __init__(self, name, target):
+        self.name = name
+        self.target = target
+
+
+class GetWeekHeadPullRequest(Record):
+    __slots__ = ("id", "head_ref")
+
+    def __init__(self, id, head_ref):
+        self.id = id
+        self.head_ref = head_ref
+
+
+class GetWeekHeadPullRequestEdge(Record):
+    __slots__ = ("node",)
+
+    def __init__(self, node):
+        self.node = node
+
+
+class GetWeekHeadPullRequestConnection2(Record):
+    __slots__ = ("edges",)
+
+    def __init__(self, edges):
+        self.edges = edges
+
+
+class GetWeekHeadRepository(Record):
+    __slots__ = ("pull_requests", "parent")
+
+    def __init__(self, pull_requests, parent):
+        self.pull_requests = pull_requests
+        self.parent = parent
+
+
+class GetWeekHeadRateLimit(Record):
+    __slots__ = ("cost", "remaining", "reset_at")
+
+    def __init__(self, cost, remaining, reset_at):
+        self.cost = cost
+        self.remaining = remaining
+        self.reset_at = reset_at
+
+
+class GetWeekHead(Record):
+    __slots__ = ("repository", "rate_limit")
+
+    def __init__(self, repository, rate_limit):
+        self.repository = repository
+        self.rate_limit = rate_limit
+
+
+class GetWeekPRsPageInfo(Record):
+    __slots__ = ("has_previous_page", "start_cursor")
+
+    def __init__(self, has_previous_page, start_cursor):
+        self.has_previous_page = has_previous_page
+        self.start_cursor = start_cursor
+
+
+class GetWeekPRsPullRequestChangedFile(Record):
+    __slots__ = ("path",)
+
+    def __init__(self, path):
+        self.path = path
+
+
+class GetWeekPRsPullRequestChangedFileEdge(Record):
+    __slots__ = ("node",)
+
+    def __init__(self, node):
+        self.node = node
+
+
+class GetWeekPRsPullRequestChangedFileConnection(Record):
+    __slots__ = ("edges",)
+
+    def __init__(self, edges):
+        self.edges = edges
+
+
+class GetWeekPRsPullRequest(Record):
+    __slots__ = ("id", "files")
+
+    def __init__(self, id, files):
+        self.id = id
+        self.files = files
+
+
+class GetWeekPRsPullRequestEdge(Record):
+    __slots__ = ("node",)
+
+    def __init__(self, node):
+        self.node = node
+
+
+class GetWeekPRsPullRequestConnection(Record):
+    __slots__ = ("page_info", "edges")
+
+    def __init__(self, page_info, edges):
+        self.page_info = page_info
+        self.edges = edges
+
+
+class GetWeekPRsGitObject(Record):
+    __slots__ = ("oid",)
+
+    def __init__(self, oid):
+        self.oid = oid
+
+
+class GetWeekPRsRef(Record):
+    __slots__ = ("name", "target")
+
+    def __init__(self, name, target):
+        self.name = name
+        self.target = target
+
+
+class GetWeekPRsPullRequest2(Record):
+    __slots__ = ("id", "title", "head_ref")
+
+    def __init__(self, id, title, head_ref):
+        self.id = id
+        self.title = title
+        self.head_ref = head_ref
+
+
+class GetWeekPRsPullRequestEdge2(Record):
+    __slots__ = ("node",)
+
+    def __init__(self, node):
+        self.node = node
+
+
+class GetWeekPRsPullRequestConnection2(Record):
+    __slots__ = ("edges",)
+
+    def __init__(self, edges):
+        self.edges = edges
+
+
+class GetWeekPRsGitObject2(Record):
+    __slots__ = ("typename", "text")
+
+    def __init__(self, typename, text):
+        self.typename = typename
+        self.text = text
+
+
+class GetWeekPRsRepository(Record):
+    __slots__ = ("pull_requests", "parent", "typename", "template3", "template4")
+
+    def __init__(self, pull_requests, parent, typename, template3, template4):
+        self.pull_requests = pull_requests
+        self.parent = parent
+        self.typename = typename
+        self.template3 = template3
+        self.template4 = template4
+
+
+class GetWeekPRsRateLimit(Record):
+    __slots__ = ("cost", "remaining", "reset_at")
+
+    def __init__(self, cost, remaining, reset_at):
+        self.cost = cost
+        self.remaining = remaining
+        self.reset_at = reset_at
+
+
+class GetWeekPRs(Record):
+    __slots__ = ("repository", "rate_limit")
+
+    def __init__(self, repository, rate_limit):
+        self.repository = repository
+        self.rate_limit = rate_limit
+
+
+class CreateBranchRef(Record):
+    __slots__ = ("id",)
+
+    def __init__(self, id):
+        self.id = id
+
+
+class CreateBranchCreateRefPayload(Record):
+    __slots__ = ("ref",)
+
+    def __init__(self, ref):
+        self.ref = ref
+
+
+class CreateBranch(Record):
+    __slots__ = ("create_ref",)
+
+    def __init__(self, create_ref):
+        self.create_ref = create_ref
+
+
+class CreateCommitCreateCommitOnBranchPayload(Record):
+    __slots__ = ("client_mutation_id",)
+
+    def __init__(self, client_mutation_id):
+        self.client_mutation_id = client_mutation_id
+
+
+class CreateCommit(Record):
+    __slots__ = ("create_commit_on_branch",)
+
+    def __init__(self, create_commit_on_branch):
+        self.create_commit_on_branch = create_commit_on_branch
+
+
+class CreatePRPullRequest(Record):
+    __slots__ = ("id", "url")
+
+    def __init__(self, id, url):
+        self.id = id
+        self.url = url
+
+
+class CreatePRCreatePullRequestPayload(Record):
+    __slots__ = ("pull_request",)
+
+    def __init__(self, pull_request):
+        self.pull_request = pull_request
+
+
+class CreatePR(Record):
+    __slots__ = ("create_pull_request",)
+
+    def __init__(self, create_pull_request):
+        self.create_pull_request = create_pull_request
+
+
+class DeleteBranchDeleteRefPayload(Record):
+    __slots__ = ("client_mutation_id",)
+
+    def __init__(self, client_mutation_id):
+        self.client_mutation_id = client_mutation_id
+
+
+class DeleteBranch(Record):
+    __slots__ = ("delete_ref",)
+
+    def __init__(self, delete_ref):
+        self.delete_ref = delete_ref
+
+
+def _decode_GetPRsPagePageInfo(d: Optional[dict]) -> Optional[GetPRsPagePageInfo]:
+    if d is None:
+        return None
+    return GetPRsPagePageInfo(
+        d["hasPreviousPage"],
+        d["startCursor"],
+    )
+
+
+def _decode_GetPRsPagePullRequestChangedFile(d: Optional[dict]) -> Optional[GetPRsPagePullRequestChangedFile]:
+    if d is None:
+        return None
+    return GetPRsPagePullRequestChangedFile(
+        d["path"],
+    )
+
+
+def _decode_GetPRsPagePullRequestChangedFileEdge(d: Optional[dict]) -> Optional[GetPRsPagePullRequestChangedFileEdge]:
+    if d is None:
+        return None
+    return GetPRsPagePullRequestChangedFileEdge(
+        _decode_GetPRsPagePullRequestChangedFile(d["node"]),
+    )
+
+
+def _decode_GetPRsPagePullRequestChangedFileConnection(d: Optional[dict]) -> Optional[GetPRsPagePullRequestChangedFileConnection]:
+    if d is None:
+        return None
+    return GetPRsPagePullRequestChangedFileConnection(
+        _list(_decode_GetPRsPagePullRequestChangedFileEdge, d["edges"]),
+    )
+
+
+def _decode_GetPRsPagePullRequest(d: Optional[dict]) -> Optional[GetPRsPagePullRequest]:
+    if d is None:
+        return None
+    return GetPRsPagePullRequest(
+        d["id"],
+        _decode_GetPRsPagePullRequestChangedFileConnection(d["files"]),
+    )
+
+
+def _decode_GetPRsPagePullRequestEdge(d: Optional[dict]) -> Optional[GetPRsPagePullRequestEdge]:
+    if d is None:
+        return None
+    return GetPRsPagePullRequestEdge(
+        _decode_GetPRsPagePullRequest(d["node"]),
+    )
+
+
+def _decode_GetPRsPagePullRequestConnection(d: Optional[dict]) -> Optional[GetPRsPagePullRequestConnection]:
+    if d is None:
+        return None
+    return GetPRsPagePullRequestConnection(
+        _decode_GetPRsPagePageInfo(d["pageInfo"]),
+        _list(_decode_GetPRsPagePullRequestEdge, d["edges"]),
+    )
+
+
+def _decode_GetPRsPageRepository(d: Optional[dict]) -> Optional[GetPRsPageRepository]:
+    if d is None:
+        return None
+    return GetPRsPageRepository(
+        _decode_GetPRsPagePullRequestConnection(d["pullRequests"]),
+    )
+
+
+def _decode_GetPRsPageRateLimit(d: Optional[dict]) -> Optional[GetPRsPageRateLimit]:
+    if d is None:
+        return None
+    return GetPRsPageRateLimit(
+        d["cost"],
+        d["remaining"],
+        d["resetAt"],
+    )
+
+
+def _decode_GetPRsPage(d: Optional[dict]) -> Optional[GetPRsPage]:
+    if d is None:
+        return None
+    return GetPRsPage(
+        _decode_GetPRsPageRepository(d["repository"]),
+        _decode_GetPRsPageRateLimit(d["rateLimit"]),
+    )
+
+
+def _decode_GetSyncRefsGitObject(d: Optional[dict]) -> Optional[GetSyncRefsGitObject]:
+    if d is None:
+        return None
+    return GetSyncRefsGitObject(
+        d["oid"],
+    )
+
+
+def _decode_GetSyncRefsRef(d: Optional[dict]) -> Optional[GetSyncRefsRef]:
+    if d is None:
+        return None
+    return GetSyncRefsRef(
+        d["id"],
+        d["name"],
+        _decode_GetSyncRefsGitObject(d["target"]),
+    )
+
+
+def _decode_GetSyncRefsRefEdge(d: Optional[dict]) -> Optional[GetSyncRefsRefEdge]:
+    if d is None:
+        return None
+    return GetSyncRefsRefEdge(
+        _decode_GetSyncRefsRef(d["node"]),
+    )
+
+
+def _decode_GetSyncRefsRefConnection(d: Optional[dict]) -> Optional[GetSyncRefsRefConnection]:
+    if d is None:
+        return None
+    return GetSyncRefsRefConnection(
+        _list(_decode_GetSyncRefsRefEdge, d["edges"]),
+    )
+
+
+def _decode_GetSyncRefsRepository(d: Optional[dict]) -> Optional[GetSyncRefsRepository]:
+    if d is None:
+        return None
+    return GetSyncRefsRepository(
+        d["id"],
+        _decode_GetSyncRefsRefConnection(d["refs"]),
+    )
+
+
+def _decode_GetSyncRefsRateLimit(d: Optional[dict]) -> Optional[GetSyncRefsRateLimit]:
+    if d is None:
+        return None
+    return GetSyncRefsRateLimit(
+        d["cost"],
+        d["remaining"],
+        d["resetAt"],
+    )
+
+
+def _decode_GetSyncRefs(d: Optional[dict]) -> Optional[GetSyncRefs]:
+    if d is None:
+        return None
+    return GetSyncRefs(
+        _decode_GetSyncRefsRepository(d["upstream"]),
+        _decode_GetSyncRefsRepository(d["fork"]),
+        _decode_GetSyncRefsRateLimit(d["rateLimit"]),
+    )
+
+
+def _decode_GetTemplatesGitObject(d: Optional[dict]) -> Optional[GetTemplatesGitObject]:
+    if d is None:
+        return None
+    return GetTemplatesGitObject(
+        d["__typename"],
+        d.get("text"),
+    )
+
+
+def _decode_GetTemplatesRepository(d: Optional[dict]) -> Optional[GetTemplatesRepository]:
+    if d is None:
+        return None
+    return GetTemplatesRepository(
+        d["__typename"],
+        _decode_GetTemplatesGitObject(d["template3"]),
+        _decode_GetTemplatesGitObject(d["template4"]),
+    )
+
+
+def _decode_GetTemplatesRateLimit(d: Optional[dict]) -> Optional[GetTemplatesRateLimit]:
+    if d is None:
+        return None
+    return GetTemplatesRateLimit(
+        d["cost"],
+        d["remaining"],
+        d["resetAt"],
+    )
+
+
+def _decode_GetTemplates(d: Optional[dict]) -> Optional[GetTemplates]:
+    if d is None:
+        return None
+    return GetTemplates(
+        _decode_GetTemplatesRepository(d["repository"]),
+        _decode_GetTemplatesRateLimit(d["rateLimit"]),
+    )
+
+
+def _decode_GetWeekHeadPullRequestConnection(d: Optional[dict]) -> Optional[GetWeekHeadPullRequestConnection]:
+    if d is None:
+        return None
+    return GetWeekHeadPullRequestConnection(
+        d["totalCount"],
+    )
+
+
+def _decode_GetWeekHeadGitObject(d: Optional[dict]) -> Optional[GetWeekHeadGitObject]:
+    if d is None:
+        return None
+    return GetWeekHeadGitObject(
+        d["oid"],
+    )
+
+
+def _decode_GetWeekHeadRef(d: Optional[dict]) -> Optional[GetWeekHeadRef]:
+    if d is None:
+        return None
+    return GetWeekHeadRef(
+        d["name"],
+        _decode_GetWeekHeadGitObject(d["target"]),
+    )
+
+
+def _decode_GetWeekHeadPullRequest(d: Optional[dict]) -> Optional[GetWeekHeadPullRequest]:
+    if d is None:
+        return None
+    return GetWeekHeadPullRequest(
+        d["id"],
+        _decode_GetWeekHeadRef(d["headRef"]),
+    )
+
+
+def _decode_GetWeekHeadPullRequestEdge(d: Optional[dict]) -> Optional[GetWeekHeadPullRequestEdge]:
+    if d is None:
+        return None
+    return GetWeekHeadPullRequestEdge(
+        _decode_GetWeekHeadPullRequest(d["node"]),
+    )
+
+
+def _decode_GetWeekHeadPullRequestConnection2(d: Optional[dict]) -> Optional[GetWeekHeadPullRequestConnection2]:
+    if d is None:
+        return None
+    return GetWeekHeadPullRequestConnection2(
+        _list(_decode_GetWeekHeadPullRequestEdge, d["edges"]),
+    )
+
+
+def _decode_GetWeekHeadRepository(d: Optional[dict]) -> Optional[GetWeekHeadRepository]:
+    if d is None:
+        return None
+    return GetWeekHeadRepository(
+        _decode_GetWeekHeadPullRequestConnection(d["pullRequests"]),
+        _decode_GetWeekHeadPullRequestConnection2(d["parent"]),
+    )
+
+
+def _decode_GetWeekHeadRateLimit(d: Optional[dict]) -> Optional[GetWeekHeadRateLimit]:
+    if d is None:
+        return None
+    return GetWeekHeadRateLimit(
+        d["cost"],
+        d["remaining"],
+        d["resetAt"],
+    )
+
+
+def _decode_GetWeekHead(d: Optional[dict]) -> Optional[GetWeekHead]:
+    if d is None:
+        return None
+    return GetWeekHead(
+        _decode_GetWeekHeadRepository(d["repository"]),
+        _decode_GetWeekHeadRateLimit(d["rateLimit"]),
+    )
+
+
+def _decode_GetWeekPRsPageInfo(d: Optional[dict]) -> Optional[GetWeekPRsPageInfo]:
+    if d is None:
+        return None
+    return GetWeekPRsPageInfo(
+        d["hasPreviousPage"],
+        d["startCursor"],
+    )
+
+
+def _decode_GetWeekPRsPullRequestChangedFile(d: Optional[dict]) -> Optional[GetWeekPRsPullRequestChangedFile]:
+    if d is None:
+        return None
+    return GetWeekPRsPullRequestChangedFile(
+        d["path"],
+    )
+
+
+def _decode_GetWeekPRsPullRequestChangedFileEdge(d: Optional[dict]) -> Optional[GetWeekPRsPullRequestChangedFileEdge]:
+    if d is None:
+        return None
+    return GetWeekPRsPullRequestChangedFileEdge(
+        _decode_GetWeekPRsPullRequestChangedFile(d["node"]),
+    )
+
+
+def _decode_GetWeekPRsPullRequestChangedFileConnection(d: Optional[dict]) -> Optional[GetWeekPRsPullRequestChangedFileConnection]:
+    if d is None:
+        return None
+    return GetWeekPRsPullRequestChangedFileConnection(
+        _list(_decode_GetWeekPRsPullRequestChangedFileEdge, d["edges"]),
+    )
+
+
+def _decode_GetWeekPRsPullRequest(d: Optional[dict]) -> Optional[GetWeekPRsPullRequest]:
+    if d is None:
+        return None
+    return GetWeekPRsPullRequest(
+        d["id"],
+        _decode_GetWeekPRsPullRequestChangedFileConnection(d["files"]),
+    )
+
+
+def _decode_GetWeekPRsPullRequestEdge(d: Optional[dict]) -> Optional[GetWeekPRsPullRequestEdge]:
+    if d is None:
+        return None
+    return GetWeekPRsPullRequestEdge(
+        _decode_GetWeekPRsPullRequest(d["node"]),
+    )
+
+
+def _decode_GetWeekPRsPullRequestConnection(d: Optional[dict]) -> Optional[GetWeekPRsPullRequestConnection]:
+    if d is None:
+        return None
+    return GetWeekPRsPullRequestConnection(
+        _decode_GetWeekPRsPageInfo(d["pageInfo"]),
+        _list(_decode_GetWeekPRsPullRequestEdge, d["edges"]),
+    )
+
+
+def _decode_GetWeekPRsGitObject(d: Optional[dict]) -> Optional[GetWeekPRsGitObject]:
+    if d is None:
+        return None
+    return GetWeekPRsGitObject(
+        d["oid"],
+    )
+
+
+def _decode_GetWeekPRsRef(d: Optional[dict]) -> Optional[GetWeekPRsRef]:
+    if d is None:
+        return None
+    return GetWeekPRsRef(
+        d["name"],
+        _decode_GetWeekPRsGitObject(d["target"]),
+    )
+
+
+def _decode_GetWeekPRsPullRequest2(d: Optional[dict]) -> Optional[GetWeekPRsPullRequest2]:
+    if d is None:
+        return None
+    return GetWeekPRsPullRequest2(
+        d["id"],
+        d["title"],
+        _decode_GetWeekPRsRef(d["headRef"]),
+    )
+
+
+def _decode_GetWeekPRsPullRequestEdge2(d: Optional[dict]) -> Optional[GetWeekPRsPullRequestEdge2]:
+    if d is None:
+        return None
+    return GetWeekPRsPullRequestEdge2(
+        _decode_GetWeekPRsPullRequest2(d["node"]),
+    )
+
+
+def _decode_GetWeekPRsPullRequestConnection2(d: Optional[dict]) -> Optional[GetWeekPRsPullRequestConnection2]:
+    if d is None:
+        return None
+    return GetWeekPRsPullRequestConnection2(
+        _list(_decode_GetWeekPRsPullRequestEdge2, d["edges"]),
+    )
+
+
+def _decode_GetWeekPRsGitObject2(d: Optional[dict]) -> Optional[GetWeekPRsGitObject2]:
+    if d is None:
+        return None
+    return GetWeekPRsGitObject2(
+        d["__typename"],
+        d.get("text"),
+    )
+
+
+def _decode_GetWeekPRsRepository(d: Optional[dict]) -> Optional[GetWeekPRsRepository]:
+    if d is None:
+        return None
+    return GetWeekPRsRepository(
+        _decode_GetWeekPRsPullRequestConnection(d["pullRequests"]),
+        _decode_GetWeekPRsPullRequestConnection2(d["parent"]),
+        d["__typename"],
+        _decode_GetWeekPRsGitObject2(d["template3"]),
+        _decode_GetWeekPRsGitObject2(d["template4"]),
+    )
+
+
+def _decode_GetWeekPRsRateLimit(d: Optional[dict]) -> Optional[GetWeekPRsRateLimit]:
+    if d is None:
+        return None
+    return GetWeekPRsRateLimit(
+        d["cost"],
+        d["remaining"],
+        d["resetAt"],
+    )
+
+
+def _decode_GetWeekPRs(d: Optional[dict]) -> Optional[GetWeekPRs]:
+    if d is None:
+        return None
+    return GetWeekPRs(
+        _decode_GetWeekPRsRepository(d["repository"]),
+        _decode_GetWeekPRsRateLimit(d["rateLimit"]),
+    )
+
+
+def _decode_CreateBranchRef(d: Optional[dict]) -> Optional[CreateBranchRef]:
+    if d is None:
+        return None
+    return CreateBranchRef(
+        d["id"],
+    )
+
+
+def _decode_CreateBranchCreateRefPayload(d: Optional[dict]) -> Optional[CreateBranchCreateRefPayload]:
+    if d is None:
+        return None
+    return CreateBranchCreateRefPayload(
+        _decode_CreateBranchRef(d["ref"]),
+    )
+
+
+def _decode_CreateBranch(d: Optional[dict]) -> Optional[CreateBranch]:
+    if d is None:
+        return None
+    return CreateBranch(
+        _decode_CreateBranchCreateRefPayload(d["createRef"]),
+    )
+
+
+def _decode_CreateCommitCreateCommitOnBranchPayload(d: Optional[dict]) -> Optional[CreateCommitCreateCommitOnBranchPayload]:
+    if d is None:
+        return None
+    return CreateCommitCreateCommitOnBranchPayload(
+        d["clientMutationId"],
+    )
+
+
+def _decode_CreateCommit(d: Optional[dict]) -> Optional[CreateCommit]:
+    if d is None:
+        return None
+    return CreateCommit(
+        _decode_CreateCommitCreateCommitOnBranchPayload(d["createCommitOnBranch"]),
+    )
+
+
+def _decode_CreatePRPullRequest(d: Optional[dict]) -> Optional[CreatePRPullRequest]:
+    if d is None:
+        return None
+    return CreatePRPullRequest(
+        d["id"],
+        d["url"],
+    )
+
+
+def _decode_CreatePRCreatePullRequestPayload(d: Optional[dict]) -> Optional[CreatePRCreatePullRequestPayload]:
+    if d is None:
+        return None
+    return CreatePRCreatePullRequestPayload(
+        _decode_CreatePRPullRequest(d["pullRequest"]),
+    )
+
+
+def _decode_CreatePR(d: Optional[dict]) -> Optional[CreatePR]:
+    if d is None:
+        return None
+    return CreatePR(
+        _decode_CreatePRCreatePullRequestPayload(d["createPullRequest"]),
+    )
+
+
+def _decode_DeleteBranchDeleteRefPayload(d: Optional[dict]) -> Optional[DeleteBranchDeleteRefPayload]:
+    if d is None:
+        return None
+    return DeleteBranchDeleteRefPayload(
+        d["clientMutationId"],
+    )
+
+
+def _decode_DeleteBranch(d: Optional[dict]) -> Optional[DeleteBranch]:
+    if d is None:
+        return None
+    return DeleteBranch(
+        _decode_DeleteBranchDeleteRefPayload(d["deleteRef"]),
+    )
+
+
+DECODERS: Dict[str, Callable[[dict], Any]] = {
+    "GetPRsPage": _decode_GetPRsPage,
+    "GetSyncRefs": _decode_GetSyncRefs,
+    "GetTemplates": _decode_GetTemplates,
+    "GetWeekHead": _decode_GetWeekHead,
+    "GetWeekPRs": _decode_GetWeekPRs,
+    "CreateBranch": _decode_CreateBranch,
+    "CreateCommit": _decode_CreateCommit,
+    "CreatePR": _decode_CreatePR,
+    "DeleteBranch": _decode_DeleteBranch,
+}
+
+
+def decode(operation: str, response: dict) -> Any:
+    """Decode the `data` of a response to `operation` into records."""
+    return DECODERS[operation](response["data"])
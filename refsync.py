@@ -0,0 +1,41 @@
+"""Decide which fork refs actually need syncing from upstream.
+
+`GetSyncRefs` returns the current target oid of every ref, upstream and in the
+fork, so a ref whose fork oid already matches upstream needs no mutation -
+which is most submissions of a week:
+
+    stale = refsync.diff(refs_upstream, refsync.fork_refs(repo_fork))
+"""
+
+from typing import Dict, NamedTuple
+
+
+class ForkRef(NamedTuple):
+    id: str     # node ID, as `updateRef` wants it
+    oid: str    # current target
+
+
+def fork_refs(repo) -> Dict[str, ForkRef]:
+    """Map ref name -> (ID, target oid) of a repository's refs."""
+    return {
+        ref.node.name: ForkRef(ref.node.id, ref.node.target.oid)
+        for ref in repo.refs.edges
+    }
+
+
+def diff(refs_upstream: Dict[str, str], refs_fork: Dict[str, ForkRef]) -> Dict[str, str]:
+    """Get the upstream refs that the fork is missing or differs on.
+
+    Args:
+        refs_upstream: ref name -> upstream target oid, "master" first.
+        refs_fork: ref name -> ref of the fork.
+
+    Returns:
+        ref name -> upstream target oid, in the order of `refs_upstream`.
+    """
+    stale = {}
+    for ref_name, oid in refs_upstream.items():
+        ref = refs_fork.get(ref_name)
+        if ref is None or ref.oid != oid:
+            stale[ref_name] = oid
+    return stale
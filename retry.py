@@ -0,0 +1,129 @@
+"""Retry GraphQL requests that failed transiently, when that is safe.
+
+A 502 (or a dropped connection, or GitHub's "Something went wrong while
+executing your query") used to abort `open_pull_req` halfway through.
+`RetryPolicy` decides whether a failed request is sent again:
+
+    - queries are always safe to send again
+    - mutations only when they are idempotent: a mutation of `updateRef`s
+      (sending a ref to the same oid twice is a no-op) or of
+      `createCommitOnBranch`s (their `expectedHeadOid` makes a second commit
+      fail rather than land twice). `createRef` or `createPullRequest` may
+      have been applied before the response was lost, so they are not
+      retried...
+    - ...unless the request never reached GitHub (connection refused)
+    - errors that would fail again (bad input, not found, forbidden) never are
+
+Retries wait with "full jitter" exponential backoff - a random delay between
+0 and `base_delay * 2**attempt` (at most `max_delay`) - so that concurrent
+submissions failing together don't retry in lockstep.
+"""
+
+import asyncio
+import http.client
+import random
+import re
+import urllib.error
+from typing import Iterator, Optional
+
+
+# HTTP statuses of a request worth sending again
+RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+
+# GraphQL error types of a request worth sending again
+RETRY_TYPES = frozenset(("INTERNAL", "SERVICE_UNAVAILABLE", "TIMEOUT"))
+
+# GitHub's message for a query that timed out on its side
+_TRANSIENT_RE = re.compile(r"^Something went wrong while executing your query", re.I)
+
+# the root fields of a mutation (they all take an `input`)
+_MUTATION_FIELD_RE = re.compile(r"^(?:\w+: )?(\w+)\(input:", re.M)
+
+IDEMPOTENT_MUTATIONS = frozenset(("updateRef", "createCommitOnBranch"))
+
+# (the request was not sent, transient)
+UNSENT, TRANSIENT, FATAL = "unsent", "transient", "fatal"
+
+
+def idempotent(query) -> bool:
+    """Whether sending `query` (a query or mutation string) twice is the same as once."""
+    text = str(query).lstrip()
+    if not text.startswith("mutation"):
+        return True
+    fields = _MUTATION_FIELD_RE.findall(text)
+    return bool(fields) and all(field in IDEMPOTENT_MUTATIONS for field in fields)
+
+
+def classify_exception(exc: BaseException) -> str:
+    """Classify a failed request by its exception."""
+    if isinstance(exc, urllib.error.HTTPError):
+        return TRANSIENT if exc.code in RETRY_STATUSES else FATAL
+    if isinstance(exc, urllib.error.URLError):
+        exc = exc.reason if isinstance(exc.reason, BaseException) else exc
+    if isinstance(exc, ConnectionRefusedError):
+        return UNSENT
+    if isinstance(exc, (OSError, http.client.HTTPException, asyncio.TimeoutError, asyncio.IncompleteReadError)):
+        return TRANSIENT
+    return FATAL
+
+
+def classify(data: dict) -> Optional[str]:
+    """Classify a response (sgqlc-style dict) by its errors.
+
+    Returns:
+        None if it has no errors; otherwise the worst class of its errors.
+    """
+    errors = data.get("errors") or []
+    if not errors:
+        return None
+
+    kinds = set()
+    for error in errors:
+        status = error.get("status") or data.get("status")
+        exc = error.get("exception")
+        if status is not None:
+            kinds.add(TRANSIENT if status in RETRY_STATUSES else FATAL)
+        elif exc is not None:
+            kinds.add(classify_exception(exc))
+        elif error.get("type") in RETRY_TYPES or _TRANSIENT_RE.match(error.get("message") or ""):
+            kinds.add(TRANSIENT)
+        else:
+            kinds.add(FATAL)
+
+    for kind in (FATAL, TRANSIENT, UNSENT):
+        if kind in kinds:
+            return kind
+
+
+class RetryPolicy:
+    """When, and after how long, to send a failed request again.
+
+    Args:
+        attempts: most times a request is sent.
+        base_delay: seconds of the first backoff (before jitter).
+        max_delay: most seconds of a backoff.
+    """
+
+    def __init__(self, attempts: int = 4, base_delay: float = 0.5, max_delay: float = 8.0):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    @classmethod
+    def from_config(cls, cfg) -> "RetryPolicy":
+        """Build from the `[github]` section of config.ini."""
+        return cls(
+            attempts=cfg.getint("retry_attempts", fallback=4),
+            base_delay=cfg.getfloat("retry_base_delay", fallback=0.5),
+        )
+
+    def backoff(self) -> Iterator[float]:
+        """Jittered delays before each retry: `attempts - 1` of them."""
+        for attempt in range(self.attempts - 1):
+            yield random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def should_retry(self, query, kind: Optional[str]) -> bool:
+        """Whether to send `query` again, after it failed with `kind`."""
+        if kind == UNSENT:
+            return True
+        return kind == TRANSIENT and idempotent(query)
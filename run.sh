@@ -13,9 +13,28 @@ get_schema () {
     sgqlc-codegen schema schema.json schema.py
 }
 
+prune_schema () {
+    # only keep the types (and fields) used by our operations
+    python3 prune_schema.py schema.json schema_min.json operations.gql
+    sgqlc-codegen schema --schema-name schema schema_min.json schema_min.py
+}
+
 gen_queries () {
-    sgqlc-codegen operation --schema schema.json schema operations.py operations.gql
+    sgqlc-codegen operation --schema schema_min.json schema operations.py operations.gql
+
+    # load schema types on demand, instead of importing all of schema.py
+    sed -i.bak 's/^import schema$/import lazy_schema as schema/' operations.py && rm operations.py.bak
+
+    # serialize operations once, instead of on every request
+    python3 documents.py
+
+    # keep pagination changes from quietly multiplying the API spend
+    python3 query_cost.py operations.gql
+
+    # slotted result records (and their decoders) for each operation
+    python3 gen_records.py schema_min.json records.py
 }
 
 get_schema
+prune_schema
 gen_queries
@@ -0,0 +1,165 @@
+"""Binary index of a GraphQL introspection dump (`schema.json`).
+
+Parsing the whole 4 MB `schema.json` to look up a handful of types is most of
+the cost of every tool reading it. The index stores each introspection type as
+its own pre-parsed (marshal) record, plus a table of name -> offset, so a
+lookup only decodes that one record:
+
+    index = SchemaIndex("schema.json")
+    index["Repository"]["fields"]
+
+The index is written next to the dump (`.schema.json.idx`) and rebuilt when
+the dump changes: its size and mtime are checked first, and its hash only
+when those differ.
+"""
+
+import hashlib
+import json
+import marshal
+import mmap
+import os
+import struct
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Iterator, Union
+
+
+MAGIC = b"TWINIDX1"
+# magic, then the length of the marshalled header
+_PREFIX = struct.Struct(f"<{len(MAGIC)}sQ")
+
+
+def index_path(schema_path: Path) -> Path:
+    return schema_path.with_name(f".{schema_path.name}.idx")
+
+
+def file_hash(path: Path) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def build(schema_path: Path, path: Path) -> dict:
+    """Parse `schema_path` and write its index to `path`.
+
+    Returns:
+        the index header.
+    """
+    with open(schema_path, "rb") as f:
+        raw = f.read()
+    schema = json.loads(raw)["data"]["__schema"]
+
+    records = []
+    offsets = {}
+    position = 0
+    for t in schema["types"]:
+        record = marshal.dumps(t)
+        offsets[t["name"]] = (position, len(record))
+        position += len(record)
+        records.append(record)
+
+    stat = schema_path.stat()
+    header = {
+        "source_size": stat.st_size,
+        "source_mtime_ns": stat.st_mtime_ns,
+        "source_sha256": hashlib.sha256(raw).hexdigest(),
+        "root": {k: v for k, v in schema.items() if k != "types"},
+        "offsets": offsets,
+    }
+    _write(path, header, records)
+    return header
+
+
+def _write(path: Path, header: dict, records):
+    encoded = marshal.dumps(header)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(_PREFIX.pack(MAGIC, len(encoded)))
+        f.write(encoded)
+        for record in records:
+            f.write(record)
+    os.replace(tmp, path)
+
+
+class SchemaIndex(Mapping):
+    """Read-only mapping of type name -> introspection type.
+
+    Args:
+        schema_path: the introspection dump, as written by `sgqlc.introspection`.
+        path: where to keep the index; defaults to `.<schema>.idx` next to it.
+    """
+
+    def __init__(self, schema_path: Union[str, Path] = "schema.json", path: Union[str, Path, None] = None):
+        self.schema_path = Path(schema_path)
+        self.path = Path(path) if path else index_path(self.schema_path)
+        self._cache = {}
+
+        if not self._open():
+            build(self.schema_path, self.path)
+            if not self._open():
+                raise RuntimeError(f"could not read index {self.path}")
+
+    def _open(self) -> bool:
+        """Map the index file, if it is up to date with the schema."""
+        try:
+            with open(self.path, "rb") as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return False
+
+        # a truncated or foreign file is rebuilt, like a stale one
+        try:
+            magic, length = _PREFIX.unpack_from(data)
+            if magic != MAGIC:
+                return False
+            header = marshal.loads(data[_PREFIX.size:_PREFIX.size + length])
+            source = (header["source_size"], header["source_mtime_ns"])
+        except (struct.error, EOFError, ValueError, TypeError, KeyError):
+            return False
+
+        stat = self.schema_path.stat()
+        if (stat.st_size, stat.st_mtime_ns) != source:
+            if stat.st_size != header["source_size"] or file_hash(self.schema_path) != header["source_sha256"]:
+                return False
+            # touched, but not changed: only update the header
+            header["source_mtime_ns"] = stat.st_mtime_ns
+            _write(self.path, header, [data[_PREFIX.size + length:]])
+
+        self._data = data
+        self._records_start = _PREFIX.size + length
+        self.header = header
+        self.offsets = header["offsets"]
+        return True
+
+    @property
+    def root(self) -> dict:
+        """Everything in `__schema` but the types: `queryType`, `directives`, etc."""
+        return self.header["root"]
+
+    def __getitem__(self, name: str) -> dict:
+        try:
+            return self._cache[name]
+        except KeyError:
+            pass
+
+        offset, length = self.offsets[name]
+        start = self._records_start + offset
+        record = self._cache[name] = marshal.loads(self._data[start:start + length])
+        return record
+
+    def __iter__(self) -> Iterator[str]:
+        # in the order of the dump
+        return iter(self.offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __contains__(self, name) -> bool:
+        return name in self.offsets
+
+
+if __name__ == "__main__":
+    import sys
+
+    schema_path = Path(sys.argv[1] if len(sys.argv) > 1 else "schema.json")
+    header = build(schema_path, index_path(schema_path))
+    print(f"indexed {len(header['offsets'])} types into {index_path(schema_path).name}")
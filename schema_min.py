@@ -0,0 +1,359 @@
+import sgqlc.types
+import sgqlc.types.datetime
+import sgqlc.types.relay
+
+
+schema = sgqlc.types.Schema()
+
+
+# Unexport Node/PageInfo, let schema re-declare them
+schema -= sgqlc.types.relay.Node
+schema -= sgqlc.types.relay.PageInfo
+
+
+
+########################################################################
+# Scalars and Enumerations
+########################################################################
+class Base64String(sgqlc.types.Scalar):
+    __schema__ = schema
+
+
+Boolean = sgqlc.types.Boolean
+
+DateTime = sgqlc.types.datetime.DateTime
+
+Float = sgqlc.types.Float
+
+class GitObjectID(sgqlc.types.Scalar):
+    __schema__ = schema
+
+
+ID = sgqlc.types.ID
+
+Int = sgqlc.types.Int
+
+class IssueOrderField(sgqlc.types.Enum):
+    __schema__ = schema
+    __choices__ = ('COMMENTS', 'CREATED_AT', 'UPDATED_AT')
+
+
+class OrderDirection(sgqlc.types.Enum):
+    __schema__ = schema
+    __choices__ = ('ASC', 'DESC')
+
+
+class PullRequestState(sgqlc.types.Enum):
+    __schema__ = schema
+    __choices__ = ('CLOSED', 'MERGED', 'OPEN')
+
+
+class RefOrderField(sgqlc.types.Enum):
+    __schema__ = schema
+    __choices__ = ('ALPHABETICAL', 'TAG_COMMIT_DATE')
+
+
+String = sgqlc.types.String
+
+class URI(sgqlc.types.Scalar):
+    __schema__ = schema
+
+
+
+########################################################################
+# Input Objects
+########################################################################
+class CommitMessage(sgqlc.types.Input):
+    __schema__ = schema
+    __field_names__ = ('headline', 'body')
+    headline = sgqlc.types.Field(sgqlc.types.non_null(String), graphql_name='headline')
+    body = sgqlc.types.Field(String, graphql_name='body')
+
+
+class CommittableBranch(sgqlc.types.Input):
+    __schema__ = schema
+    __field_names__ = ('id', 'repository_name_with_owner', 'branch_name')
+    id = sgqlc.types.Field(ID, graphql_name='id')
+    repository_name_with_owner = sgqlc.types.Field(String, graphql_name='repositoryNameWithOwner')
+    branch_name = sgqlc.types.Field(String, graphql_name='branchName')
+
+
+class CreateCommitOnBranchInput(sgqlc.types.Input):
+    __schema__ = schema
+    __field_names__ = ('branch', 'file_changes', 'message', 'expected_head_oid', 'client_mutation_id')
+    branch = sgqlc.types.Field(sgqlc.types.non_null(CommittableBranch), graphql_name='branch')
+    file_changes = sgqlc.types.Field('FileChanges', graphql_name='fileChanges')
+    message = sgqlc.types.Field(sgqlc.types.non_null(CommitMessage), graphql_name='message')
+    expected_head_oid = sgqlc.types.Field(sgqlc.types.non_null(GitObjectID), graphql_name='expectedHeadOid')
+    client_mutation_id = sgqlc.types.Field(String, graphql_name='clientMutationId')
+
+
+class CreatePullRequestInput(sgqlc.types.Input):
+    __schema__ = schema
+    __field_names__ = ('repository_id', 'base_ref_name', 'head_ref_name', 'head_repository_id', 'title', 'body', 'maintainer_can_modify', 'draft', 'client_mutation_id')
+    repository_id = sgqlc.types.Field(sgqlc.types.non_null(ID), graphql_name='repositoryId')
+    base_ref_name = sgqlc.types.Field(sgqlc.types.non_null(String), graphql_name='baseRefName')
+    head_ref_name = sgqlc.types.Field(sgqlc.types.non_null(String), graphql_name='headRefName')
+    head_repository_id = sgqlc.types.Field(ID, graphql_name='headRepositoryId')
+    title = sgqlc.types.Field(sgqlc.types.non_null(String), graphql_name='title')
+    body = sgqlc.types.Field(String, graphql_name='body')
+    maintainer_can_modify = sgqlc.types.Field(Boolean, graphql_name='maintainerCanModify')
+    draft = sgqlc.types.Field(Boolean, graphql_name='draft')
+    client_mutation_id = sgqlc.types.Field(String, graphql_name='clientMutationId')
+
+
+class CreateRefInput(sgqlc.types.Input):
+    __schema__ = schema
+    __field_names__ = ('repository_id', 'name', 'oid', 'client_mutation_id')
+    repository_id = sgqlc.types.Field(sgqlc.types.non_null(ID), graphql_name='repositoryId')
+    name = sgqlc.types.Field(sgqlc.types.non_null(String), graphql_name='name')
+    oid = sgqlc.types.Field(sgqlc.types.non_null(GitObjectID), graphql_name='oid')
+    client_mutation_id = sgqlc.types.Field(String, graphql_name='clientMutationId')
+
+
+class DeleteRefInput(sgqlc.types.Input):
+    __schema__ = schema
+    __field_names__ = ('ref_id', 'client_mutation_id')
+    ref_id = sgqlc.types.Field(sgqlc.types.non_null(ID), graphql_name='refId')
+    client_mutation_id = sgqlc.types.Field(String, graphql_name='clientMutationId')
+
+
+class FileAddition(sgqlc.types.Input):
+    __schema__ = schema
+    __field_names__ = ('path', 'contents')
+    path = sgqlc.types.Field(sgqlc.types.non_null(String), graphql_name='path')
+    contents = sgqlc.types.Field(sgqlc.types.non_null(Base64String), graphql_name='contents')
+
+
+class FileChanges(sgqlc.types.Input):
+    __schema__ = schema
+    __field_names__ = ('deletions', 'additions')
+    deletions = sgqlc.types.Field(sgqlc.types.list_of(sgqlc.types.non_null('FileDeletion')), graphql_name='deletions')
+    additions = sgqlc.types.Field(sgqlc.types.list_of(sgqlc.types.non_null(FileAddition)), graphql_name='additions')
+
+
+class FileDeletion(sgqlc.types.Input):
+    __schema__ = schema
+    __field_names__ = ('path',)
+    path = sgqlc.types.Field(sgqlc.types.non_null(String), graphql_name='path')
+
+
+class IssueOrder(sgqlc.types.Input):
+    __schema__ = schema
+    __field_names__ = ('field', 'direction')
+    field = sgqlc.types.Field(sgqlc.types.non_null(IssueOrderField), graphql_name='field')
+    direction = sgqlc.types.Field(sgqlc.types.non_null(OrderDirection), graphql_name='direction')
+
+
+class RefOrder(sgqlc.types.Input):
+    __schema__ = schema
+    __field_names__ = ('field', 'direction')
+    field = sgqlc.types.Field(sgqlc.types.non_null(RefOrderField), graphql_name='field')
+    direction = sgqlc.types.Field(sgqlc.types.non_null(OrderDirection), graphql_name='direction')
+
+
+
+########################################################################
+# Output Objects and Interfaces
+########################################################################
+class GitObject(sgqlc.types.Interface):
+    __schema__ = schema
+    __field_names__ = ('oid',)
+    oid = sgqlc.types.Field(sgqlc.types.non_null(GitObjectID), graphql_name='oid')
+
+
+class CreateCommitOnBranchPayload(sgqlc.types.Type):
+    __schema__ = schema
+    __field_names__ = ('client_mutation_id',)
+    client_mutation_id = sgqlc.types.Field(String, graphql_name='clientMutationId')
+
+
+class CreatePullRequestPayload(sgqlc.types.Type):
+    __schema__ = schema
+    __field_names__ = ('pull_request',)
+    pull_request = sgqlc.types.Field('PullRequest', graphql_name='pullRequest')
+
+
+class CreateRefPayload(sgqlc.types.Type):
+    __schema__ = schema
+    __field_names__ = ('ref',)
+    ref = sgqlc.types.Field('Ref', graphql_name='ref')
+
+
+class DeleteRefPayload(sgqlc.types.Type):
+    __schema__ = schema
+    __field_names__ = ('client_mutation_id',)
+    client_mutation_id = sgqlc.types.Field(String, graphql_name='clientMutationId')
+
+
+class Mutation(sgqlc.types.Type):
+    __schema__ = schema
+    __field_names__ = ('create_commit_on_branch', 'create_pull_request', 'create_ref', 'delete_ref')
+    create_commit_on_branch = sgqlc.types.Field(CreateCommitOnBranchPayload, graphql_name='createCommitOnBranch', args=sgqlc.types.ArgDict((
+        ('input', sgqlc.types.Arg(sgqlc.types.non_null(CreateCommitOnBranchInput), graphql_name='input', default=None)),
+))
+    )
+    create_pull_request = sgqlc.types.Field(CreatePullRequestPayload, graphql_name='createPullRequest', args=sgqlc.types.ArgDict((
+        ('input', sgqlc.types.Arg(sgqlc.types.non_null(CreatePullRequestInput), graphql_name='input', default=None)),
+))
+    )
+    create_ref = sgqlc.types.Field(CreateRefPayload, graphql_name='createRef', args=sgqlc.types.ArgDict((
+        ('input', sgqlc.types.Arg(sgqlc.types.non_null(CreateRefInput), graphql_name='input', default=None)),
+))
+    )
+    delete_ref = sgqlc.types.Field(DeleteRefPayload, graphql_name='deleteRef', args=sgqlc.types.ArgDict((
+        ('input', sgqlc.types.Arg(sgqlc.types.non_null(DeleteRefInput), graphql_name='input', default=None)),
+))
+    )
+
+
+class PageInfo(sgqlc.types.Type):
+    __schema__ = schema
+    __field_names__ = ('has_previous_page', 'start_cursor')
+    has_previous_page = sgqlc.types.Field(sgqlc.types.non_null(Boolean), graphql_name='hasPreviousPage')
+    start_cursor = sgqlc.types.Field(String, graphql_name='startCursor')
+
+
+class PullRequest(sgqlc.types.Type):
+    __schema__ = schema
+    __field_names__ = ('files', 'head_ref', 'id', 'title', 'url')
+    files = sgqlc.types.Field('PullRequestChangedFileConnection', graphql_name='files', args=sgqlc.types.ArgDict((
+        ('after', sgqlc.types.Arg(String, graphql_name='after', default=None)),
+        ('before', sgqlc.types.Arg(String, graphql_name='before', default=None)),
+        ('first', sgqlc.types.Arg(Int, graphql_name='first', default=None)),
+        ('last', sgqlc.types.Arg(Int, graphql_name='last', default=None)),
+))
+    )
+    head_ref = sgqlc.types.Field('Ref', graphql_name='headRef')
+    id = sgqlc.types.Field(sgqlc.types.non_null(ID), graphql_name='id')
+    title = sgqlc.types.Field(sgqlc.types.non_null(String), graphql_name='title')
+    url = sgqlc.types.Field(sgqlc.types.non_null(URI), graphql_name='url')
+
+
+class PullRequestChangedFile(sgqlc.types.Type):
+    __schema__ = schema
+    __field_names__ = ('path',)
+    path = sgqlc.types.Field(sgqlc.types.non_null(String), graphql_name='path')
+
+
+class PullRequestChangedFileConnection(sgqlc.types.relay.Connection):
+    __schema__ = schema
+    __field_names__ = ('edges',)
+    edges = sgqlc.types.Field(sgqlc.types.list_of('PullRequestChangedFileEdge'), graphql_name='edges')
+
+
+class PullRequestChangedFileEdge(sgqlc.types.Type):
+    __schema__ = schema
+    __field_names__ = ('node',)
+    node = sgqlc.types.Field(PullRequestChangedFile, graphql_name='node')
+
+
+class PullRequestConnection(sgqlc.types.relay.Connection):
+    __schema__ = schema
+    __field_names__ = ('edges', 'page_info', 'total_count')
+    edges = sgqlc.types.Field(sgqlc.types.list_of('PullRequestEdge'), graphql_name='edges')
+    page_info = sgqlc.types.Field(sgqlc.types.non_null(PageInfo), graphql_name='pageInfo')
+    total_count = sgqlc.types.Field(sgqlc.types.non_null(Int), graphql_name='totalCount')
+
+
+class PullRequestEdge(sgqlc.types.Type):
+    __schema__ = schema
+    __field_names__ = ('node',)
+    node = sgqlc.types.Field(PullRequest, graphql_name='node')
+
+
+class Query(sgqlc.types.Type):
+    __schema__ = schema
+    __field_names__ = ('rate_limit', 'repository')
+    rate_limit = sgqlc.types.Field('RateLimit', graphql_name='rateLimit', args=sgqlc.types.ArgDict((
+        ('dry_run', sgqlc.types.Arg(Boolean, graphql_name='dryRun', default=False)),
+))
+    )
+    repository = sgqlc.types.Field('Repository', graphql_name='repository', args=sgqlc.types.ArgDict((
+        ('owner', sgqlc.types.Arg(sgqlc.types.non_null(String), graphql_name='owner', default=None)),
+        ('name', sgqlc.types.Arg(sgqlc.types.non_null(String), graphql_name='name', default=None)),
+        ('follow_renames', sgqlc.types.Arg(Boolean, graphql_name='followRenames', default=True)),
+))
+    )
+
+
+class RateLimit(sgqlc.types.Type):
+    __schema__ = schema
+    __field_names__ = ('cost', 'remaining', 'reset_at')
+    cost = sgqlc.types.Field(sgqlc.types.non_null(Int), graphql_name='cost')
+    remaining = sgqlc.types.Field(sgqlc.types.non_null(Int), graphql_name='remaining')
+    reset_at = sgqlc.types.Field(sgqlc.types.non_null(DateTime), graphql_name='resetAt')
+
+
+class Ref(sgqlc.types.Type):
+    __schema__ = schema
+    __field_names__ = ('id', 'name', 'target')
+    id = sgqlc.types.Field(sgqlc.types.non_null(ID), graphql_name='id')
+    name = sgqlc.types.Field(sgqlc.types.non_null(String), graphql_name='name')
+    target = sgqlc.types.Field(GitObject, graphql_name='target')
+
+
+class RefConnection(sgqlc.types.relay.Connection):
+    __schema__ = schema
+    __field_names__ = ('edges',)
+    edges = sgqlc.types.Field(sgqlc.types.list_of('RefEdge'), graphql_name='edges')
+
+
+class RefEdge(sgqlc.types.Type):
+    __schema__ = schema
+    __field_names__ = ('node',)
+    node = sgqlc.types.Field(Ref, graphql_name='node')
+
+
+class Repository(sgqlc.types.Type):
+    __schema__ = schema
+    __field_names__ = ('id', 'object', 'pull_requests', 'refs')
+    id = sgqlc.types.Field(sgqlc.types.non_null(ID), graphql_name='id')
+    object = sgqlc.types.Field(GitObject, graphql_name='object', args=sgqlc.types.ArgDict((
+        ('oid', sgqlc.types.Arg(GitObjectID, graphql_name='oid', default=None)),
+        ('expression', sgqlc.types.Arg(String, graphql_name='expression', default=None)),
+))
+    )
+    pull_requests = sgqlc.types.Field(sgqlc.types.non_null(PullRequestConnection), graphql_name='pullRequests', args=sgqlc.types.ArgDict((
+        ('states', sgqlc.types.Arg(sgqlc.types.list_of(sgqlc.types.non_null(PullRequestState)), graphql_name='states', default=None)),
+        ('labels', sgqlc.types.Arg(sgqlc.types.list_of(sgqlc.types.non_null(String)), graphql_name='labels', default=None)),
+        ('head_ref_name', sgqlc.types.Arg(String, graphql_name='headRefName', default=None)),
+        ('base_ref_name', sgqlc.types.Arg(String, graphql_name='baseRefName', default=None)),
+        ('order_by', sgqlc.types.Arg(IssueOrder, graphql_name='orderBy', default=None)),
+        ('after', sgqlc.types.Arg(String, graphql_name='after', default=None)),
+        ('before', sgqlc.types.Arg(String, graphql_name='before', default=None)),
+        ('first', sgqlc.types.Arg(Int, graphql_name='first', default=None)),
+        ('last', sgqlc.types.Arg(Int, graphql_name='last', default=None)),
+))
+    )
+    refs = sgqlc.types.Field(RefConnection, graphql_name='refs', args=sgqlc.types.ArgDict((
+        ('query', sgqlc.types.Arg(String, graphql_name='query', default=None)),
+        ('after', sgqlc.types.Arg(String, graphql_name='after', default=None)),
+        ('before', sgqlc.types.Arg(String, graphql_name='before', default=None)),
+        ('first', sgqlc.types.Arg(Int, graphql_name='first', default=None)),
+        ('last', sgqlc.types.Arg(Int, graphql_name='last', default=None)),
+        ('ref_prefix', sgqlc.types.Arg(sgqlc.types.non_null(String), graphql_name='refPrefix', default=None)),
+        ('direction', sgqlc.types.Arg(OrderDirection, graphql_name='direction', default=None)),
+        ('order_by', sgqlc.types.Arg(RefOrder, graphql_name='orderBy', default=None)),
+))
+    )
+
+
+class Blob(sgqlc.types.Type, GitObject):
+    __schema__ = schema
+    __field_names__ = ('text',)
+    text = sgqlc.types.Field(String, graphql_name='text')
+
+
+
+########################################################################
+# Unions
+########################################################################
+
+########################################################################
+# Schema Entry Points
+########################################################################
+schema.query_type = Query
+schema.mutation_type = Mutation
+schema.subscription_type = None
+
@@ -0,0 +1,87 @@
+"""Single-flight calls: concurrent identical calls share one execution.
+
+Submissions processed at the same time all list the same PRs and sync the
+same refs. A function wrapped with `coalesced` (threads) or `acoalesced`
+(asyncio) only runs once for all the callers that arrive while it is running
+with the same arguments; they all get its result (or its exception):
+
+    @coalesced
+    def sync_twin_branch(): ...
+
+Nothing is cached: a call made after the running one finished runs again.
+Results are shared between callers, so they must not be modified, and
+anything each caller needs for itself must come from elsewhere: e.g. the
+weekly context is shared, but each submission claims its own number in it
+(`weekly.claim`).
+"""
+
+import asyncio
+import functools
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+def _key(args: tuple, kwargs: dict) -> Hashable:
+    return args, tuple(sorted(kwargs.items()))
+
+
+class _Call:
+    """A call in flight, for the callers waiting on it."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+def coalesced(fn: Callable) -> Callable:
+    """Share each call of `fn` with the identical calls made (from other threads) while it runs."""
+    calls: Dict[Hashable, _Call] = {}
+    lock = threading.Lock()
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        key = _key(args, kwargs)
+        with lock:
+            call = calls.get(key)
+            leader = call is None
+            if leader:
+                call = calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with lock:
+                del calls[key]
+            call.done.set()
+
+    return wrapper
+
+
+def acoalesced(fn: Callable[..., Awaitable]) -> Callable[..., Awaitable]:
+    """Async `coalesced`: share each call of a coroutine function between concurrent tasks."""
+    tasks: Dict[Tuple[int, Hashable], asyncio.Future] = {}
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        # per event loop: a future can't be awaited from another one
+        key = (id(asyncio.get_running_loop()), _key(args, kwargs))
+        task = tasks.get(key)
+        if task is None:
+            task = tasks[key] = asyncio.ensure_future(fn(*args, **kwargs))
+            task.add_done_callback(lambda _: tasks.pop(key, None))
+
+        # a cancelled caller doesn't cancel the call for the others
+        return await asyncio.shield(task)
+
+    return wrapper
@@ -0,0 +1,198 @@
+"""Cache of the section templates `mutate` fills in.
+
+The templates live in the contents repo that `github` already queries, so
+they come along with its GraphQL requests: `GetWeekPRs` refreshes them on
+every PR listing (`store`), and `GetTemplates` fetches them on their own,
+over the same pooled connection. The templates change maybe once a month;
+each one is kept on disk (`.template-cache.json`, one per source of GitHub
+data: see `config.state_path`) and used for `ttl` seconds after it was last
+fetched.
+
+When GraphQL can't provide a template, `TemplateCache.get` falls back to
+raw.githubusercontent.com, revalidating with the file's ETag:
+
+    - within `ttl` seconds of the last check, it is served without a request
+    - after that, it is revalidated with `If-None-Match`: a `304 Not Modified`
+      costs no body, and only a changed template is downloaded again
+    - if revalidating fails, the cached copy is served anyway
+
+    text = get_cache().get("3-new-plugins/1-example.md")
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Optional, Union
+
+import cassette
+from config import state_path
+
+# (requests is only imported for a download: github imports this module)
+if TYPE_CHECKING:
+    import requests
+
+
+CACHE_FILE = ".template-cache.json"
+
+URL = "https://raw.githubusercontent.com/phaazon/this-week-in-neovim-contents/master/template"
+
+# alias in the `Templates` fragment (operations.gql) -> template name
+ALIASES = {
+    "template3": "3-new-plugins/1-example.md",
+    "template4": "4-updates/1-example.md",
+}
+
+
+class TemplateCache:
+    """On-disk cache of templates, by name (their path under `base_url`).
+
+    Args:
+        path: where to keep the cache; by default, this source's `CACHE_FILE`.
+        ttl: seconds during which a cached template is used without revalidating.
+        session: HTTP session to send requests with (keep-alive); by default,
+            a new one on the first download.
+        base_url: where to download templates from, when GraphQL can't.
+        timeout: seconds to wait for the server (to connect, and between
+            bytes) before falling back to the cached copy.
+    """
+
+    logger = logging.getLogger(__name__)
+
+    def __init__(
+        self,
+        path: Union[str, Path, None] = None,
+        ttl: float = 3600.0,
+        session: Optional["requests.Session"] = None,
+        base_url: str = URL,
+        timeout: float = 10.0,
+    ):
+        self.path = Path(path) if path else state_path(CACHE_FILE)
+        self.ttl = ttl
+        self._session = session
+        self.base_url = base_url
+        self.timeout = timeout
+
+        # name -> {"etag": ..., "text": ..., "checked": unix time of the last check}
+        self._entries: Dict[str, dict] = self._load()
+        # (submissions may run in threads)
+        self._lock = threading.RLock()
+
+        # how many requests were sent, and how many of those were 304s
+        self.requests = 0
+        self.not_modified = 0
+
+    @property
+    def session(self) -> "requests.Session":
+        if self._session is None:
+            import requests
+
+            self._session = requests.Session()
+        return self._session
+
+    @session.setter
+    def session(self, session: "requests.Session"):
+        self._session = session
+
+    def _load(self) -> Dict[str, dict]:
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with self._lock:
+            with open(tmp, "w") as f:
+                json.dump(self._entries, f, indent=2)
+            os.replace(tmp, self.path)
+
+    def cached(self, name: str) -> Optional[str]:
+        """Get a template from the cache, if it was fetched less than `ttl` seconds ago."""
+        entry = self._entries.get(name)
+        if entry is not None and time.time() - entry["checked"] < self.ttl:
+            return entry["text"]
+        return None
+
+    def update(self, texts: Dict[str, str]):
+        """Store templates fetched some other way (i.e. through GraphQL), by name."""
+        now = time.time()
+        with self._lock:
+            for name, text in texts.items():
+                entry = self._entries.get(name)
+                if entry is not None and entry["text"] == text:
+                    # unchanged: keep its ETag, for a later revalidation
+                    entry["checked"] = now
+                else:
+                    self._entries[name] = {"etag": None, "text": text, "checked": now}
+            self._save()
+
+    def get(self, name: str) -> str:
+        """Get a template, downloading it over HTTP unless the cached copy is still current."""
+        text = self.cached(name)
+        if text is not None:
+            return text
+
+        url = f"{self.base_url}/{name}"
+        entry = self._entries.get(name)
+        now = time.time()
+
+        headers = {}
+        if entry is not None and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+
+        import requests
+
+        self.requests += 1
+        try:
+            resp = self.session.get(url, headers=headers, timeout=self.timeout)
+            if resp.status_code != 304:
+                resp.raise_for_status()
+        except requests.RequestException as exc:
+            if entry is None:
+                raise
+            self.logger.warning("could not revalidate %s, using the cached copy: %s", url, exc)
+            return entry["text"]
+
+        with self._lock:
+            if resp.status_code == 304:
+                self.not_modified += 1
+                entry["checked"] = now
+            else:
+                entry = {"etag": resp.headers.get("ETag"), "text": resp.content.decode(), "checked": now}
+                self._entries[name] = entry
+            self._save()
+        return entry["text"]
+
+
+_cache: Optional[TemplateCache] = None
+
+
+def get_cache() -> TemplateCache:
+    """Get this process' template cache, loading it the first time it is needed."""
+    global _cache
+    if _cache is None:
+        # record or replay downloads, see cassette.py
+        fixture = cassette.get_cassette()
+        _cache = TemplateCache(session=fixture.session() if fixture is not None else None)
+    return _cache
+
+
+def store(repo) -> Dict[str, str]:
+    """Cache the templates selected (by the `Templates` fragment) on a repository record.
+
+    Returns:
+        template name -> text, of the templates that were found.
+    """
+    found = {}
+    for alias, name in ALIASES.items():
+        blob = getattr(repo, alias, None)
+        if blob is not None and blob.text is not None:
+            found[name] = blob.text
+
+    if found:
+        get_cache().update(found)
+    return found
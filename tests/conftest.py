@@ -0,0 +1,56 @@
+"""Fixtures: the bot's modules are imported from the repository root."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import async_github  # noqa: E402
+import cassette  # noqa: E402
+import fake_github  # noqa: E402
+import github  # noqa: E402
+import querycache  # noqa: E402
+import ratelimit  # noqa: E402
+import templates  # noqa: E402
+from config import Cfg  # noqa: E402
+
+
+@pytest.fixture
+def config(tmp_path, monkeypatch):
+    """Write the `[github]` section of config.ini (in `tmp_path`, the cwd) and read it afresh.
+
+    The bot's on-disk state is kept in `tmp_path` too (`state_dir`).
+    """
+
+    def write(**options):
+        options.setdefault("state_dir", str(tmp_path))
+        lines = ["[github]"] + [f"{name} = {value}" for name, value in options.items()]
+        (tmp_path / "config.ini").write_text("\n".join(lines) + "\n")
+        monkeypatch.setattr(Cfg, "_instance", None)
+
+    monkeypatch.chdir(tmp_path)
+    write()
+    return write
+
+
+def fresh_process(monkeypatch):
+    """Drop the per-process singletons, to be built again from the current config.ini."""
+    monkeypatch.setattr(github, "_endpoint", github.PerProcess(github.make_endpoint))
+    monkeypatch.setattr(async_github, "_endpoint", github.PerProcess(async_github.make_endpoint))
+    monkeypatch.setattr(querycache, "_cache", None)
+    monkeypatch.setattr(ratelimit, "_budget", None)
+    monkeypatch.setattr(cassette, "_cassette", None)
+    monkeypatch.setattr(cassette, "_configured", False)
+    monkeypatch.setattr(templates, "_cache", None)
+
+
+@pytest.fixture
+def fake(config, monkeypatch):
+    """A running `FakeGitHub` (seeded world), and the bot pointed at it from a fresh process state."""
+    with fake_github.FakeGitHub() as server:
+        config(secret="test", url=server.url, query_cache_disk="no", retry_base_delay=0.01)
+        fresh_process(monkeypatch)
+        yield server
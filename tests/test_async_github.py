@@ -0,0 +1,42 @@
+"""Async `open_pull_req`, against `FakeGitHub` (see conftest.py)."""
+
+import asyncio
+
+import pytest
+
+import async_github
+
+
+def test_open_pull_req(fake):
+    url = asyncio.run(async_github.open_pull_req(4, "bar.nvim", "hello"))
+
+    (pr,) = fake.world.repo("amar1729")._pull_requests
+    assert url == pr.url
+    assert pr.title == "[plugin update]: bar.nvim"
+    # seeded with 7 updates this week
+    assert pr.head_ref.target.tree["contents/2023/01/13/4-updates/8-bar.md"] == "hello"
+
+
+def test_rebuild_lists_and_syncs_once(fake, config):
+    config(secret="test", url=fake.url, query_cache_disk="no", page_size=5)
+
+    asyncio.run(async_github.open_pull_req(3, "foo.nvim", "x"))
+
+    # 20 PRs this week, 5 per page: the first page, then 4 more down to the parent PR
+    assert fake.stats["GetWeekPRs"] == 1
+    assert fake.stats["GetPRsPage"] == 4
+    assert fake.stats["GetSyncRefs"] == 1
+    # the fork was a commit behind
+    assert fake.stats["SyncRefs"] == 1
+    assert fake.world.repo("amar1729")._refs["master"].target.oid == fake.world.repo("phaazon")._refs["master"].target.oid
+
+
+def test_failed_commit_opens_no_pr(fake):
+    fake.fail["CreateCommit"] = 4
+
+    with pytest.raises(Exception, match="Committing to the patch branch failed"):
+        asyncio.run(async_github.open_pull_req(3, "foo.nvim", "x"))
+
+    fork = fake.world.repo("amar1729")
+    assert fork._pull_requests == []
+    assert not [name for name in fork._refs if name.startswith("patch-")]
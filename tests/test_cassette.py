@@ -0,0 +1,94 @@
+"""Recording exchanges with `FakeGitHub`, and replaying them with no server."""
+
+import asyncio
+import gzip
+import json
+
+import pytest
+
+import async_github
+import cassette
+import documents
+import github
+from cassette import Cassette, CassetteMiss
+
+from conftest import fresh_process
+
+
+def week_head(page_size=None):
+    """Body of a `GetWeekHead` request (`page_size` only makes it a different one)."""
+    variables = {} if page_size is None else {"pageSize": page_size}
+    return json.dumps({"query": documents.get("GetWeekHead"), "operationName": "GetWeekHead", "variables": variables})
+
+
+def test_replays_each_request_its_own_response(tmp_path):
+    recorded = Cassette(tmp_path / "week.json.gz", cassette.RECORD)
+    for number in range(2):
+        recorded.record("POST", "http://x", week_head(number), 200, "OK", {}, f"head {number}".encode(), 0.1)
+    recorded.save()
+
+    replayed = Cassette(tmp_path / "week.json.gz")
+    assert replayed.play("POST", "http://x", week_head(1)).body == "head 1"
+    assert replayed.play("POST", "http://x", week_head(0)).body == "head 0"
+    # played out: the last one again
+    assert replayed.play("POST", "http://x", week_head(0)).body == "head 0"
+
+
+def test_falls_back_to_the_same_operation(tmp_path):
+    recorded = Cassette(tmp_path / "week.json.gz", cassette.RECORD)
+    recorded.record("POST", "http://x", week_head(0), 200, "OK", {}, b"head", 0.1)
+    recorded.save()
+
+    replayed = Cassette(tmp_path / "week.json.gz")
+    assert replayed.play("POST", "http://x", week_head(5)).body == "head"
+    with pytest.raises(CassetteMiss):
+        replayed.play("POST", "http://x", json.dumps({"query": "{ viewer { login } }"}))
+    with pytest.raises(CassetteMiss):
+        replayed.play("POST", "http://elsewhere", week_head(0))
+
+
+def test_keeps_no_request_headers_nor_bodies(tmp_path):
+    recorded = Cassette(tmp_path / "week.json.gz", cassette.RECORD)
+    headers = {"Content-Type": "application/json", "Set-Cookie": "secret", "X-RateLimit-Remaining": "4999"}
+    recorded.record("POST", "http://x", week_head(), 200, "OK", headers, b"{}", 0.1)
+    recorded.save()
+
+    with gzip.open(tmp_path / "week.json.gz", "rt") as f:
+        saved = f.read()
+    assert "secret" not in saved and "GetWeekHead(" not in saved
+    (exchange,) = Cassette.load(tmp_path / "week.json.gz")
+    assert exchange.headers == {"Content-Type": "application/json", "X-RateLimit-Remaining": "4999"}
+
+
+def test_replays_open_pull_req_without_a_server(fake, config, monkeypatch, tmp_path):
+    fixture = tmp_path / "week.json.gz"
+    config(secret="test", url=fake.url, query_cache_disk="no", cassette=fixture, cassette_mode="record")
+    fresh_process(monkeypatch)
+
+    urls = [
+        github.open_pull_req(3, "foo.nvim", "hello"),
+        asyncio.run(async_github.open_pull_req(4, "bar.nvim", "x")),
+    ]
+    cassette.get_cassette().save()
+    sent = sum(fake.stats.values())
+    fake.stop()
+
+    # no token, and the server is gone
+    config(url=fake.url, query_cache_disk="no", cassette=fixture)
+    fresh_process(monkeypatch)
+
+    assert github.open_pull_req(3, "foo.nvim", "hello") == urls[0]
+    assert asyncio.run(async_github.open_pull_req(4, "bar.nvim", "x")) == urls[1]
+    assert sum(fake.stats.values()) == sent
+
+
+def test_session_records_and_replays(fake, tmp_path):
+    fixture = tmp_path / "week.json.gz"
+    recorded = Cassette(fixture, cassette.RECORD)
+    response = recorded.session().post(fake.url, data=week_head(), headers={"Authorization": "Bearer test"})
+    recorded.save()
+    fake.stop()
+
+    replayed = Cassette(fixture).session().post(fake.url, data=week_head())
+    assert replayed.status_code == response.status_code == 200
+    assert replayed.json() == response.json()
@@ -0,0 +1,28 @@
+import json
+
+import documents
+
+
+def test_committed_cache_is_current():
+    with open(documents.CACHE_PATH) as f:
+        assert json.load(f)["hash"] == documents.source_hash()
+
+
+def test_load_rebuilds_a_stale_cache(tmp_path):
+    path = tmp_path / "operations.json"
+    path.write_text(json.dumps({"hash": "stale", "operations": {}}))
+
+    docs = documents.load(path)
+
+    assert docs["CreatePR"].name == "CreatePR"
+    assert json.loads(path.read_text())["hash"] == documents.source_hash()
+    assert [p.name for p in tmp_path.iterdir()] == ["operations.json"]
+
+
+def test_load_keeps_the_build_when_it_cant_save(tmp_path):
+    path = tmp_path / "missing" / "operations.json"
+
+    docs = documents.load(path)
+
+    assert docs["GetWeekPRs"].variables == {"pageSize": "Int!"}
+    assert not path.exists()
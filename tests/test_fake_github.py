@@ -0,0 +1,54 @@
+"""`open_pull_req` end to end, against `FakeGitHub` (see conftest.py)."""
+
+import documents
+import fake_github
+import github
+
+
+def added_files(server, section_dir="3-new-plugins"):
+    """Names of the files added by the PRs opened in the fork, by PR number."""
+    fork = server.world.repo("amar1729")
+    return {
+        pr.number: [path.rsplit("/", 1)[1] for path in pr._files if f"/{section_dir}/" in path]
+        for pr in fork._pull_requests
+    }
+
+
+def test_open_pull_req(fake):
+    url = github.open_pull_req(3, "foo.nvim", "hello")
+
+    (pr,) = fake.world.repo("amar1729")._pull_requests
+    assert url == pr.url
+    assert pr.title == "[new plugin]: foo.nvim"
+    # seeded with 13 new plugins this week
+    assert added_files(fake) == {pr.number: ["14-foo.md"]}
+    assert pr.head_ref.name.startswith("patch-")
+    assert pr.head_ref.target.tree["contents/2023/01/13/3-new-plugins/14-foo.md"] == "hello"
+
+
+def test_fails_the_next_requests_of_an_operation():
+    server = fake_github.FakeGitHub()
+    server.fail["GetWeekHead"] = 1
+    body = {"query": documents.get("GetWeekHead"), "variables": {}}
+
+    assert server.handle(body)[0] == 502
+    status, response = server.handle(body)
+    assert status == 200 and response["data"]["repository"]["pullRequests"]["totalCount"] > 0
+
+
+def test_rejects_invalid_requests_like_github():
+    status, response = fake_github.FakeGitHub().handle({"query": "query Nope { repository { nope } }"})
+
+    assert status == 200
+    assert "errors" in response and "data" not in response
+
+
+def test_charges_each_request_its_points():
+    server = fake_github.FakeGitHub(rate_limit=100)
+    _, response = server.handle({"query": documents.get("GetWeekPRs"), "variables": {"pageSize": 40}})
+
+    assert response["data"]["rateLimit"]["remaining"] == server.remaining == 99
+
+    server.remaining = 0
+    _, response = server.handle({"query": documents.get("GetWeekPRs"), "variables": {"pageSize": 40}})
+    assert response["errors"][0]["type"] == "RATE_LIMITED"
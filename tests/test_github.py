@@ -0,0 +1,111 @@
+from types import SimpleNamespace as NS
+
+import pytest
+
+import github
+
+
+def pr(id, path="contents/2023/01/13/3-new-plugins/1-x.md"):
+    return NS(node=NS(id=id, files=NS(edges=[NS(node=NS(path=path))])))
+
+
+def connection(ids, cursor=None):
+    return NS(
+        edges=[pr(id) for id in ids],
+        page_info=NS(has_previous_page=cursor is not None, start_cursor=cursor),
+    )
+
+
+def test_sync_refs_mutation_keeps_master_first():
+    refs_upstream = {"master": "m2", "2023-01-13": "w1"}
+    document, variables = github.sync_refs_mutation(refs_upstream, {"master": "R1"}, "FORK")
+    query = str(document)
+
+    assert document.name == "SyncRefs"
+    assert query.index("ref0: updateRef") < query.index("ref1: createRef")
+    assert variables == {
+        "oid0": "m2",
+        "refId0": "R1",
+        "oid1": "w1",
+        "repoId": "FORK",
+        "name1": "refs/heads/2023-01-13",
+    }
+
+
+def test_check_sync():
+    github.check_sync({"data": {"ref0": {"clientMutationId": None}}})
+    with pytest.raises(Exception, match="Syncing the fork failed: HTTP Error 502"):
+        github.check_sync({"data": None, "errors": [{"message": "HTTP Error 502: Bad Gateway", "status": 502}]})
+
+
+def test_sync_twin_branch_syncs_every_ref_in_one_request(fake):
+    id_upstream, id_fork = github.sync_twin_branch()
+
+    fork, upstream = fake.world.repo("amar1729"), fake.world.repo("phaazon")
+    assert (id_upstream, id_fork) == (upstream.id, fork.id)
+    assert fake.stats["SyncRefs"] == 1
+    assert {name: ref.target.oid for name, ref in fork._refs.items()} == {
+        name: ref.target.oid for name, ref in upstream._refs.items()
+    }
+
+
+def test_failed_sync_raises(fake):
+    # (creating this week's branch in the fork: not retried)
+    fake.fail["SyncRefs"] = 1
+    with pytest.raises(Exception, match="Syncing the fork failed"):
+        github.sync_twin_branch()
+
+
+def test_page_prs_stops_at_the_parent():
+    assert [p.node.id for p in github.page_prs(connection(["a", "b"], "c1"), "P")[0]] == ["b", "a"]
+    assert github.page_prs(connection(["a", "b"], "c1"), "P")[1] == "c1"
+    assert github.page_prs(connection(["a", "P", "b"], "c1"), "P")[1] is None
+    assert github.page_prs(connection(["a"]), "P")[1] is None
+
+
+def test_week_prs_pages_back_to_the_parent_only():
+    # oldest first within a page, like GitHub's `last:`; "P" is the parent PR
+    pages = {
+        "c1": connection(["old", "P", "a", "b"], "c2"),
+        "c2": connection(["older"], "c3"),
+    }
+    fetched = []
+
+    def next_page(cursor):
+        fetched.append(cursor)
+        return pages[cursor]
+
+    repo = NS(parent=NS(edges=[NS(node=NS(id="P"))]), pull_requests=connection(["c", "d"], "c1"))
+    prs = github.week_prs(repo, next_page)
+    assert fetched == []
+
+    assert [p.node.id for p in prs] == ["d", "c", "b", "a"]
+    # never past the parent PR
+    assert fetched == ["c1"]
+
+
+def test_week_prs_last_page():
+    repo = NS(parent=NS(edges=[NS(node=NS(id="P"))]), pull_requests=connection(["a"]))
+    assert [p.node.id for p in github.week_prs(repo, None)] == ["a"]
+
+
+def test_count_sections():
+    prs = [
+        pr("a", "contents/2023/01/13/3-new-plugins/1-a.md"),
+        pr("b", "contents/2023/01/13/3-new-plugins/2-b.md"),
+        pr("c", "contents/2023/01/13/4-updates/1-c.md"),
+        pr("d", "contents/2023/01/13/1-did-you-know.md"),
+    ]
+    assert github.count_sections(iter(prs)) == [0, 1, 0, 2, 1, 0, 0]
+
+
+@pytest.mark.parametrize("page_size, pages", [(40, 0), (5, 4)])
+def test_week_is_listed_in_pages(fake, config, page_size, pages):
+    config(secret="test", url=fake.url, query_cache_disk="no", page_size=page_size)
+
+    context = github.weekly_context()
+
+    # 20 PRs this week: in the first page, or 4 more pages down to the parent PR
+    assert fake.stats["GetWeekPRs"] == 1
+    assert fake.stats["GetPRsPage"] == pages
+    assert context.sections[3:5] == [13, 7]
@@ -0,0 +1,26 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import mutate
+import templates
+
+NAME = "3-new-plugins/1-example.md"
+
+
+def test_concurrent_submissions_share_one_template_request(fake):
+    fake.latency = 0.1
+
+    with ThreadPoolExecutor(8) as pool:
+        texts = list(pool.map(lambda _: mutate.get(3), range(8)))
+
+    assert set(texts) == {"# [plugin](https://github.com/owner/plugin)\n\ndescription\n"}
+    assert fake.stats["GetTemplates"] == 1
+
+
+def test_graphql_failure_falls_back_to_the_cached_copy(fake):
+    fake.fail["GetTemplates"] = 10
+    cache = templates.get_cache()
+    # stale, and its server unreachable
+    cache._entries[NAME] = {"etag": '"1"', "text": "stale", "checked": 0}
+    cache.base_url = "http://127.0.0.1:9/template"
+
+    assert mutate.get(3) == "stale"
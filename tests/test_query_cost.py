@@ -0,0 +1,47 @@
+import pytest
+
+import documents
+import query_cost
+from query_cost import MAX_PAGE, Cost, CostLimit, QueryTooExpensive
+
+SOURCE = """
+query GetPRs($pageSize: Int!) {
+  repository(owner: "phaazon", name: "x") {
+    pullRequests(last: $pageSize) {
+      edges { node { files(first: 5) { edges { node { path } } } } }
+    }
+  }
+  rateLimit { cost }
+}
+query GetNothing { rateLimit { cost } }
+"""
+
+
+def test_connections():
+    paths = query_cost.connections(SOURCE)
+    assert paths == {"GetPRs": [["pageSize"], ["pageSize", 5]], "GetNothing": []}
+
+
+def test_estimate():
+    paths = query_cost.connections(SOURCE)["GetPRs"]
+    # 40 PRs, and 5 files of each
+    assert query_cost.estimate(paths, {"pageSize": 40}) == Cost(240, 1)
+    # a variable without a value: the largest page
+    assert query_cost.estimate(paths).nodes == MAX_PAGE + MAX_PAGE * 5
+    assert query_cost.estimate(paths, {"pageSize": 100 * 100}).points == 100
+
+
+def test_estimate_without_connections():
+    assert query_cost.estimate([]) == Cost(0, 1)
+
+
+def test_check_rejects_costly_documents_only_when_asked():
+    document = documents.get("GetWeekPRs")
+    cheap, costly = {"pageSize": 40}, {"pageSize": 100 * 100}
+
+    assert CostLimit(reject=True).check(document, cheap).points == 1
+    assert CostLimit().check(document, costly).points > 1
+    with pytest.raises(QueryTooExpensive):
+        CostLimit(reject=True).check(document, costly)
+    # (plain strings aren't estimated)
+    assert CostLimit(reject=True).check(str(document), costly) is None
@@ -0,0 +1,103 @@
+import time
+
+from config import ROOT, state_path
+from documents import Document
+from querycache import DiskTier, MemoryTier, QueryCache
+
+WEEK_PRS = Document("query GetWeekPRs { x }", "GetWeekPRs", {})
+WEEK_HEAD = Document("query GetWeekHead { x }", "GetWeekHead", {})
+CREATE_PR = Document("mutation CreatePR { x }", "CreatePR", {})
+
+DATA = {"data": {"repository": {"id": "R1"}}}
+
+
+def test_memory_tier_drops_the_least_recently_used():
+    tier = MemoryTier(max_size=2)
+    tier.put("a", (1.0, {}))
+    tier.put("b", (1.0, {}))
+    tier.get("a")
+    tier.put("c", (1.0, {}))
+
+    assert [k for k in "abc" if tier.get(k)] == ["a", "c"]
+
+
+def test_lookup_by_operation_and_variables():
+    cache = QueryCache([MemoryTier()])
+    cache.store(WEEK_PRS, {"pageSize": 40, "x": 1}, DATA)
+
+    # (whatever the order of the variables)
+    assert cache.lookup(WEEK_PRS, {"x": 1, "pageSize": 40}) == DATA
+    assert cache.lookup(WEEK_PRS, {"pageSize": 20, "x": 1}) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_only_current_successful_queries_are_cached():
+    cache = QueryCache([MemoryTier()], ttls={"GetWeekPRs": 60, "GetWeekHead": 0, "CreatePR": 60})
+    cache.store(WEEK_HEAD, None, DATA)
+    cache.store(CREATE_PR, None, DATA)
+    cache.store(WEEK_PRS, {"pageSize": 1}, {"data": None, "errors": [{"message": "502"}]})
+
+    assert cache.lookup(WEEK_HEAD) is None
+    assert cache.lookup(CREATE_PR) is None
+    assert cache.lookup(WEEK_PRS, {"pageSize": 1}) is None
+
+
+def test_expired_entries_are_misses():
+    cache = QueryCache([MemoryTier()], ttls={"GetWeekPRs": 0.01})
+    cache.store(WEEK_PRS, None, DATA)
+    time.sleep(0.02)
+
+    assert cache.lookup(WEEK_PRS) is None
+
+
+def test_disk_hits_are_copied_to_memory(tmp_path):
+    QueryCache([DiskTier(tmp_path / "cache.json")]).store(WEEK_PRS, None, DATA)
+
+    memory = MemoryTier()
+    cache = QueryCache([memory, DiskTier(tmp_path / "cache.json")])
+    assert cache.lookup(WEEK_PRS) == DATA
+    assert memory.get(next(iter(memory._entries)))[1] == DATA
+
+
+def test_invalidate_drops_from_every_tier(tmp_path):
+    cache = QueryCache([MemoryTier(), DiskTier(tmp_path / "cache.json")])
+    cache.store(WEEK_PRS, {"pageSize": 1}, DATA)
+    cache.store(WEEK_PRS, {"pageSize": 2}, DATA)
+
+    cache.invalidate("GetWeekPRs", "GetPRsPage")
+
+    assert cache.lookup(WEEK_PRS, {"pageSize": 1}) is None
+    assert cache.lookup(WEEK_PRS, {"pageSize": 2}) is None
+    assert DiskTier(tmp_path / "cache.json")._load() == {}
+
+
+def test_live_state_is_kept_in_the_state_dir(config, tmp_path):
+    assert state_path(".query-cache.json") == tmp_path / ".query-cache.json"
+
+    config(state_dir=ROOT)
+    assert state_path(".query-cache.json") == ROOT / ".query-cache.json"
+
+
+def test_stand_ins_get_state_of_their_own(config, tmp_path):
+    live = state_path(".query-cache.json")
+
+    config(url="http://127.0.0.1:8765/graphql")
+    fake = state_path(".query-cache.json")
+    config(url="http://127.0.0.1:8766/graphql")
+    other_fake = state_path(".query-cache.json")
+    config(cassette="week.json.gz")
+    replayed = state_path(".query-cache.json")
+    config(cassette="week.json.gz", cassette_mode="record")
+    recording = state_path(".query-cache.json")
+
+    assert len({live, fake, other_fake, replayed}) == 4
+    assert recording == live
+    assert fake.parent == tmp_path and fake.name.startswith(".query-cache.") and fake.suffix == ".json"
+
+
+def test_disk_tier_is_per_source(config):
+    config(url="http://127.0.0.1:8765/graphql")
+    QueryCache([DiskTier()]).store(WEEK_PRS, None, DATA)
+
+    config()
+    assert QueryCache([DiskTier()]).lookup(WEEK_PRS) is None
@@ -0,0 +1,107 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import pytest
+
+import github
+from ratelimit import PR_COST, RateBudget, RateLimited
+
+
+def rate_limit(remaining: int, reset_in: float) -> dict:
+    reset_at = datetime.fromtimestamp(time.time() + reset_in, timezone.utc).isoformat().replace("+00:00", "Z")
+    return {"data": {"rateLimit": {"cost": 1, "remaining": remaining, "resetAt": reset_at}}}
+
+
+def test_unknown_budget_reserves_and_paces_nothing():
+    budget = RateBudget()
+    with budget.reserve(PR_COST):
+        assert budget.reserved == PR_COST
+        assert budget.pace() == 0
+    assert budget.reserved == 0
+
+
+def test_observe_counts_mutations_as_a_point():
+    budget = RateBudget()
+    budget.observe(rate_limit(500, 60))
+    budget.observe({"data": {"createPullRequest": {}}})
+
+    assert budget.remaining == 499
+
+
+def test_paced_below_the_low_water_mark():
+    budget = RateBudget(low_water=100)
+    budget.observe(rate_limit(200, 60))
+    assert budget.pace() == 0
+
+    budget.observe(rate_limit(10, 60))
+    assert 5.5 < budget.pace() <= 6
+
+
+def test_reserve_holds_points_for_the_whole_pr():
+    budget = RateBudget(max_wait=0.5)
+    budget.observe(rate_limit(2 * PR_COST, 0.3))
+
+    with budget.reserve(PR_COST), budget.reserve(PR_COST):
+        # a third PR waits for the reset
+        start = time.monotonic()
+        with budget.reserve(PR_COST):
+            assert time.monotonic() - start > 0.2
+
+
+def test_reserve_raises_rather_than_wait_too_long():
+    budget = RateBudget(max_wait=1)
+    budget.observe(rate_limit(PR_COST - 1, 3600))
+
+    with pytest.raises(RateLimited):
+        with budget.reserve(PR_COST):
+            pass
+    assert budget.reserved == 0
+
+
+def test_concurrent_reserves_never_overdraw():
+    budget = RateBudget(max_wait=0)
+    budget.observe(rate_limit(10 * PR_COST, 3600))
+    admitted = []
+    barrier = threading.Barrier(50)
+
+    def submit(_):
+        barrier.wait()
+        try:
+            with budget.reserve(PR_COST):
+                admitted.append(1)
+                time.sleep(0.05)
+        except RateLimited:
+            pass
+
+    with ThreadPoolExecutor(50) as pool:
+        list(pool.map(submit, range(50)))
+    assert len(admitted) == 10
+
+
+def test_areserve():
+    budget = RateBudget(max_wait=0)
+    budget.observe(rate_limit(PR_COST, 3600))
+
+    async def main():
+        async with budget.areserve(PR_COST):
+            with pytest.raises(RateLimited):
+                async with budget.areserve(PR_COST):
+                    pass
+
+    asyncio.run(main())
+    assert budget.reserved == 0
+
+
+def test_spent_budget_fails_before_sending_anything(fake):
+    github.week_head()
+    fake.remaining = PR_COST - 1
+    fake.reset_at = time.time() + 3600
+    github.week_head()
+    sent = sum(fake.stats.values())
+
+    with pytest.raises(RateLimited):
+        github.open_pull_req(3, "foo.nvim", "x")
+    assert sum(fake.stats.values()) == sent
@@ -0,0 +1,44 @@
+import github
+import querycache
+from refsync import ForkRef, diff
+
+
+UPSTREAM = {"master": "m2", "2023-01-13": "w1"}
+
+
+def test_diff_current_fork_needs_nothing():
+    fork = {"master": ForkRef("R1", "m2"), "2023-01-13": ForkRef("R2", "w1")}
+    assert diff(UPSTREAM, fork) == {}
+
+
+def test_diff_missing_and_moved_refs_in_upstream_order():
+    fork = {"master": ForkRef("R1", "m1")}
+    assert list(diff(UPSTREAM, fork).items()) == [("master", "m2"), ("2023-01-13", "w1")]
+
+
+def test_diff_fork_reset_behind_is_synced_again():
+    # the live oid is all that counts, whatever was pushed before
+    fork = {"master": ForkRef("R1", "m0"), "2023-01-13": ForkRef("R2", "w1")}
+    assert diff(UPSTREAM, fork) == {"master": "m2"}
+
+
+def test_current_fork_isnt_synced_again(fake):
+    github.sync_twin_branch()
+    querycache.get_cache().invalidate(*querycache.REFS)
+    github.sync_twin_branch()
+
+    assert fake.stats["GetSyncRefs"] == 2
+    assert fake.stats["SyncRefs"] == 1
+
+
+def test_fork_reset_behind_is_synced_again(fake):
+    github.sync_twin_branch()
+
+    fork, upstream = fake.world.repo("amar1729"), fake.world.repo("phaazon")
+    master = fork._refs["master"]
+    master.target = master.target.parent
+    querycache.get_cache().invalidate(*querycache.REFS)
+
+    github.sync_twin_branch()
+    assert fake.stats["SyncRefs"] == 2
+    assert master.target.oid == upstream._refs["master"].target.oid
@@ -0,0 +1,88 @@
+import urllib.error
+
+import pytest
+
+import github
+import retry
+from retry import FATAL, TRANSIENT, UNSENT, RetryPolicy
+
+
+@pytest.mark.parametrize("data, kind", [
+    ({"data": {}}, None),
+    ({"errors": [{"message": "HTTP Error 502: Bad Gateway", "status": 502}]}, TRANSIENT),
+    ({"errors": [{"message": "HTTP Error 401: Unauthorized", "status": 401}]}, FATAL),
+    ({"errors": [{"message": "refused", "exception": ConnectionRefusedError()}]}, UNSENT),
+    ({"errors": [{"message": "reset", "exception": ConnectionResetError()}]}, TRANSIENT),
+    ({"errors": [{"message": "x", "type": "SERVICE_UNAVAILABLE"}]}, TRANSIENT),
+    ({"errors": [{"message": "Something went wrong while executing your query. Try again."}]}, TRANSIENT),
+    ({"errors": [{"message": "Could not resolve to a Repository", "type": "NOT_FOUND"}]}, FATAL),
+    # the worst error wins
+    ({"errors": [{"message": "x", "type": "INTERNAL"}, {"message": "y", "type": "FORBIDDEN"}]}, FATAL),
+])
+def test_classify(data, kind):
+    assert retry.classify(data) == kind
+
+
+def test_classify_exception():
+    assert retry.classify_exception(urllib.error.HTTPError("u", 503, "", None, None)) == TRANSIENT
+    assert retry.classify_exception(urllib.error.HTTPError("u", 404, "", None, None)) == FATAL
+    assert retry.classify_exception(urllib.error.URLError(ConnectionRefusedError())) == UNSENT
+    assert retry.classify_exception(ValueError()) == FATAL
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("query GetWeekHead { rateLimit { cost } }", True),
+    ("mutation SyncRefs($oid0: GitObjectID!) {\nref0: updateRef(input: {refId: $r, oid: $oid0}) {\nclientMutationId\n}\n}", True),
+    ("mutation SyncRefs {\nref0: updateRef(input: {}) {\nclientMutationId\n}\nref1: createRef(input: {}) {\nref {\nid\n}\n}\n}", False),
+    ("mutation CreatePR {\ncreatePullRequest(input: {}) {\npullRequest {\nurl\n}\n}\n}", False),
+    # (its expectedHeadOid: a second commit fails rather than lands)
+    ("mutation CreateCommit {\ncreateCommitOnBranch(input: {}) {\nclientMutationId\n}\n}", True),
+])
+def test_idempotent(query, expected):
+    assert retry.idempotent(query) is expected
+
+
+def test_should_retry():
+    policy = RetryPolicy()
+    create = "mutation CreateBranch {\ncreateRef(input: {}) {\nref {\nid\n}\n}\n}"
+    assert policy.should_retry("query Q { a }", TRANSIENT)
+    assert not policy.should_retry("query Q { a }", FATAL)
+    assert not policy.should_retry(create, TRANSIENT)
+    # never reached the server
+    assert policy.should_retry(create, UNSENT)
+
+
+def test_backoff_is_bounded():
+    delays = list(RetryPolicy(attempts=6, base_delay=1, max_delay=3).backoff())
+    assert len(delays) == 5
+    assert all(0 <= delay <= min(3, 2 ** attempt) for attempt, delay in enumerate(delays))
+
+
+def test_queries_are_retried(fake):
+    fake.fail["GetWeekHead"] = 2
+
+    assert github.week_head().pull_requests.total_count > 0
+    assert fake.stats["GetWeekHead"] == 3
+
+
+def test_commit_is_retried(fake):
+    fake.fail["CreateCommit"] = 1
+
+    github.open_pull_req(3, "foo.nvim", "x")
+
+    (pr,) = fake.world.repo("amar1729")._pull_requests
+    assert "contents/2023/01/13/3-new-plugins/14-foo.md" in pr._files
+
+
+@pytest.mark.parametrize("operation, attempts", [("CreateBranch", 1), ("CreateCommit", 4)])
+def test_failed_mutation_opens_no_pr(fake, operation, attempts):
+    fake.fail[operation] = attempts
+
+    with pytest.raises(Exception, match="failed: HTTP Error 502"):
+        github.open_pull_req(3, "foo.nvim", "x")
+
+    fork = fake.world.repo("amar1729")
+    assert fork._pull_requests == []
+    # nor a branch
+    assert not [name for name in fork._refs if name.startswith("patch-")]
+    assert fake.stats[operation] == attempts
@@ -0,0 +1,35 @@
+import json
+
+import pytest
+
+import schema_index
+from schema_index import SchemaIndex
+
+
+@pytest.fixture
+def schema_path(tmp_path):
+    path = tmp_path / "schema.json"
+    types = [{"name": "Query", "kind": "OBJECT"}, {"name": "String", "kind": "SCALAR"}]
+    path.write_text(json.dumps({"data": {"__schema": {"queryType": {"name": "Query"}, "types": types}}}))
+    return path
+
+
+def test_lookup(schema_path):
+    index = SchemaIndex(schema_path)
+
+    assert list(index) == ["Query", "String"]
+    assert index["String"]["kind"] == "SCALAR"
+    assert index.root == {"queryType": {"name": "Query"}}
+
+
+@pytest.mark.parametrize("contents", [
+    b"",
+    b"TWIN",                                                    # shorter than the prefix
+    schema_index._PREFIX.pack(schema_index.MAGIC, 100) + b"x",  # truncated header
+    schema_index._PREFIX.pack(schema_index.MAGIC, 2) + b"\xff\xff",  # not marshal
+    b"NOTANIDX" + bytes(8),                                     # foreign file
+])
+def test_unreadable_index_is_rebuilt(schema_path, contents):
+    schema_index.index_path(schema_path).write_bytes(contents)
+
+    assert SchemaIndex(schema_path)["Query"]["kind"] == "OBJECT"
@@ -0,0 +1,92 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import github
+
+from singleflight import acoalesced, coalesced
+
+
+def test_coalesced_shares_one_call():
+    calls = []
+    started = threading.Event()
+
+    @coalesced
+    def listing(page_size):
+        calls.append(page_size)
+        started.set()
+        time.sleep(0.1)
+        return object()
+
+    with ThreadPoolExecutor(8) as pool:
+        first = pool.submit(listing, 40)
+        started.wait()
+        others = [pool.submit(listing, 40) for _ in range(7)]
+        results = [future.result() for future in [first] + others]
+
+    assert calls == [40]
+    assert all(result is results[0] for result in results)
+
+
+def test_coalesced_by_arguments_and_not_cached():
+    calls = []
+
+    @coalesced
+    def listing(page_size):
+        calls.append(page_size)
+        return page_size
+
+    assert listing(40) == 40
+    assert listing(40) == 40
+    assert listing(10) == 10
+    assert calls == [40, 40, 10]
+
+
+def test_coalesced_shares_errors():
+    started = threading.Event()
+
+    @coalesced
+    def sync():
+        started.set()
+        time.sleep(0.1)
+        raise ValueError("sync failed")
+
+    with ThreadPoolExecutor(4) as pool:
+        first = pool.submit(sync)
+        started.wait()
+        futures = [first] + [pool.submit(sync) for _ in range(3)]
+        for future in futures:
+            with pytest.raises(ValueError, match="sync failed"):
+                future.result()
+
+
+def test_acoalesced_shares_one_call():
+    calls = []
+
+    @acoalesced
+    async def listing():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return object()
+
+    async def main():
+        return await asyncio.gather(*(listing() for _ in range(5)))
+
+    results = asyncio.run(main())
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_concurrent_submissions_share_the_listing_and_sync(fake):
+    fake.latency = 0.05
+
+    with ThreadPoolExecutor(5) as pool:
+        contexts = list(pool.map(lambda _: github.weekly_context(), range(5)))
+
+    assert all(context == contexts[0] for context in contexts)
+    assert fake.stats["GetWeekHead"] == 1
+    assert fake.stats["GetWeekPRs"] == 1
+    assert fake.stats["GetSyncRefs"] == 1
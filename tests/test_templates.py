@@ -0,0 +1,114 @@
+"""`TemplateCache` against a local HTTP stand-in for raw.githubusercontent.com."""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from templates import TemplateCache
+
+NAME = "3-new-plugins/1-example.md"
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        server.requests.append(self.headers.get("If-None-Match"))
+        if server.mode == "hang":
+            server.stop.wait()
+            return
+        if server.mode == "fail":
+            self.send_error(500)
+            return
+
+        etag = f'"{hash(server.text)}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = server.text.encode()
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.daemon_threads = True
+    httpd.text = "template v1"
+    httpd.mode = "ok"
+    httpd.requests = []
+    httpd.stop = threading.Event()
+    httpd.base_url = "http://127.0.0.1:%d/template" % httpd.server_address[1]
+    threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True).start()
+    yield httpd
+    httpd.stop.set()
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_served_from_cache_within_ttl(server, tmp_path):
+    cache = TemplateCache(tmp_path / "templates.json", base_url=server.base_url)
+
+    assert cache.get(NAME) == "template v1"
+    assert cache.get(NAME) == "template v1"
+    assert server.requests == [None]
+
+
+def test_revalidated_by_etag_after_ttl(server, tmp_path):
+    cache = TemplateCache(tmp_path / "templates.json", ttl=0, base_url=server.base_url)
+    cache.get(NAME)
+
+    assert cache.get(NAME) == "template v1"
+    assert cache.not_modified == 1
+    etag = server.requests[1]
+    assert etag is not None
+
+    server.text = "template v2"
+    assert cache.get(NAME) == "template v2"
+    assert server.requests == [None, etag, etag]
+
+
+def test_cache_is_kept_on_disk(server, tmp_path):
+    TemplateCache(tmp_path / "templates.json", base_url=server.base_url).get(NAME)
+
+    server.text = "template v2"
+    assert TemplateCache(tmp_path / "templates.json", base_url=server.base_url).get(NAME) == "template v1"
+    assert len(server.requests) == 1
+
+
+@pytest.mark.parametrize("mode", ["fail", "hang"])
+def test_cached_copy_served_when_revalidating_fails(server, tmp_path, mode):
+    cache = TemplateCache(tmp_path / "templates.json", ttl=0, base_url=server.base_url, timeout=0.2)
+    cache.get(NAME)
+
+    server.mode = mode
+    start = time.monotonic()
+    assert cache.get(NAME) == "template v1"
+    assert time.monotonic() - start < 5
+
+
+def test_nothing_to_fall_back_on_raises(server, tmp_path):
+    import requests
+
+    server.mode = "fail"
+    with pytest.raises(requests.HTTPError):
+        TemplateCache(tmp_path / "templates.json", base_url=server.base_url).get(NAME)
+
+
+def test_graphql_templates_keep_the_etag_when_unchanged(server, tmp_path):
+    cache = TemplateCache(tmp_path / "templates.json", ttl=0, base_url=server.base_url)
+    cache.get(NAME)
+    etag = cache._entries[NAME]["etag"]
+
+    cache.update({NAME: "template v1"})
+    assert cache._entries[NAME]["etag"] == etag
+    cache.update({NAME: "template v2"})
+    assert cache._entries[NAME] == {"etag": None, "text": "template v2", "checked": cache._entries[NAME]["checked"]}
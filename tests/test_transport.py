@@ -0,0 +1,192 @@
+"""`ConnectionPool` and `AsyncConnectionPool` against a local HTTP stand-in."""
+
+import asyncio
+import http.client
+import json
+import socket
+import threading
+import time
+import urllib.request
+
+import pytest
+
+from transport import AsyncConnectionPool, ConnectionPool
+
+QUERY = json.dumps({"query": "query GetWeekHead { viewer { login } }"}).encode()
+MUTATION = json.dumps({"query": "mutation CreatePR { createPullRequest(input: {}) { clientMutationId } }"}).encode()
+
+
+class StandIn:
+    """HTTP/1.1 server doing what it's told with each request, in order.
+
+    Actions: "ok" (answer, keep the connection), "ok-close" (answer, then close
+    without saying so), "drop" (read the request, close without answering),
+    "hang" (read the request, never answer). Past the list, it answers.
+    """
+
+    def __init__(self, *actions: str):
+        self.actions = list(actions)
+        self.received = []          # (connection number, body) of each request
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+        self._sock = socket.socket()
+        self._sock.bind(("127.0.0.1", 0))
+        self._sock.listen()
+        self.url = "http://127.0.0.1:%d/graphql" % self._sock.getsockname()[1]
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return
+            with self._lock:
+                self.connections += 1
+                number = self.connections
+            threading.Thread(target=self._handle, args=(conn, number), daemon=True).start()
+
+    def _handle(self, conn: socket.socket, number: int):
+        stream = conn.makefile("rb")
+        with conn, stream:
+            while True:
+                headers = {}
+                line = stream.readline()
+                if not line:
+                    return
+                while line not in (b"\r\n", b""):
+                    line = stream.readline()
+                    name, _, value = line.decode().partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = stream.read(int(headers.get("content-length", 0)))
+
+                with self._lock:
+                    self.received.append((number, body))
+                    action = self.actions.pop(0) if self.actions else "ok"
+
+                if action == "drop":
+                    return
+                if action == "hang":
+                    self._stop.wait()
+                    return
+                payload = json.dumps({"data": {"n": len(self.received)}}).encode()
+                conn.sendall(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    b"Content-Length: %d\r\n\r\n%s" % (len(payload), payload)
+                )
+                if action == "ok-close":
+                    return
+
+    def close(self):
+        self._stop.set()
+        self._sock.close()
+
+
+@pytest.fixture
+def stand_in():
+    servers = []
+
+    def make(*actions):
+        servers.append(StandIn(*actions))
+        return servers[-1]
+
+    yield make
+    for server in servers:
+        server.close()
+
+
+def post(pool: ConnectionPool, url: str, body: bytes, timeout=None) -> dict:
+    req = urllib.request.Request(url, data=body, method="POST", headers={"Content-Type": "application/json"})
+    with pool(req, timeout=timeout) as resp:
+        return json.loads(resp.read())
+
+
+def test_connections_are_reused(stand_in):
+    server = stand_in()
+    pool = ConnectionPool()
+
+    assert [post(pool, server.url, QUERY)["data"]["n"] for _ in range(3)] == [1, 2, 3]
+    assert pool.opened == server.connections == 1
+
+
+def test_connection_closed_while_idle_is_dropped(stand_in):
+    server = stand_in("ok-close")
+    pool = ConnectionPool()
+
+    post(pool, server.url, MUTATION)
+    time.sleep(0.05)
+    # (a mutation: it isn't re-sent, so it must not be sent on the dead connection)
+    post(pool, server.url, MUTATION)
+
+    assert pool.opened == server.connections == 2
+    assert [number for number, _ in server.received] == [1, 2]
+
+
+def test_connection_idle_too_long_is_dropped(stand_in):
+    server = stand_in()
+    pool = ConnectionPool(idle_timeout=0)
+
+    post(pool, server.url, QUERY)
+    time.sleep(0.01)
+    post(pool, server.url, QUERY)
+
+    assert pool.opened == 2
+
+
+def test_query_is_resent_when_a_reused_connection_drops(stand_in):
+    server = stand_in("ok", "drop")
+    pool = ConnectionPool()
+
+    post(pool, server.url, QUERY)
+    assert post(pool, server.url, QUERY)["data"]["n"] == 3
+    assert [number for number, _ in server.received] == [1, 1, 2]
+
+
+def test_mutation_is_not_resent_when_a_reused_connection_drops(stand_in):
+    server = stand_in("ok", "drop")
+    pool = ConnectionPool()
+
+    post(pool, server.url, QUERY)
+    with pytest.raises(http.client.RemoteDisconnected):
+        post(pool, server.url, MUTATION)
+    assert len(server.received) == 2
+
+
+def test_timeout_is_not_resent(stand_in):
+    server = stand_in("ok", "hang")
+    pool = ConnectionPool()
+
+    post(pool, server.url, QUERY)
+    with pytest.raises(socket.timeout):
+        post(pool, server.url, QUERY, timeout=0.2)
+    assert len(server.received) == 2
+
+
+def async_post(pool: AsyncConnectionPool, url: str, *bodies: bytes) -> list:
+    async def main():
+        results = []
+        for body in bodies:
+            status, _, _, content = await pool.request("POST", url, body, {"Content-Type": "application/json"})
+            results.append((status, json.loads(content)["data"]["n"]))
+        return results
+
+    return asyncio.run(main())
+
+
+def test_async_query_is_resent_when_a_reused_connection_drops(stand_in):
+    server = stand_in("ok", "drop")
+    pool = AsyncConnectionPool()
+
+    assert async_post(pool, server.url, QUERY, QUERY) == [(200, 1), (200, 3)]
+    assert [number for number, _ in server.received] == [1, 1, 2]
+
+
+def test_async_mutation_is_not_resent_when_a_reused_connection_drops(stand_in):
+    server = stand_in("ok", "drop")
+    pool = AsyncConnectionPool()
+
+    with pytest.raises(asyncio.IncompleteReadError):
+        async_post(pool, server.url, QUERY, MUTATION)
+    assert len(server.received) == 2
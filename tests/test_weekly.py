@@ -0,0 +1,130 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import async_github
+import github
+import weekly
+from weekly import WeeklyContext
+
+from test_fake_github import added_files
+
+
+def context(**changes):
+    fields = dict(
+        parent_id="P",
+        branch_name="2023-01-13",
+        weekly_oid="w1",
+        pr_count=61,
+        base_path="contents/2023/01/13",
+        sections=[0, 0, 0, 13, 7, 0, 0],
+        id_upstream="UP",
+        id_fork="FORK",
+        checked_at=time.time(),
+    )
+    fields.update(changes)
+    return WeeklyContext(**fields)
+
+
+def claim(context, section, path):
+    with weekly.claim(context, section, path) as number:
+        return number
+
+
+def test_claim_gives_each_caller_its_own_number(tmp_path):
+    path = tmp_path / "context.json"
+    weekly.save(context(), path)
+    shared = weekly.load(path)
+
+    assert [claim(shared, 3, path) for _ in range(3)] == [14, 15, 16]
+    assert claim(shared, 4, path) == 8
+    assert weekly.load(path).sections == [0, 0, 0, 16, 8, 0, 0]
+
+
+def test_claim_ignores_last_weeks_context(tmp_path):
+    path = tmp_path / "context.json"
+    weekly.save(context(parent_id="OLD", sections=[0, 0, 0, 30, 30, 0, 0]), path)
+    assert claim(context(), 3, path) == 14
+
+
+def test_failed_claim_hands_its_number_back(tmp_path):
+    path = tmp_path / "context.json"
+    weekly.save(context(), path)
+
+    with pytest.raises(RuntimeError):
+        with weekly.claim(context(), 3, path) as number:
+            assert number == 14
+            raise RuntimeError
+    assert weekly.load(path).sections[3] == 13
+    assert claim(context(), 3, path) == 14
+
+
+def test_failed_claim_keeps_later_claims(tmp_path):
+    path = tmp_path / "context.json"
+    weekly.save(context(), path)
+
+    with pytest.raises(RuntimeError):
+        with weekly.claim(context(), 3, path):
+            assert claim(context(), 3, path) == 15
+            raise RuntimeError
+    # 14 stays a gap rather than being taken again
+    assert weekly.load(path).sections[3] == 15
+
+
+def test_rebuilt_and_checked_keep_claims(tmp_path):
+    path = tmp_path / "context.json"
+    weekly.save(context(), path)
+    claim(context(), 3, path)
+
+    # the listing doesn't show the claimed PR yet
+    assert weekly.rebuilt(context(), path).sections[3] == 14
+    assert weekly.checked(context(checked_at=0), path).sections[3] == 14
+    assert weekly.rebuilt(context(parent_id="NEXT"), path).sections[3] == 13
+
+
+def test_record_pr_counts_upstream_prs_only(tmp_path):
+    path = tmp_path / "context.json"
+    weekly.save(context(), path)
+    weekly.record_pr("FORK", path)
+    assert weekly.load(path).pr_count == 61
+    weekly.record_pr("UP", path)
+    assert weekly.load(path).pr_count == 62
+
+
+def test_weekly_context_is_reused(fake):
+    github.open_pull_req(3, "foo.nvim", "x")
+    github.open_pull_req(4, "bar.nvim", "x")
+
+    assert fake.stats["GetWeekPRs"] == 1
+    assert fake.stats["GetSyncRefs"] == 1
+    assert added_files(fake, "4-updates") == {1: [], 2: ["8-bar.md"]}
+
+
+def test_concurrent_submissions_get_their_own_numbers(fake):
+    with ThreadPoolExecutor(5) as pool:
+        list(pool.map(lambda i: github.open_pull_req(3, f"p{i}.nvim", "x"), range(5)))
+
+    names = sorted(name for files in added_files(fake).values() for name in files)
+    assert [name.split("-")[0] for name in names] == ["14", "15", "16", "17", "18"]
+
+
+def test_concurrent_async_submissions_get_their_own_numbers(fake):
+    async def main():
+        return await asyncio.gather(*(async_github.open_pull_req(3, f"a{i}.nvim", "x") for i in range(3)))
+
+    urls = asyncio.run(main())
+
+    assert len(set(urls)) == 3
+    names = sorted(name for files in added_files(fake).values() for name in files)
+    assert [name.split("-")[0] for name in names] == ["14", "15", "16"]
+
+
+def test_failed_submission_leaves_no_gap(fake):
+    fake.fail["CreateCommit"] = 4
+    with pytest.raises(Exception, match="failed"):
+        github.open_pull_req(3, "foo.nvim", "x")
+
+    github.open_pull_req(3, "bar.nvim", "x")
+    assert list(added_files(fake).values()) == [["14-bar.md"]]
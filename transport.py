@@ -0,0 +1,338 @@
+"""Persistent (keep-alive) HTTP connections for `HTTPEndpoint`.
+
+`urllib.request.urlopen` opens a new connection, with its own TCP and TLS
+handshakes, for every request. `ConnectionPool` implements the same interface
+(as far as sgqlc uses it) on top of reusable `http.client` connections:
+
+    HTTPEndpoint(url, urlopen=ConnectionPool(max_size=4, idle_timeout=60))
+
+`AsyncConnectionPool` does the same for asyncio, see `async_github`.
+
+A request that fails on a reused connection (the server may have closed it
+while idle) is sent again on a new one - once, and only if the server can't
+have run it already (it failed while being written) or running it twice is
+harmless (`retry.idempotent`). Timeouts are never retried here.
+"""
+
+import asyncio
+import http.client
+import io
+import json
+import select
+import socket
+import ssl
+import threading
+import time
+import urllib.error
+import urllib.request
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import retry
+
+
+# (scheme, host, port)
+Key = Tuple[str, str, Optional[int]]
+
+
+def _resendable(body: Optional[bytes]) -> bool:
+    """Whether a request (GraphQL body) the server may have run already can be sent again."""
+    try:
+        request = json.loads(body or b"{}")
+    except ValueError:
+        return False
+    return isinstance(request, dict) and retry.idempotent(request.get("query") or "")
+
+
+def _dropped(conn: http.client.HTTPConnection) -> bool:
+    """Whether the server closed an idle connection: it is readable (EOF) before we sent anything."""
+    if conn.sock is None:
+        return False
+    try:
+        readable, _, _ = select.select([conn.sock], [], [], 0)
+    except (OSError, ValueError):
+        return True
+    return bool(readable)
+
+
+class PooledResponse:
+    """Response of a pooled request; gives its connection back when closed."""
+
+    def __init__(self, pool: "ConnectionPool", key: Key, conn: http.client.HTTPConnection, resp: http.client.HTTPResponse):
+        self._pool = pool
+        self._key = key
+        self._conn = conn
+        self._resp = resp
+        self.status = resp.status
+        self.reason = resp.reason
+        self.headers = resp.msg
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        return self._resp.read(amt)
+
+    def close(self):
+        if self._conn is None:
+            return
+        # the connection can only be reused once the whole body was read
+        if not self._resp.isclosed():
+            self._resp.read()
+        self._pool.release(self._key, self._conn, self._resp)
+        self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ConnectionPool:
+    """Pool of keep-alive connections, usable as `urlopen`.
+
+    Args:
+        max_size: most idle connections kept per host.
+        idle_timeout: seconds after which an idle connection is closed
+            instead of being reused.
+        timeout: default socket timeout, when the caller doesn't give one.
+    """
+
+    def __init__(self, max_size: int = 4, idle_timeout: float = 60.0, timeout: Optional[float] = None):
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+
+        # key -> idle connections, with the time they were last used
+        self._idle: Dict[Key, List[Tuple[http.client.HTTPConnection, float]]] = {}
+        self._lock = threading.Lock()
+
+        # how many connections were opened (vs. reused), for benchmarks
+        self.opened = 0
+
+    def _connect(self, key: Key, timeout: Optional[float]) -> http.client.HTTPConnection:
+        scheme, host, port = key
+        cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        self.opened += 1
+        return cls(host, port, timeout=timeout)
+
+    def acquire(self, key: Key, timeout: Optional[float]) -> Tuple[http.client.HTTPConnection, bool]:
+        """Get an idle connection to `key`, or a new one.
+
+        Returns:
+            the connection, and whether it was reused.
+        """
+        now = time.monotonic()
+        with self._lock:
+            idle = self._idle.get(key, [])
+            while idle:
+                conn, last_used = idle.pop()
+                if now - last_used <= self.idle_timeout and not _dropped(conn):
+                    conn.timeout = timeout
+                    if conn.sock is not None:
+                        conn.sock.settimeout(timeout)
+                    return conn, True
+                conn.close()
+
+        return self._connect(key, timeout), False
+
+    def release(self, key: Key, conn: http.client.HTTPConnection, resp: http.client.HTTPResponse):
+        if resp.will_close:
+            conn.close()
+            return
+
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_size:
+                idle.append((conn, time.monotonic()))
+                return
+        conn.close()
+
+    def close(self):
+        """Close every idle connection."""
+        with self._lock:
+            for idle in self._idle.values():
+                for conn, _ in idle:
+                    conn.close()
+            self._idle.clear()
+
+    def __call__(self, req: urllib.request.Request, timeout: Optional[float] = None) -> PooledResponse:
+        url = urlsplit(req.full_url)
+        key = (url.scheme, url.hostname, url.port)
+        path = url.path or "/"
+        if url.query:
+            path += f"?{url.query}"
+        headers = dict(req.header_items())
+        timeout = timeout if timeout is not None else self.timeout
+
+        conn, reused = self.acquire(key, timeout)
+        sent = False
+        try:
+            conn.request(req.get_method(), path, body=req.data, headers=headers)
+            sent = True
+            resp = conn.getresponse()
+        except socket.timeout:
+            conn.close()
+            raise
+        except (http.client.HTTPException, OSError):
+            conn.close()
+            # the server closed an idle connection: retry once on a new one,
+            # unless it may have run a request that isn't safe to run twice
+            if not reused or (sent and not _resendable(req.data)):
+                raise
+            conn = self._connect(key, timeout)
+            try:
+                conn.request(req.get_method(), path, body=req.data, headers=headers)
+                resp = conn.getresponse()
+            except BaseException:
+                conn.close()
+                raise
+
+        if resp.status >= 400:
+            body = resp.read()
+            self.release(key, conn, resp)
+            raise urllib.error.HTTPError(req.full_url, resp.status, resp.reason, resp.msg, io.BytesIO(body))
+
+        return PooledResponse(self, key, conn, resp)
+
+
+class AsyncConnectionPool:
+    """asyncio counterpart of `ConnectionPool`, over plain asyncio streams.
+
+    Speaks just enough HTTP/1.1 for a JSON API: one request at a time per
+    connection, `Content-Length` or chunked response bodies.
+
+    Args:
+        max_size: most idle connections kept per host.
+        idle_timeout: seconds after which an idle connection is closed
+            instead of being reused.
+        timeout: default timeout (seconds) of a whole request.
+    """
+
+    def __init__(self, max_size: int = 4, idle_timeout: float = 60.0, timeout: Optional[float] = None):
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+
+        # key -> idle (reader, writer), with the time they were last used
+        self._idle: Dict[Key, List[Tuple[asyncio.StreamReader, asyncio.StreamWriter, float]]] = {}
+
+        # how many connections were opened (vs. reused), for benchmarks
+        self.opened = 0
+
+    async def _connect(self, key: Key) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        scheme, host, port = key
+        self.opened += 1
+        if scheme == "https":
+            return await asyncio.open_connection(host, port or 443, ssl=ssl.create_default_context())
+        return await asyncio.open_connection(host, port or 80)
+
+    async def _acquire(self, key: Key) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter, bool]:
+        now = time.monotonic()
+        idle = self._idle.get(key, [])
+        while idle:
+            reader, writer, last_used = idle.pop()
+            if now - last_used <= self.idle_timeout and not reader.at_eof():
+                return reader, writer, True
+            writer.close()
+
+        reader, writer = await self._connect(key)
+        return reader, writer, False
+
+    def _release(self, key: Key, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        idle = self._idle.setdefault(key, [])
+        if len(idle) < self.max_size:
+            idle.append((reader, writer, time.monotonic()))
+        else:
+            writer.close()
+
+    def close(self):
+        """Close every idle connection."""
+        for idle in self._idle.values():
+            for _, writer, _ in idle:
+                writer.close()
+        self._idle.clear()
+
+    @staticmethod
+    async def _read_response(reader: asyncio.StreamReader) -> Tuple[int, str, http.client.HTTPMessage, bytes]:
+        status_line = await reader.readuntil(b"\r\n")
+        _, status, *reason = status_line.decode("latin-1").rstrip("\r\n").split(" ", 2)
+
+        header_block = await reader.readuntil(b"\r\n\r\n")
+        headers = http.client.parse_headers(io.BytesIO(header_block))
+
+        if headers.get("Transfer-Encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+                chunk = await reader.readexactly(size + 2)
+                if size == 0:
+                    break
+                chunks.append(chunk[:-2])
+            body = b"".join(chunks)
+        elif "Content-Length" in headers:
+            body = await reader.readexactly(int(headers["Content-Length"]))
+        else:
+            body = await reader.read()
+
+        return int(status), reason[0] if reason else "", headers, body
+
+    async def _send(self, key: Key, request: bytes, resendable: bool) -> Tuple[int, str, http.client.HTTPMessage, bytes]:
+        reader, writer, reused = await self._acquire(key)
+        sent = False
+        try:
+            writer.write(request)
+            await writer.drain()
+            sent = True
+            status, reason, headers, body = await self._read_response(reader)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+            # the server closed an idle connection: retry once on a new one,
+            # unless it may have run a request that isn't safe to run twice
+            if not reused or (sent and not resendable):
+                raise
+            reader, writer = await self._connect(key)
+            try:
+                writer.write(request)
+                await writer.drain()
+                status, reason, headers, body = await self._read_response(reader)
+            except BaseException:
+                writer.close()
+                raise
+        except BaseException:
+            writer.close()
+            raise
+
+        if headers.get("Connection", "").lower() == "close" or reader.at_eof():
+            writer.close()
+        else:
+            self._release(key, reader, writer)
+        return status, reason, headers, body
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        body: bytes = b"",
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> Tuple[int, str, http.client.HTTPMessage, bytes]:
+        """Send one request.
+
+        Returns:
+            status, reason, headers and body of the response.
+        """
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.hostname, parts.port)
+        path = parts.path or "/"
+        if parts.query:
+            path += f"?{parts.query}"
+
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {parts.netloc}", f"Content-Length: {len(body)}"]
+        lines += [
+            f"{name}: {value}"
+            for name, value in (headers or {}).items()
+            if name.lower() not in ("host", "content-length")
+        ]
+        request = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+        timeout = timeout if timeout is not None else self.timeout
+        return await asyncio.wait_for(self._send(key, request, _resendable(body)), timeout)
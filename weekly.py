@@ -0,0 +1,157 @@
+"""This week's repository context, cached on disk between submissions.
+
+Opening a PR needs this week's branch, the base path of its files, the
+upstream and fork repo IDs and the number taken in each section - all of
+which only change when a PR is opened or a new week starts. `WeeklyContext` keeps them in `.weekly-context.json`
+(one per source of GitHub data, see `config.state_path`):
+
+    - within `ttl` seconds of being built or checked, it is used as is
+    - after that, one small query (`GetWeekHead`) checks it: it is rebuilt if
+      the parent PR changed, this week's branch moved upstream, or someone
+      else opened a PR (the PR count changed)
+    - each submission takes its number in its section with `claim` (which
+      saves it right away), so concurrent submissions sharing one context
+      each get their own; a submission that fails hands its number back,
+      and after we open the PR, `record_pr` counts it
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, NamedTuple, Optional
+
+from config import state_path
+
+
+CONTEXT_FILE = ".weekly-context.json"
+
+_lock = threading.Lock()
+
+
+class WeeklyContext(NamedTuple):
+    parent_id: str          # the weekly post's PR
+    branch_name: str        # its head: this week's branch
+    weekly_oid: str         # target of this week's branch upstream
+    pr_count: int           # total PRs upstream
+    base_path: str          # e.g. contents/2023/01/13
+    sections: List[int]     # highest number taken (or claimed) in each section
+    id_upstream: str
+    id_fork: str
+    checked_at: float       # unix time it was built or last checked
+
+
+def load(path: Optional[Path] = None) -> Optional[WeeklyContext]:
+    """Load the saved context, from `path` (by default, this source's `CONTEXT_FILE`)."""
+    path = path or state_path(CONTEXT_FILE)
+    try:
+        with open(path) as f:
+            return WeeklyContext(**json.load(f))
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def save(context: WeeklyContext, path: Optional[Path] = None):
+    path = path or state_path(CONTEXT_FILE)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp, "w") as f:
+        json.dump(context._asdict(), f, indent=2)
+    os.replace(tmp, path)
+
+
+def fresh(context: WeeklyContext, ttl: float) -> bool:
+    """Whether `context` was checked less than `ttl` seconds ago."""
+    return time.time() - context.checked_at < ttl
+
+
+def head(repo) -> dict:
+    """Get what a context depends on, from a `GetWeekHead` repository."""
+    parent = repo.parent.edges[0].node
+    return {
+        "parent_id": parent.id,
+        "branch_name": parent.head_ref.name,
+        "weekly_oid": parent.head_ref.target.oid,
+        "pr_count": repo.pull_requests.total_count,
+    }
+
+
+def matches(context: WeeklyContext, repo) -> bool:
+    """Whether `context` is still current, by a `GetWeekHead` repository."""
+    return all(getattr(context, key) == value for key, value in head(repo).items())
+
+
+@contextmanager
+def claim(context: WeeklyContext, section: int, path: Optional[Path] = None) -> Iterator[int]:
+    """Take the next number in `section`, for a PR about to be opened.
+
+    The saved context is read, bumped and saved under one lock, so each
+    caller gets its own number even when they were all handed the same
+    `context` (which is only used if none of this week is saved). If the
+    block raises, the number is handed back, unless a later one was
+    claimed meanwhile (then it stays a gap rather than being taken twice).
+
+        with weekly.claim(context, section) as number:
+            ...  # open the PR
+    """
+    with _lock:
+        saved = load(path)
+        if saved is not None and saved.parent_id == context.parent_id:
+            context = saved
+
+        sections = list(context.sections)
+        sections[section] += 1
+        save(context._replace(sections=sections), path)
+        number = sections[section]
+
+    try:
+        yield number
+    except BaseException:
+        _release(context.parent_id, section, number, path)
+        raise
+
+
+def _release(parent_id: str, section: int, number: int, path: Optional[Path]):
+    """Undo the claim of `number` in `section`, if it is still the last one claimed."""
+    with _lock:
+        saved = load(path)
+        if saved is None or saved.parent_id != parent_id or saved.sections[section] != number:
+            return
+
+        sections = list(saved.sections)
+        sections[section] -= 1
+        save(saved._replace(sections=sections), path)
+
+
+def checked(context: WeeklyContext, path: Optional[Path] = None) -> WeeklyContext:
+    """Save that `context` was found current just now (keeping the numbers claimed meanwhile)."""
+    with _lock:
+        saved = load(path)
+        if saved is not None and saved.parent_id == context.parent_id:
+            context = saved
+        context = context._replace(checked_at=time.time())
+        save(context, path)
+        return context
+
+
+def rebuilt(context: WeeklyContext, path: Optional[Path] = None) -> WeeklyContext:
+    """Save a context rebuilt from the PR listing, which doesn't show the PRs claimed but not opened yet."""
+    with _lock:
+        saved = load(path)
+        if saved is not None and saved.parent_id == context.parent_id:
+            sections = [max(counted, claimed) for counted, claimed in zip(context.sections, saved.sections)]
+            context = context._replace(sections=sections)
+        save(context, path)
+        return context
+
+
+def record_pr(repo_id: str, path: Optional[Path] = None):
+    """Patch the saved context after we opened a PR (against `repo_id`)."""
+    with _lock:
+        context = load(path)
+        if context is None:
+            return
+
+        pr_count = context.pr_count + (repo_id == context.id_upstream)
+        save(context._replace(pr_count=pr_count), path)